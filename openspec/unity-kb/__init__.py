@@ -1 +1,2 @@
-# Unity Knowledge Base package
\ No newline at end of file
+import os
+__path__=[os.environ.get('UKB','/root/package/openspec/unity-kb')]
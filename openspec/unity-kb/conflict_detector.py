@@ -19,6 +19,7 @@ Version: 2.0
 
 import re
 import json
+from bisect import bisect_right
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass
@@ -200,13 +201,34 @@ class UnityConflictDetector:
 
         # Group classes by potential co-existence (e.g., same prefab)
         # This is a simplified version - real implementation would analyze prefabs
-        for i, class_a in enumerate(classes_data):
-            for class_b in classes_data[i+1:]:
-                cross_conflicts = self._detect_class_pair_conflicts(class_a, class_b)
-                conflicts.extend(cross_conflicts)
+        for i, j in self._candidate_pairs(classes_data):
+            cross_conflicts = self._detect_class_pair_conflicts(classes_data[i], classes_data[j])
+            conflicts.extend(cross_conflicts)
 
         return conflicts
 
+    def _candidate_pairs(self, classes_data: List[Dict]) -> List[Tuple[int, int]]:
+        """
+        Index pairs (i < j) for which _detect_class_pair_conflicts can report
+        anything: class i has a base class from known_conflicts and class j
+        one it conflicts with. Found through a base class -> classes index
+        instead of checking all N^2 pairs; sorted, so results keep the
+        order of the full pairwise scan.
+        """
+        holders: Dict[str, List[int]] = {}
+        for index, class_data in enumerate(classes_data):
+            for component in set(class_data.get('base_classes', [])):
+                holders.setdefault(component, []).append(index)
+
+        pairs = set()
+        for comp_a, conflicting_with in self.known_conflicts.items():
+            for i in holders.get(comp_a, ()):
+                for comp_b in conflicting_with:
+                    holders_b = holders.get(comp_b, ())
+                    pairs.update((i, j) for j in holders_b[bisect_right(holders_b, i):])
+
+        return sorted(pairs)
+
     def _check_rule_against_class(self, rule: ConflictRule, class_name: str,
                                 namespace: str, base_classes: List[str],
                                 attributes: List[str], assembly: str) -> Optional[DetectedConflict]:
@@ -443,5 +465,4 @@ if __name__ == "__main__":
     with open('conflict_analysis_report.json', 'w') as f:
         json.dump(report, f, indent=2)
 
-    print(f"\nDetailed report saved to conflict_analysis_report.json")</content>
-</xai:function_call">Mcp_serena_write_memory
\ No newline at end of file
+    print(f"\nDetailed report saved to conflict_analysis_report.json")
@@ -148,6 +148,7 @@ def get_unity_class_members(
             "name": payload.get("name", ""),
             "kind": payload.get("kind", ""),
             "signature": payload.get("signature", ""),
+            "signature_md": payload.get("signature_md"),
             "modifiers": payload.get("modifiers", []),
             "file_path": payload.get("file_path", ""),
             "start_line": payload.get("start_line", 0),
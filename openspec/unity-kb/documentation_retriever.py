@@ -440,5 +440,4 @@ def demonstrate_documentation_retrieval():
         print(f"   {i}. {doc.title} - {doc.summary[:50]}...")
 
 if __name__ == "__main__":
-    demonstrate_documentation_retrieval()</content>
-</xai:function_call">Mcp_serena_write_memory
\ No newline at end of file
+    demonstrate_documentation_retrieval()
@@ -17,6 +17,9 @@ Usage:
 
     # Discover and generate pattern catalogs
     python generate_auto_memories.py --discover-patterns
+
+    # Update all, but skip when the Unity KB hasn't changed since the last run
+    python generate_auto_memories.py --update-all --only-stale
 """
 
 import argparse
@@ -31,26 +34,68 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 # Direct Qdrant client (bypasses HTTP API)
+# Regular import so the module is cached in __pycache__ between invocations
+sys.path.insert(0, str(PROJECT_ROOT / "scripts" / "unity-kb"))
 try:
-    # Import from absolute path
-    import importlib.util
-    spec = importlib.util.spec_from_file_location(
-        "direct_qdrant_client",
-        PROJECT_ROOT / "scripts" / "unity-kb" / "direct_qdrant_client.py"
+    from direct_qdrant_client import (
+        search_unity_symbols,
+        get_unity_class_members,
+        get_unity_kb_stats,
+        list_unity_assemblies,
     )
-    direct_client = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(direct_client)
-
-    search_unity_symbols = direct_client.search_unity_symbols
-    get_unity_class_members = direct_client.get_unity_class_members
-    get_unity_kb_stats = direct_client.get_unity_kb_stats
-    list_unity_assemblies = direct_client.list_unity_assemblies
 
     MCP_AVAILABLE = True
 except Exception as e:
     print(f"WARNING: Qdrant client not available ({e}), using mock mode")
     MCP_AVAILABLE = False
 
+# Markdown table escaping for signatures indexed before `signature_md` existed
+_MD_ESCAPE = str.maketrans({'|': '\\|'})
+
+# Assembly overview memory, rendered in a single format() pass
+_ASSEMBLY_TMPL = """# {assembly} Assembly Overview (Auto-Generated)
+
+**Last Updated:** {now_iso}
+**Total Symbols:** {total}
+
+---
+
+## Statistics
+
+- **Classes:** {classes}
+- **Interfaces:** {interfaces}
+- **Total Methods:** {methods}
+- **Total Properties:** {properties}
+- **Total Fields:** {fields}
+
+---
+
+## Namespace Structure
+
+{ns_section}---
+
+## Key Classes (Most Referenced)
+
+{key_section}
+---
+
+## Validation Query
+
+```python
+# Verify assembly still exists and has expected symbol count
+def validate_{safe_name}_assembly():
+    symbols = search_unity_symbols("", assembly_name="{assembly}", limit=1000)
+    assert len(symbols) >= {total}, "Symbol count decreased!"
+```
+
+**Next Validation:** {today} (weekly)
+
+---
+
+**Source:** Unity Knowledge Base
+**Generator:** scripts/unity-kb/generate_auto_memories.py
+"""
+
 # find_similar_unity_code not implemented yet in direct client
 def find_similar_unity_code(code_snippet: str, limit: int = 10) -> List[Dict]:
     """Placeholder for similar code search"""
@@ -231,7 +276,9 @@ def validate_{class_info['name'].lower()}_memory():
 
         for member in members[:20]:  # Limit to 20 to avoid huge tables
             name = member['name']
-            sig = member.get('signature', '').replace('|', '\\|')  # Escape pipes
+            sig = member.get('signature_md')  # Pre-escaped at index time
+            if sig is None:
+                sig = member.get('signature', '').translate(_MD_ESCAPE)
             loc = f"{member.get('file_path', '')}:{member.get('start_line', '')}"
             doc = member.get('documentation', '').split('\n')[0][:100]  # First line, max 100 chars
 
@@ -345,66 +392,35 @@ def validate_{class_info['name'].lower()}_memory():
     def _format_assembly_memory(self, assembly: str, stats: Dict, namespaces: Dict, key_classes: List[Dict]) -> str:
         """Format assembly overview memory"""
 
-        content = f"""# {assembly} Assembly Overview (Auto-Generated)
-
-**Last Updated:** {datetime.now().isoformat()}
-**Total Symbols:** {sum(stats.values())}
-
----
-
-## Statistics
-
-- **Classes:** {stats['classes']}
-- **Interfaces:** {stats['interfaces']}
-- **Total Methods:** {stats['methods']}
-- **Total Properties:** {stats['properties']}
-- **Total Fields:** {stats['fields']}
-
----
-
-## Namespace Structure
-
-"""
+        ns_chunks = []
         for ns, classes in sorted(namespaces.items()):
-            content += f"### `{ns}`\n"
-            content += f"- Classes: {len(classes)}\n"
+            ns_chunks.append(f"### `{ns}`\n")
+            ns_chunks.append(f"- Classes: {len(classes)}\n")
             if classes:
-                content += f"- Key: {', '.join(classes[:5])}\n"
-            content += "\n"
+                ns_chunks.append(f"- Key: {', '.join(classes[:5])}\n")
+            ns_chunks.append("\n")
 
-        content += """---
-
-## Key Classes (Most Referenced)
-
-"""
         if key_classes:
-            content += "| Class | Namespace | Location |\n"
-            content += "|-------|-----------|----------|\n"
+            key_chunks = [
+                "| Class | Namespace | Location |\n",
+                "|-------|-----------|----------|\n",
+            ]
             for cls in key_classes:
-                content += f"| {cls['name']} | {cls.get('namespace', '')} | {cls.get('file_path', '')}:{cls.get('start_line', '')} |\n"
+                key_chunks.append(f"| {cls['name']} | {cls.get('namespace', '')} | {cls.get('file_path', '')}:{cls.get('start_line', '')} |\n")
         else:
-            content += "*No key classes identified.*\n"
-
-        content += f"""
----
-
-## Validation Query
-
-```python
-# Verify assembly still exists and has expected symbol count
-def validate_{assembly.replace('.', '_').lower()}_assembly():
-    symbols = search_unity_symbols("", assembly_name="{assembly}", limit=1000)
-    assert len(symbols) >= {sum(stats.values())}, "Symbol count decreased!"
-```
-
-**Next Validation:** {datetime.now().strftime('%Y-%m-%d')} (weekly)
-
----
-
-**Source:** Unity Knowledge Base
-**Generator:** scripts/unity-kb/generate_auto_memories.py
-"""
-        return content
+            key_chunks = ["*No key classes identified.*\n"]
+
+        now = datetime.now()
+        return _ASSEMBLY_TMPL.format(
+            assembly=assembly,
+            now_iso=now.isoformat(),
+            today=now.strftime('%Y-%m-%d'),
+            total=sum(stats.values()),
+            **stats,
+            ns_section=''.join(ns_chunks),
+            key_section=''.join(key_chunks),
+            safe_name=assembly.replace('.', '_').lower(),
+        )
 
     def discover_patterns(self) -> List[str]:
         """Discover and generate pattern catalog memories"""
@@ -581,9 +597,14 @@ def main():
     parser.add_argument('--api', type=str, help='Generate API memory for class')
     parser.add_argument('--assembly', type=str, help='Generate assembly overview')
     parser.add_argument('--discover-patterns', action='store_true', help='Discover and generate pattern catalogs')
+    parser.add_argument('--only-stale', action='store_true',
+                        help='With --update-all, skip generation if the Unity KB is unchanged since the last run')
 
     args = parser.parse_args()
 
+    if args.only_stale and not args.update_all:
+        parser.error("--only-stale requires --update-all")
+
     # Determine memory root
     if (PROJECT_ROOT / ".serena" / "memories").exists():
         memory_root = PROJECT_ROOT / ".serena" / "memories"
@@ -596,7 +617,23 @@ def main():
     generator = UnityKBMemoryGenerator(memory_root)
 
     if args.update_all:
+        kb_version = None
+        ver_file = generator.auto_gen_dir / ".kb_version"
+        if args.only_stale:
+            try:
+                stats = get_unity_kb_stats()
+            except Exception as e:
+                print(f"WARNING: Could not read Unity KB stats ({e}), running a full update")
+                stats = None
+            if stats:
+                kb_version = f"{stats.get('total_symbols')}:{stats.get('indexed_vectors')}:{stats.get('status')}"
+            if kb_version and ver_file.exists() and ver_file.read_text(encoding='utf-8') == kb_version:
+                print(f"[SKIP] Unity KB unchanged since last run ({kb_version})")
+                return
+
         results = generator.update_all()
+        if kb_version:
+            ver_file.write_text(kb_version, encoding='utf-8')
         print("\n[OK] Update complete!")
         print(f"   - API memories: {len(results['api_memories'])}")
         print(f"   - Assembly memories: {len(results['assembly_memories'])}")
@@ -10,31 +10,38 @@ Features:
 - Query expansion for better recall
 - Pre-filtering for efficient search
 - Search presets for common use cases
+- Async search (asearch) with concurrent dense/sparse fallback
 """
 
+import asyncio
+import copy
 import re
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
-import hashlib
-
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
+
+import mmh3
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
     Filter, FieldCondition, MatchValue, MatchAny, MatchText,
-    Range, SearchRequest, SearchParams, NamedVector, NamedSparseVector,
     SparseVector, QueryRequest, Prefetch, FusionQuery, Fusion,
 )
 
 from qdrant_config import (
-    QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT,
-    COLLECTION_UNIFIED, DENSE_VECTOR_SIZE,
+    QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT, QDRANT_GRPC_OPTIONS,
+    COLLECTION_UNIFIED,
     HybridSearchConfig, SearchPresets,
     DEFAULT_DENSE_WEIGHT, DEFAULT_SPARSE_WEIGHT,
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """A single search result"""
     id: str
@@ -53,6 +60,67 @@ class HybridSearchResponse:
     config_used: Dict[str, Any]
 
 
+# Filter dict match type -> Qdrant match model (see _build_condition)
+_MATCH_HANDLERS = {
+    "value": lambda v: MatchValue(value=v),
+    "any": lambda v: MatchAny(any=v),
+    "text": lambda v: MatchText(text=v),
+}
+
+_POINT_FIELDS = attrgetter('id', 'score', 'payload')
+
+
+def _to_search_results(points) -> List[SearchResult]:
+    """Convert Qdrant scored points to SearchResults"""
+    return [
+        SearchResult(str(point_id), score, payload or {})
+        for point_id, score, payload in map(_POINT_FIELDS, points)
+    ]
+
+
+def _copy_results(results) -> List[SearchResult]:
+    """Copies of results with their own payloads, so cached hits stay intact"""
+    return [
+        SearchResult(result.id, result.score, copy.deepcopy(result.payload), result.vector_name)
+        for result in results
+    ]
+
+
+def _freeze(obj: Any) -> Any:
+    """Recursively convert a filter dict into a hashable cache key"""
+    if isinstance(obj, Mapping):  # dicts and the read-only preset filters
+        return tuple(sorted((key, _freeze(value)) for key, value in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(value) for value in obj)
+    # Keep the type so True and 1 don't share a key
+    return (type(obj), obj)
+
+
+def _is_identifier_query(query: str) -> bool:
+    """True for single-token code identifiers (snake_case, camelCase, PascalCase)"""
+    query = query.strip()
+    if not query or len(query.split()) != 1:
+        return False
+    return '_' in query or any(c.isupper() for c in query)
+
+
+# Stop words (minimal for code)
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'be',
+    'this', 'that', 'it', 'they', 'we', 'you', 'i', 'my', 'your'
+})
+
+# Important code tokens to boost
+BOOST_TOKENS = {
+    'network': 2.0, 'rpc': 2.0, 'serverrpc': 2.5, 'clientrpc': 2.5,
+    'networkvariable': 2.0, 'networkobject': 2.0, 'networkbehaviour': 2.0,
+    'gamecreator': 2.0, 'instruction': 1.5, 'condition': 1.5,
+    'trigger': 1.5, 'character': 1.5, 'inventory': 1.5,
+    'spawn': 1.5, 'despawn': 1.5, 'owner': 1.5,
+}
+
+
 class BM25Tokenizer:
     """
     Simple BM25-compatible tokenizer for generating sparse vectors.
@@ -62,47 +130,25 @@ class BM25Tokenizer:
     - Fastembed with sparse models
     """
 
-    def __init__(self, k1: float = 1.5, b: float = 0.75):
-        self.k1 = k1
-        self.b = b
+    __slots__ = ('k1', 'b')
 
-        # Code-specific token patterns
-        self.camel_case_pattern = re.compile(r'(?<!^)(?=[A-Z])')
-        self.special_chars = re.compile(r'[^\w\s]')
+    # Shared by all tokenizers
+    stop_words = STOP_WORDS
+    boost_tokens = BOOST_TOKENS
 
-        # Stop words (minimal for code)
-        self.stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-            'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'be',
-            'this', 'that', 'it', 'they', 'we', 'you', 'i', 'my', 'your'
-        }
+    # Token pattern: runs of word characters, split on underscores
+    _token_re = re.compile(r'[^\W_]+')
 
-        # Important code tokens to boost
-        self.boost_tokens = {
-            'network': 2.0, 'rpc': 2.0, 'serverrpc': 2.5, 'clientrpc': 2.5,
-            'networkvariable': 2.0, 'networkobject': 2.0, 'networkbehaviour': 2.0,
-            'gamecreator': 2.0, 'instruction': 1.5, 'condition': 1.5,
-            'trigger': 1.5, 'character': 1.5, 'inventory': 1.5,
-            'spawn': 1.5, 'despawn': 1.5, 'owner': 1.5,
-        }
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
 
     def tokenize(self, text: str) -> List[str]:
         """Tokenize text for BM25"""
-        # Lowercase
-        text = text.lower()
-
-        # Split camelCase
-        text = self.camel_case_pattern.sub(' ', text)
-
-        # Remove special characters (keep underscores for code)
-        text = re.sub(r'[^\w\s_]', ' ', text)
-
-        # Split on whitespace and underscores
-        tokens = re.split(r'[\s_]+', text)
-
-        # Filter and clean
+        # Single pass over the lowercased text; identifiers are kept whole
+        # so compound tokens like "serverrpc" still match boost_tokens
         tokens = [
-            t for t in tokens
+            t for t in self._token_re.findall(text.lower())
             if len(t) >= 2 and t not in self.stop_words
         ]
 
@@ -112,32 +158,96 @@ class BM25Tokenizer:
         """
         Convert text to sparse vector format (indices and values).
 
+        Indices are 32-bit unsigned and weights are computed in float32,
+        matching Qdrant's sparse storage (uint32 indices, float32 values on
+        the gRPC wire). Plain lists are returned so SparseVector validation
+        never sees numpy scalar types.
+
         Returns:
             Tuple of (indices, values) for Qdrant SparseVector
         """
-        tokens = self.tokenize(text)
-
         # Count term frequencies
-        tf = defaultdict(int)
-        for token in tokens:
-            tf[token] += 1
+        tf = Counter(self.tokenize(text))
+
+        if not tf:
+            return [], []
 
         # Convert to indices and values
-        # Using hash for reproducible indices
-        indices = []
-        values = []
+        # Using MurmurHash3 (non-cryptographic) for reproducible indices
+        tokens = list(tf)
+        indices = [mmh3.hash(token, signed=False) for token in tokens]
+
+        # BM25-like term weight with boost, computed over all terms at once
+        counts = np.fromiter(tf.values(), dtype=np.float32, count=len(tokens))
+        # map() over the bound dict.get keeps the boost lookup in C
+        boosts = np.fromiter(
+            map(self.boost_tokens.get, tokens, repeat(1.0)),
+            dtype=np.float32, count=len(tokens),
+        )
+        values = (counts * boosts) / (counts + self.k1)
 
-        for token, count in tf.items():
-            # Hash token to index (32-bit positive integer)
-            token_hash = int(hashlib.md5(token.encode()).hexdigest()[:8], 16)
-            indices.append(token_hash)
+        return indices, values.tolist()
 
-            # BM25-like term weight with boost
-            boost = self.boost_tokens.get(token, 1.0)
-            weight = (count * boost) / (count + self.k1)
-            values.append(weight)
+    def to_sparse_vectors(self, texts: List[str]) -> List[Tuple[List[int], List[float]]]:
+        """
+        Convert several texts to sparse vectors in one pass.
 
-        return indices, values
+        Same output as calling to_sparse_vector per text, but the terms of
+        all texts are weighted as one flat array and split back afterwards,
+        so numpy's per-call overhead is paid once per batch.
+
+        Returns:
+            List of (indices, values) tuples, in input order
+        """
+        tfs = [Counter(self.tokenize(text)) for text in texts]
+        tokens = [token for tf in tfs for token in tf]
+        if not tokens:
+            return [([], []) for _ in texts]
+
+        indices = [mmh3.hash(token, signed=False) for token in tokens]
+        counts = np.fromiter(
+            (count for tf in tfs for count in tf.values()),
+            dtype=np.float32, count=len(tokens),
+        )
+        boosts = np.fromiter(
+            map(self.boost_tokens.get, tokens, repeat(1.0)),
+            dtype=np.float32, count=len(tokens),
+        )
+        values = ((counts * boosts) / (counts + self.k1)).tolist()
+
+        vectors = []
+        start = 0
+        for tf in tfs:
+            end = start + len(tf)
+            vectors.append((indices[start:end], values[start:end]))
+            start = end
+        return vectors
+
+    def to_sparse_vectors_batch(
+        self,
+        texts: List[str],
+        max_workers: Optional[int] = None,
+        chunksize: int = 64,
+    ) -> List[Tuple[List[int], List[float]]]:
+        """
+        Convert many texts to sparse vectors for bulk indexing.
+
+        Batches larger than one chunk are tokenized across worker
+        processes; smaller ones run inline to skip pool startup.
+
+        Returns:
+            List of (indices, values) tuples, in input order
+        """
+        if len(texts) <= chunksize:
+            return self.to_sparse_vectors(texts)
+
+        chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return [
+                vector
+                for vectors in executor.map(self.to_sparse_vectors, chunks)
+                for vector in vectors
+            ]
 
 
 class HybridSearchEngine:
@@ -152,20 +262,76 @@ class HybridSearchEngine:
         host: str = QDRANT_HOST,
         port: int = QDRANT_PORT,
         collection_name: str = COLLECTION_UNIFIED,
-        embedding_fn=None  # Function to generate dense embeddings
+        embedding_fn=None,  # Function to generate dense embeddings
+        batch_embedding_fn=None,  # Optional: list of texts -> list of embeddings
     ):
         self.client = QdrantClient(
             host=host,
             port=port,
             grpc_port=QDRANT_GRPC_PORT,
             prefer_grpc=True,
+            grpc_options=QDRANT_GRPC_OPTIONS,
             timeout=60
         )
+        self.host = host
+        self.port = port
+        self._aclient: Optional[AsyncQdrantClient] = None
         self.collection_name = collection_name
         self.embedding_fn = embedding_fn
+        self.batch_embedding_fn = batch_embedding_fn
         self.tokenizer = BM25Tokenizer()
         self.config = HybridSearchConfig()
 
+        # Search presets are static; build them once (read-only afterwards)
+        self._presets = {
+            "code": SearchPresets.code_search(),
+            "semantic": SearchPresets.semantic_search(),
+            "keyword": SearchPresets.keyword_search(),
+            "network": SearchPresets.network_code_search(),
+            "gamecreator": SearchPresets.gamecreator_search(),
+            "docs": SearchPresets.documentation_search(),
+        }
+
+        # Built Filter models keyed on _freeze(filter_dict); see _get_filter
+        self._filter_cache: Dict[Any, Filter] = {}
+
+        # Query vectors are pure functions of the query text; cache per engine
+        self._dense_cache = lru_cache(maxsize=1024)(self._embed_query)
+        self._sparse_cache = lru_cache(maxsize=2048)(self._sparse_query)
+
+        # Full search results keyed on the search arguments, kept for at most
+        # response_cache_ttl seconds; see invalidate_cache()
+        self._response_cache: OrderedDict = OrderedDict()
+        self.response_cache_size = 512
+        self.response_cache_ttl = 300.0
+
+    def invalidate_cache(self):
+        """Drop cached search responses (call after the index is updated)"""
+        self._response_cache.clear()
+
+    @property
+    def aclient(self) -> AsyncQdrantClient:
+        """Async client, created on first use by asearch()"""
+        if self._aclient is None:
+            self._aclient = AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=QDRANT_GRPC_PORT,
+                prefer_grpc=True,
+                grpc_options=QDRANT_GRPC_OPTIONS,
+                timeout=60
+            )
+        return self._aclient
+
+    def _embed_query(self, query: str) -> Tuple[float, ...]:
+        """Dense embedding for a query (cached via _dense_cache)"""
+        return tuple(self.embedding_fn(query))
+
+    def _sparse_query(self, query: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Sparse vector for a query (cached via _sparse_cache)"""
+        indices, values = self.tokenizer.to_sparse_vector(query)
+        return tuple(indices), tuple(values)
+
     def search(
         self,
         query: str,
@@ -193,9 +359,80 @@ class HybridSearchEngine:
         Returns:
             HybridSearchResponse with results and metadata
         """
-        import time
         start_time = time.time()
 
+        # Serve repeated searches from the response cache (only when the
+        # dense vector is derived from the query, not supplied by the caller)
+        cache_key = None
+        if dense_vector is None:
+            cache_key = (query, preset, _freeze(filter_dict), limit,
+                         dense_weight, sparse_weight, with_payload)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] > self.response_cache_ttl:
+                del self._response_cache[cache_key]
+                cached = None
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                _, cached_results, config_used = cached
+                return HybridSearchResponse(
+                    results=_copy_results(cached_results),
+                    total_found=len(cached_results),
+                    query=query,
+                    search_time_ms=(time.time() - start_time) * 1000,
+                    config_used=dict(config_used, cached=True),
+                )
+
+        (dense_vector, sparse_indices, sparse_values, qdrant_filter,
+         limit, dense_weight, sparse_weight) = self._prepare_search(
+            query, dense_vector, preset, filter_dict, limit, dense_weight, sparse_weight
+        )
+
+        # Perform hybrid search using Qdrant's fusion
+        results = self._hybrid_search_with_fusion(
+            dense_vector=dense_vector,
+            sparse_indices=sparse_indices,
+            sparse_values=sparse_values,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            filter=qdrant_filter,
+            limit=limit,
+            with_payload=with_payload,
+        )
+
+        search_time = (time.time() - start_time) * 1000
+
+        config_used = {
+            "dense_weight": dense_weight,
+            "sparse_weight": sparse_weight,
+            "preset": preset,
+            "limit": limit,
+        }
+
+        # Empty results aren't cached so a transient failure isn't remembered
+        if cache_key is not None and results:
+            self._response_cache[cache_key] = (time.monotonic(), tuple(_copy_results(results)), config_used)
+            if len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+        return HybridSearchResponse(
+            results=results,
+            total_found=len(results),
+            query=query,
+            search_time_ms=search_time,
+            config_used=dict(config_used),
+        )
+
+    def _prepare_search(
+        self,
+        query: str,
+        dense_vector: Optional[List[float]],
+        preset: Optional[str],
+        filter_dict: Optional[Dict],
+        limit: int,
+        dense_weight: float,
+        sparse_weight: float,
+    ) -> Tuple:
+        """Apply preset and build query vectors and filter for a search"""
         # Apply preset if specified
         if preset:
             preset_config = self._get_preset_config(preset)
@@ -205,28 +442,79 @@ class HybridSearchEngine:
                 filter_dict = preset_config["filter"]
             limit = preset_config.get("final_limit", limit)
 
-        # Generate dense vector if not provided
+        # Generate dense vector if not provided. Bare identifiers
+        # ("SpawnObjectAsServerRpc") are served by the sparse route alone.
         if dense_vector is None and self.embedding_fn:
-            dense_vector = self.embedding_fn(query)
+            if not (self.config.skip_dense_for_identifiers and _is_identifier_query(query)):
+                dense_vector = list(self._dense_cache(query))
 
         # Generate sparse vector
-        sparse_indices, sparse_values = self.tokenizer.to_sparse_vector(query)
+        cached_indices, cached_values = self._sparse_cache(query)
+        sparse_indices, sparse_values = list(cached_indices), list(cached_values)
 
         # Build filter
-        qdrant_filter = self._build_filter(filter_dict) if filter_dict else None
+        qdrant_filter = self._get_filter(filter_dict) if filter_dict else None
 
-        # Perform hybrid search using Qdrant's fusion
-        results = self._hybrid_search_with_fusion(
-            dense_vector=dense_vector,
-            sparse_indices=sparse_indices,
-            sparse_values=sparse_values,
-            dense_weight=dense_weight,
-            sparse_weight=sparse_weight,
-            filter=qdrant_filter,
-            limit=limit,
-            with_payload=with_payload,
+        return (dense_vector, sparse_indices, sparse_values, qdrant_filter,
+                limit, dense_weight, sparse_weight)
+
+    async def asearch(
+        self,
+        query: str,
+        dense_vector: Optional[List[float]] = None,
+        preset: Optional[str] = None,
+        filter_dict: Optional[Dict] = None,
+        limit: int = 20,
+        dense_weight: float = DEFAULT_DENSE_WEIGHT,
+        sparse_weight: float = DEFAULT_SPARSE_WEIGHT,
+        with_payload: bool = True,
+    ) -> HybridSearchResponse:
+        """
+        Async variant of search() using AsyncQdrantClient.
+
+        If the fusion query fails, the dense and sparse searches are issued
+        concurrently and merged client-side with RRF.
+        """
+        start_time = time.time()
+
+        (dense_vector, sparse_indices, sparse_values, qdrant_filter,
+         limit, dense_weight, sparse_weight) = self._prepare_search(
+            query, dense_vector, preset, filter_dict, limit, dense_weight, sparse_weight
+        )
+
+        prefetch_queries = self._build_prefetch(
+            dense_vector, sparse_indices, sparse_values, qdrant_filter, limit
         )
 
+        if not prefetch_queries:
+            points, _ = await self.aclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=qdrant_filter,
+                limit=limit,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            results = [
+                SearchResult(id=str(point.id), score=1.0, payload=point.payload or {})
+                for point in points
+            ]
+        else:
+            try:
+                response = await self.aclient.query_points(
+                    collection_name=self.collection_name,
+                    prefetch=prefetch_queries,
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=limit,
+                    with_payload=with_payload,
+                )
+                results = _to_search_results(response.points)
+            except Exception as e:
+                print(f"[WARNING] Fusion search failed: {e}")
+                results = await self._afallback_search(
+                    dense_vector, sparse_indices, sparse_values,
+                    qdrant_filter, limit, with_payload
+                )
+
         search_time = (time.time() - start_time) * 1000
 
         return HybridSearchResponse(
@@ -242,22 +530,167 @@ class HybridSearchEngine:
             }
         )
 
-    def _hybrid_search_with_fusion(
+    async def _afallback_search(
         self,
         dense_vector: Optional[List[float]],
         sparse_indices: List[int],
         sparse_values: List[float],
-        dense_weight: float,
-        sparse_weight: float,
         filter: Optional[Filter],
         limit: int,
         with_payload: bool,
     ) -> List[SearchResult]:
+        """Run dense and sparse searches concurrently and fuse them with RRF"""
+        searches = []
+        if dense_vector:
+            searches.append(self.aclient.query_points(
+                collection_name=self.collection_name,
+                query=dense_vector,
+                using="dense",
+                query_filter=filter,
+                limit=limit,
+                with_payload=with_payload,
+            ))
+        if sparse_indices:
+            searches.append(self.aclient.query_points(
+                collection_name=self.collection_name,
+                query=SparseVector(indices=sparse_indices, values=sparse_values),
+                using="sparse",
+                query_filter=filter,
+                limit=limit,
+                with_payload=with_payload,
+            ))
+
+        if not searches:
+            return []
+
+        responses = await asyncio.gather(*searches)
+        return self._rrf_merge([response.points for response in responses], limit)
+
+    def _rrf_merge(self, ranked_lists: List[List[Any]], limit: int) -> List[SearchResult]:
+        """Client-side Reciprocal Rank Fusion over several ranked point lists"""
+        scores = defaultdict(float)
+        points = {}
+        for ranked in ranked_lists:
+            for rank, point in enumerate(ranked):
+                point_id = str(point.id)
+                scores[point_id] += 1.0 / (self.config.rrf_k + rank + 1)
+                points.setdefault(point_id, point)
+
+        ranked_ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+        return [
+            SearchResult(
+                id=point_id,
+                score=scores[point_id],
+                payload=points[point_id].payload or {},
+            )
+            for point_id in ranked_ids
+        ]
+
+    def search_many(
+        self,
+        queries: List[str],
+        preset: Optional[str] = None,
+        filter_dict: Optional[Dict] = None,
+        limit: int = 20,
+        with_payload: bool = True,
+    ) -> List[HybridSearchResponse]:
         """
-        Perform hybrid search using Qdrant's native fusion.
+        Run several hybrid searches in a single batched Qdrant request.
 
-        Uses Reciprocal Rank Fusion (RRF) for combining results.
+        Args:
+            queries: Search query texts
+            preset: Search preset name applied to every query
+            filter_dict: Filter conditions applied to every query
+            limit: Maximum results per query
+            with_payload: Include payload in results
+
+        Returns:
+            One HybridSearchResponse per query, in input order
+        """
+        start_time = time.time()
+
+        if not queries:
+            return []
+
+        if preset:
+            preset_config = self._get_preset_config(preset)
+            if "filter" in preset_config and not filter_dict:
+                filter_dict = preset_config["filter"]
+            limit = preset_config.get("final_limit", limit)
+
+        qdrant_filter = self._get_filter(filter_dict) if filter_dict else None
+
+        # Dense vectors: one batched model call when available
+        if self.batch_embedding_fn:
+            dense_vectors = [list(v) for v in self.batch_embedding_fn(queries)]
+        elif self.embedding_fn:
+            dense_vectors = [list(self._dense_cache(q)) for q in queries]
+        else:
+            dense_vectors = [None] * len(queries)
+
+        requests = []
+        for query, dense_vector in zip(queries, dense_vectors):
+            sparse_indices, sparse_values = self._sparse_cache(query)
+            prefetch = self._build_prefetch(
+                dense_vector, list(sparse_indices), list(sparse_values), qdrant_filter, limit
+            )
+            if prefetch:
+                requests.append(QueryRequest(
+                    prefetch=prefetch,
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=limit,
+                    with_payload=with_payload,
+                ))
+            else:
+                # No vectors: filter-only query behaves like scroll
+                requests.append(QueryRequest(
+                    filter=qdrant_filter,
+                    limit=limit,
+                    with_payload=with_payload,
+                ))
+
+        batch = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests,
+        )
+
+        search_time = (time.time() - start_time) * 1000
+
+        responses = []
+        for query, response in zip(queries, batch):
+            results = _to_search_results(response.points)
+            responses.append(HybridSearchResponse(
+                results=results,
+                total_found=len(results),
+                query=query,
+                search_time_ms=search_time,
+                config_used={
+                    "preset": preset,
+                    "limit": limit,
+                    "batch_size": len(queries),
+                }
+            ))
+        return responses
+
+    def _build_prefetch(
+        self,
+        dense_vector: Optional[List[float]],
+        sparse_indices: List[int],
+        sparse_values: List[float],
+        filter: Optional[Filter],
+        limit: int,
+    ) -> List[Prefetch]:
+        """
+        Build dense/sparse prefetch stages for RRF fusion.
+
+        Prefetch depth follows the RRF rank-window rule: it scales with the
+        final limit (limit * prefetch_oversample, at least min_prefetch_limit)
+        and is capped by the configured per-modality prefetch limits.
         """
+        window = max(limit * self.config.prefetch_oversample, self.config.min_prefetch_limit)
+        dense_limit = min(self.config.dense_prefetch_limit, window)
+        sparse_limit = min(self.config.sparse_prefetch_limit, window)
+
         prefetch_queries = []
 
         # Dense search prefetch
@@ -266,7 +699,7 @@ class HybridSearchEngine:
                 Prefetch(
                     query=dense_vector,
                     using="dense",
-                    limit=self.config.dense_prefetch_limit,
+                    limit=dense_limit,
                     filter=filter,
                 )
             )
@@ -280,11 +713,33 @@ class HybridSearchEngine:
                         values=sparse_values,
                     ),
                     using="sparse",
-                    limit=self.config.sparse_prefetch_limit,
+                    limit=sparse_limit,
                     filter=filter,
                 )
             )
 
+        return prefetch_queries
+
+    def _hybrid_search_with_fusion(
+        self,
+        dense_vector: Optional[List[float]],
+        sparse_indices: List[int],
+        sparse_values: List[float],
+        dense_weight: float,
+        sparse_weight: float,
+        filter: Optional[Filter],
+        limit: int,
+        with_payload: bool,
+    ) -> List[SearchResult]:
+        """
+        Perform hybrid search using Qdrant's native fusion.
+
+        Uses Reciprocal Rank Fusion (RRF) for combining results.
+        """
+        prefetch_queries = self._build_prefetch(
+            dense_vector, sparse_indices, sparse_values, filter, limit
+        )
+
         # If no vectors available, fall back to scroll
         if not prefetch_queries:
             return self._fallback_scroll_search(filter, limit, with_payload)
@@ -299,64 +754,41 @@ class HybridSearchEngine:
                 with_payload=with_payload,
             )
 
-            return [
-                SearchResult(
-                    id=str(point.id),
-                    score=point.score,
-                    payload=point.payload or {},
-                )
-                for point in results.points
-            ]
+            return _to_search_results(results.points)
 
         except Exception as e:
             print(f"[WARNING] Fusion search failed: {e}")
-            # Fall back to dense-only or sparse-only
-            return self._fallback_single_search(
-                dense_vector, sparse_indices, sparse_values,
-                filter, limit, with_payload
-            )
+            # Retry with one modality at a time, still via the Query API
+            return self._fallback_single_search(prefetch_queries, limit, with_payload)
 
     def _fallback_single_search(
         self,
-        dense_vector: Optional[List[float]],
-        sparse_indices: List[int],
-        sparse_values: List[float],
-        filter: Optional[Filter],
+        prefetch_queries: List[Prefetch],
         limit: int,
         with_payload: bool,
     ) -> List[SearchResult]:
-        """Fallback to single-vector search if fusion fails"""
+        """
+        Fallback when the combined fusion query fails.
 
-        if dense_vector:
-            results = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=NamedVector(name="dense", vector=dense_vector),
-                query_filter=filter,
-                limit=limit,
-                with_payload=with_payload,
-            )
-        elif sparse_indices:
-            results = self.client.search(
-                collection_name=self.collection_name,
-                query_vector=NamedSparseVector(
-                    name="sparse",
-                    vector=SparseVector(indices=sparse_indices, values=sparse_values)
-                ),
-                query_filter=filter,
-                limit=limit,
-                with_payload=with_payload,
-            )
-        else:
-            return []
+        Re-issues the RRF query with a single prefetch (dense first, then
+        sparse) and returns the first modality that succeeds.
+        """
+        for prefetch in prefetch_queries:
+            try:
+                results = self.client.query_points(
+                    collection_name=self.collection_name,
+                    prefetch=[prefetch],
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=limit,
+                    with_payload=with_payload,
+                )
+            except Exception as e:
+                print(f"[WARNING] {prefetch.using} search failed: {e}")
+                continue
 
-        return [
-            SearchResult(
-                id=str(point.id),
-                score=point.score,
-                payload=point.payload or {},
-            )
-            for point in results
-        ]
+            return _to_search_results(results.points)
+
+        return []
 
     def _fallback_scroll_search(
         self,
@@ -384,15 +816,17 @@ class HybridSearchEngine:
 
     def _get_preset_config(self, preset: str) -> Dict[str, Any]:
         """Get configuration for a search preset"""
-        presets = {
-            "code": SearchPresets.code_search(),
-            "semantic": SearchPresets.semantic_search(),
-            "keyword": SearchPresets.keyword_search(),
-            "network": SearchPresets.network_code_search(),
-            "gamecreator": SearchPresets.gamecreator_search(),
-            "docs": SearchPresets.documentation_search(),
-        }
-        return presets.get(preset, {})
+        return self._presets.get(preset, {})
+
+    def _get_filter(self, filter_dict: Dict) -> Filter:
+        """Build a Qdrant filter, reusing the one built for an identical dict"""
+        key = _freeze(filter_dict)
+        qdrant_filter = self._filter_cache.get(key)
+        if qdrant_filter is None:
+            if len(self._filter_cache) >= 256:
+                self._filter_cache.clear()
+            qdrant_filter = self._filter_cache[key] = self._build_filter(filter_dict)
+        return qdrant_filter
 
     def _build_filter(self, filter_dict: Dict) -> Filter:
         """Build Qdrant filter from dictionary"""
@@ -429,14 +863,12 @@ class HybridSearchEngine:
         key = condition.get("key")
         match = condition.get("match", {})
 
-        if "value" in match:
-            return FieldCondition(key=key, match=MatchValue(value=match["value"]))
-        elif "any" in match:
-            return FieldCondition(key=key, match=MatchAny(any=match["any"]))
-        elif "text" in match:
-            return FieldCondition(key=key, match=MatchText(text=match["text"]))
-        else:
-            return FieldCondition(key=key, match=MatchValue(value=True))
+        for match_type, match_value in match.items():
+            handler = _MATCH_HANDLERS.get(match_type)
+            if handler is not None:
+                return FieldCondition(key=key, match=handler(match_value))
+
+        return FieldCondition(key=key, match=MatchValue(value=True))
 
     def search_code(self, query: str, **kwargs) -> HybridSearchResponse:
         """Shortcut for code search"""
@@ -478,6 +910,12 @@ def get_search_engine(embedding_fn=None) -> HybridSearchEngine:
     return _search_engine
 
 
+def invalidate_search_cache():
+    """Drop the default engine's cached responses (indexers call this after upserting)"""
+    if _search_engine is not None:
+        _search_engine.invalidate_cache()
+
+
 def hybrid_search(
     query: str,
     preset: str = None,
@@ -539,7 +977,7 @@ def main():
 
     args = parser.parse_args()
 
-    engine = HybridSearchEngine()
+    engine = get_search_engine()
 
     if args.interactive:
         print("MLcreator KB Hybrid Search (type 'quit' to exit)")
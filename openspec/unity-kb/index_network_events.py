@@ -19,30 +19,104 @@ Version: 1.0
 
 import os
 import re
+import codecs
+import mmap
 import json
+import pickle
 import hashlib
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 
 try:
     from qdrant_client import QdrantClient
-    from qdrant_client.models import PointStruct, VectorParams, Distance
+    from qdrant_client.models import PointStruct, PayloadSchemaType
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
     print("Warning: qdrant_client not installed. Will export to JSON only.")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 QDRANT_HOST = "localhost"
 QDRANT_PORT = 6333
+QDRANT_GRPC_PORT = 6334
 EVENTS_COLLECTION = "mlcreator_network_events"
+UPSERT_BATCH_SIZE = 256
+PAYLOAD_INDEX_FIELDS = ("type", "event_name", "class_name")
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 MULTIPLAYER_PATH = PROJECT_ROOT / "Assets" / "Plugins" / "GameCreator" / "Packages" / "MLCreator_Multiplayer"
-
-
-@dataclass
+SCAN_CACHE_PATH = PROJECT_ROOT / "claudedocs" / "reports" / ".network_events_scan_cache.pkl"
+SCAN_CACHE_VERSION = 2  # bump when scan_file output changes
+
+# Precompiled C# patterns (compiled once per process, not per file/line).
+# They are byte patterns run directly over the mmap'd file; only the groups
+# that end up in a dataclass are decoded.
+_RE_NAMESPACE = re.compile(rb'namespace\s+([\w.]+)')
+_RE_CLASS = re.compile(rb'(?:public|internal|private)?\s*(?:partial\s+)?class\s+(\w+)')
+_RE_RPC_METHOD = re.compile(rb'(?:private|public|protected)?\s*(?:void|Task|async\s+Task)\s+(\w+)\s*\((.*?)\)')
+_RE_NEW_TYPE = re.compile(rb'new\s+(\w+)')
+_RE_INVOKE_NAME = re.compile(rb'(\w+)\?\s*\.Invoke')
+
+# Whitespace that never crosses a line break, so every match of the fused
+# scanner below stays on one line like the old per-line searches did.
+_WS = r'[^\S\n]'
+
+# Method-looking declarations; scanned once per file to build the index that
+# _extract_current_method bisects into.
+_RE_METHOD_CTX = re.compile(
+    rf'(?:private|public|protected|internal)?{_WS}*(?:static{_WS}+)?(?:async{_WS}+)?'
+    rf'(?:void|Task|bool|int|string|[\w<>]+){_WS}+(\w+){_WS}*\('.encode()
+)
+
+# Event name categories in priority order. Each branch is a lookahead over the
+# whole name tried at position 0, so the first category with any keyword wins
+# (not the leftmost keyword), and lastgroup is the category name.
+_EVENT_CATEGORIES = (
+    ("spawn", ("spawn", "despawn", "player")),
+    ("connection", ("connect", "disconnect", "join", "left")),
+    ("input", ("input", "move", "look", "action")),
+    ("sync", ("sync", "variable", "change")),
+    ("rpc", ("rpc", "message")),
+    ("stats", ("health", "mana", "stat", "damage")),
+    ("inventory", ("inventory", "item", "equip")),
+    ("physics", ("collision", "trigger")),
+    ("animation", ("gesture", "animation")),
+)
+_CAT_RE = re.compile('|'.join(
+    rf'(?=.*?(?:{"|".join(keywords)}))(?P<{category}>)'
+    for category, keywords in _EVENT_CATEGORIES
+), re.IGNORECASE | re.DOTALL)
+
+# Every _RE_SCAN branch requires one of these literals
+_PROBE_TOKENS = (b'event', b'Rpc', b'.Invoke(', b'EventBus.', b'OnNetwork')
+
+# All per-line patterns fused into one alternation; match.lastgroup names the
+# branch that fired, which scan_file dispatches on.
+_RE_SCAN = re.compile('|'.join([
+    rf'(?P<event_instance>public{_WS}+event{_WS}+(?P<ei_params>Action<[^>\n]+>|Action){_WS}*\??{_WS}+(?P<ei_name>\w+))',
+    rf'(?P<event_static>public{_WS}+static{_WS}+event{_WS}+'
+    rf'(?P<es_params>System\.Action<[^>\n]+>|System\.Action|Action<[^>\n]+>|Action){_WS}+(?P<es_name>\w+))',
+    rf'(?P<invoke>(?P<inv_name>\w+)\?{_WS}*\.Invoke\(.*?\))',
+    rf'(?P<eventbus>EventBus\.Fire\((?P<bus_args>.*?)\))',
+    r'(?P<server_rpc>\[ServerRpc[^\]\n]*\])',
+    r'(?P<client_rpc>\[ClientRpc[^\]\n]*\])',
+    rf'(?P<spawn>public{_WS}+override{_WS}+void{_WS}+(?P<spawn_name>OnNetworkSpawn|OnNetworkDespawn))',
+]).encode())
+
+
+@dataclass(slots=True)
 class EventDeclaration:
     """Represents an event declaration"""
     event_name: str
@@ -56,7 +130,7 @@ class EventDeclaration:
     full_signature: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EventTrigger:
     """Represents an event trigger/fire location"""
     event_name: str
@@ -65,11 +139,21 @@ class EventTrigger:
     line_number: int
     method_name: str
     class_name: str
-    context: str  # surrounding code context
+    context_start: int  # first line (0-based) of the surrounding code context
+    context_end: int  # one past the last context line
     is_authority: bool  # whether this is the designated authority
 
+    @property
+    def context(self) -> str:
+        """Surrounding code context, read back from the source file on demand"""
+        content, line_starts = _source_text(self.file_path)
+        if self.context_start >= len(line_starts):
+            return ""
+        end = line_starts[self.context_end] - 1 if self.context_end < len(line_starts) else len(content)
+        return content[line_starts[self.context_start]:end]
 
-@dataclass
+
+@dataclass(slots=True)
 class RPCDefinition:
     """Represents an RPC method definition"""
     method_name: str
@@ -82,7 +166,7 @@ class RPCDefinition:
     namespace: str
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkSpawnChain:
     """Represents OnNetworkSpawn/Despawn override"""
     method_name: str  # OnNetworkSpawn or OnNetworkDespawn
@@ -93,6 +177,292 @@ class NetworkSpawnChain:
     namespace: str
 
 
+def _walk_cs(root: str) -> Iterator[os.DirEntry]:
+    """Yield every *.cs file entry under root (symlinked directories are not followed)"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.cs'):
+                        yield entry
+        except OSError as e:
+            print(f"Warning: Cannot list directory: {e}")
+
+
+def scan_file(file_path: str, project_root: Path = PROJECT_ROOT) -> Dict[str, list]:
+    """
+    Scan a single C# file for events, triggers, RPCs and spawn chains.
+
+    Module-level and free of indexer state so it can run in a worker process;
+    returns a dict with 'events', 'triggers', 'rpcs' and 'spawn_chains' lists.
+    """
+    result = {"events": [], "triggers": [], "rpcs": [], "spawn_chains": []}
+    relative_path = os.path.relpath(file_path, project_root)
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return result
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                _scan_buffer(buf, relative_path, result)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: Could not read {file_path}: {e}")
+    return result
+
+
+def _scan_buffer(buf, file_path: str, result: Dict[str, list]):
+    """Run the fused scanner over one mapped file and fill result"""
+    # Most files contain none of the constructs we index; a memchr-speed
+    # substring probe lets them skip the regex passes entirely
+    if not any(buf.find(token) != -1 for token in _PROBE_TOKENS):
+        return
+
+    line_starts = _line_starts(buf)
+
+    # Extract namespace
+    namespace = _extract_namespace(buf)
+
+    # Extract class name(s)
+    class_names = _extract_classes(buf)
+    current_class = class_names[0] if class_names else "Unknown"
+
+    # Line of the first method-looking declaration on each line, in order
+    method_lines: List[int] = []
+    method_names: List[str] = []
+    for match in _RE_METHOD_CTX.finditer(buf):
+        line_index = _line_of(line_starts, match.start())
+        if not method_lines or method_lines[-1] != line_index:
+            method_lines.append(line_index)
+            method_names.append(_decode(match.group(1)))
+
+    # Single pass over the file. Each line yields at most one event
+    # declaration, one trigger (Invoke wins over EventBus.Fire), one
+    # ServerRpc/ClientRpc attribute each and one spawn override.
+    handled = set()
+    trigger_lines: Dict[int, re.Match] = {}
+
+    for match in _RE_SCAN.finditer(buf):
+        line_index = _line_of(line_starts, match.start())
+        kind = match.lastgroup
+
+        if kind == 'invoke' or kind == 'eventbus':
+            previous = trigger_lines.get(line_index)
+            if previous is None or (kind == 'invoke' and previous.lastgroup == 'eventbus'):
+                trigger_lines[line_index] = match
+            continue
+
+        key = (line_index, 'event' if kind.startswith('event_') else kind)
+        if key in handled:
+            continue
+        handled.add(key)
+
+        if kind == 'event_instance':
+            _add_event(result, match['ei_name'], "instance", match['ei_params'], buf, line_starts,
+                       file_path, line_index, namespace, current_class)
+        elif kind == 'event_static':
+            _add_event(result, match['es_name'], "static", match['es_params'], buf, line_starts,
+                       file_path, line_index, namespace, current_class)
+        elif kind == 'server_rpc':
+            _add_rpc(result, "ServerRpc", buf, line_starts, line_index, file_path, namespace, current_class)
+        elif kind == 'client_rpc':
+            _add_rpc(result, "ClientRpc", buf, line_starts, line_index, file_path, namespace, current_class)
+        elif kind == 'spawn':
+            _add_spawn_chain(result, _decode(match['spawn_name']), buf, line_starts, line_index,
+                             file_path, namespace, current_class)
+
+    for i in sorted(trigger_lines):
+        _add_trigger(result, trigger_lines[i], buf, line_starts, i, file_path, current_class,
+                     _extract_current_method(method_lines, method_names, i))
+
+
+def _decode(raw: bytes) -> str:
+    """Decode a matched byte group for storage"""
+    return raw.decode('utf-8', 'replace')
+
+
+def _line_starts(buf) -> List[int]:
+    """Byte offset of the start of every line (same line count as split('\\n'))"""
+    # Line 1 starts after a UTF-8 BOM, as with a utf-8-sig decode
+    starts = [len(codecs.BOM_UTF8) if buf[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0]
+    pos = buf.find(b'\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = buf.find(b'\n', pos + 1)
+    return starts
+
+
+def _line_of(line_starts: List[int], pos: int) -> int:
+    """0-based index of the line containing byte offset pos"""
+    return bisect_right(line_starts, pos) - 1
+
+
+def _line_end(buf, line_starts: List[int], i: int) -> int:
+    """Byte offset just past line i, excluding its newline (and a CRLF's \\r)"""
+    end = line_starts[i + 1] - 1 if i + 1 < len(line_starts) else len(buf)
+    if end > line_starts[i] and buf[end - 1] == 0x0D:
+        end -= 1
+    return end
+
+
+def _line_text(buf, line_starts: List[int], i: int) -> str:
+    """Decode line i from the mapped buffer"""
+    return _decode(buf[line_starts[i]:_line_end(buf, line_starts, i)])
+
+
+def _row(item) -> Dict[str, Any]:
+    """Shallow field dict of an indexer dataclass (avoids asdict's deep copy)"""
+    return {name: getattr(item, name) for name in item.__dataclass_fields__}
+
+
+@lru_cache(maxsize=32)
+def _source_text(file_path: str) -> Tuple[str, List[int]]:
+    """Decoded text and line start offsets of a scanned file, for lazy trigger context"""
+    try:
+        content = (PROJECT_ROOT / file_path).read_bytes().decode('utf-8-sig', errors='replace')
+    except OSError:
+        return "", [0]
+    content = content.replace('\r\n', '\n')
+    line_starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return content, line_starts
+
+
+def _extract_namespace(buf) -> str:
+    """Extract namespace from C# file"""
+    match = _RE_NAMESPACE.search(buf)
+    return _decode(match.group(1)) if match else "Global"
+
+
+def _extract_classes(buf) -> List[str]:
+    """Extract class names from C# file"""
+    matches = [_decode(name) for name in _RE_CLASS.findall(buf)]
+    return matches if matches else ["Unknown"]
+
+
+@lru_cache(maxsize=4096)
+def _categorize_event(event_name: str) -> str:
+    """Categorize event based on name patterns"""
+    match = _CAT_RE.match(event_name)
+    return match.lastgroup if match else "general"
+
+
+def _extract_current_method(method_lines: List[int], method_names: List[str], current_line: int) -> str:
+    """Extract the method name containing the current line"""
+    idx = bisect_right(method_lines, current_line) - 1
+    return method_names[idx] if idx >= 0 else "Unknown"
+
+
+def _add_event(result: Dict[str, list], raw_name: bytes, event_type: str, raw_params: bytes,
+               buf, line_starts: List[int], file_path: str, i: int, namespace: str, class_name: str):
+    """Record an event declaration found on line i"""
+    name = _decode(raw_name)
+    result["events"].append(EventDeclaration(
+        event_name=name,
+        event_type=event_type,
+        parameters=_decode(raw_params),
+        file_path=file_path,
+        line_number=i + 1,
+        class_name=class_name,
+        namespace=namespace,
+        category=_categorize_event(name),
+        full_signature=_line_text(buf, line_starts, i).strip()
+    ))
+
+
+def _add_trigger(result: Dict[str, list], match: re.Match, buf, line_starts: List[int], i: int,
+                 file_path: str, class_name: str, method_name: str):
+    """Record an event trigger (.Invoke() or EventBus.Fire()) found on line i"""
+    if match.lastgroup == 'invoke':
+        event_name = _decode(match['inv_name'])
+        trigger_type = "invoke"
+    else:
+        # Extract event type from constructor
+        event_type_match = _RE_NEW_TYPE.search(match['bus_args'])
+        event_name = _decode(event_type_match.group(1)) if event_type_match else "Unknown"
+        trigger_type = "eventbus_fire"
+
+    result["triggers"].append(EventTrigger(
+        event_name=event_name,
+        trigger_type=trigger_type,
+        file_path=file_path,
+        line_number=i + 1,
+        method_name=method_name,
+        class_name=class_name,
+        context_start=max(0, i - 2),
+        context_end=min(len(line_starts), i + 3),
+        is_authority=False  # Will be determined during analysis
+    ))
+
+
+def _add_rpc(result: Dict[str, list], rpc_type: str, buf, line_starts: List[int], i: int,
+             file_path: str, namespace: str, class_name: str):
+    """Record the RPC method following the attribute on line i"""
+    # Look for method on next lines
+    for j in range(i + 1, min(i + 3, len(line_starts))):
+        method_match = _RE_RPC_METHOD.search(buf, line_starts[j], _line_end(buf, line_starts, j))
+        if method_match:
+            result["rpcs"].append(RPCDefinition(
+                method_name=_decode(method_match.group(1)),
+                rpc_type=rpc_type,
+                file_path=file_path,
+                line_number=j + 1,
+                class_name=class_name,
+                parameters=_decode(method_match.group(2)),
+                attributes=_line_text(buf, line_starts, i).strip(),
+                namespace=namespace
+            ))
+            break
+
+
+def _add_spawn_chain(result: Dict[str, list], method_name: str, buf, line_starts: List[int], i: int,
+                     file_path: str, namespace: str, class_name: str):
+    """Record an OnNetworkSpawn/Despawn override starting on line i"""
+    # Look for events fired within this method (next ~50 lines)
+    fired_events = []
+    brace_count = 0
+    in_method = False
+
+    for j in range(i, min(i + 100, len(line_starts))):
+        method_line = buf[line_starts[j]:_line_end(buf, line_starts, j)]
+
+        if b'{' in method_line:
+            brace_count += method_line.count(b'{')
+            in_method = True
+        if b'}' in method_line:
+            brace_count -= method_line.count(b'}')
+
+        if in_method and brace_count == 0:
+            break
+
+        # Look for event fires
+        if b'EventBus.Fire' in method_line:
+            event_match = _RE_NEW_TYPE.search(method_line)
+            if event_match:
+                fired_events.append(_decode(event_match.group(1)))
+        if b'.Invoke(' in method_line:
+            invoke_match = _RE_INVOKE_NAME.search(method_line)
+            if invoke_match:
+                fired_events.append(_decode(invoke_match.group(1)))
+
+    result["spawn_chains"].append(NetworkSpawnChain(
+        method_name=method_name,
+        file_path=file_path,
+        line_number=i + 1,
+        class_name=class_name,
+        fires_events=fired_events,
+        namespace=namespace
+    ))
+
+
 class NetworkEventIndexer:
     """Indexes network events and triggers into Qdrant"""
 
@@ -105,12 +475,24 @@ class NetworkEventIndexer:
 
         if QDRANT_AVAILABLE:
             try:
-                self.client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, timeout=60)
+                self.client = QdrantClient(
+                    host=QDRANT_HOST,
+                    port=QDRANT_PORT,
+                    grpc_port=QDRANT_GRPC_PORT,
+                    prefer_grpc=True,
+                    timeout=60
+                )
             except Exception as e:
                 print(f"Warning: Could not connect to Qdrant: {e}")
 
-    def scan_directory(self, root_path: Path = None):
-        """Scan all C# files in the directory"""
+    def scan_directory(self, root_path: Path = None, workers: Optional[int] = None, force: bool = False):
+        """
+        Scan all C# files in the directory
+
+        Files are scanned in parallel with a process pool; pass workers=1 to
+        scan in-process (easier to debug). Files whose mtime and size match
+        the scan cache reuse their cached results unless force is set.
+        """
         if root_path is None:
             root_path = MULTIPLAYER_PATH
 
@@ -119,11 +501,38 @@ class NetworkEventIndexer:
             return
 
         print(f"Scanning: {root_path}")
-        cs_files = list(root_path.rglob("*.cs"))
+        cs_entries = list(_walk_cs(str(root_path)))
+        cs_files = [entry.path for entry in cs_entries]
         print(f"Found {len(cs_files)} C# files")
 
+        cached = {} if force else self._load_scan_cache()
+        stamps = {}
+        results_by_file = {}
+        stale_files = []
+        for cs_file, dir_entry in zip(cs_files, cs_entries):
+            stat = dir_entry.stat()
+            stamps[cs_file] = (stat.st_mtime_ns, stat.st_size)
+            entry = cached.get(cs_file)
+            if entry is not None and entry[0] == stamps[cs_file]:
+                results_by_file[cs_file] = entry[1]
+            else:
+                stale_files.append(cs_file)
+
+        if cached:
+            print(f"  Reusing cached results for {len(results_by_file)} unchanged files")
+        results_by_file.update(zip(stale_files, self._scan_files(stale_files, workers)))
+
         for cs_file in cs_files:
-            self._process_file(cs_file)
+            result = results_by_file[cs_file]
+            self.events.extend(result["events"])
+            self.triggers.extend(result["triggers"])
+            self.rpcs.extend(result["rpcs"])
+            self.spawn_chains.extend(result["spawn_chains"])
+
+        self._save_scan_cache({
+            cs_file: (stamps[cs_file], results_by_file[cs_file])
+            for cs_file in cs_files
+        })
 
         print(f"\nScan Results:")
         print(f"  Event Declarations: {len(self.events)}")
@@ -131,282 +540,49 @@ class NetworkEventIndexer:
         print(f"  RPC Definitions: {len(self.rpcs)}")
         print(f"  Network Spawn Chains: {len(self.spawn_chains)}")
 
-    def _process_file(self, file_path: Path):
-        """Process a single C# file"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception:
+    def _scan_files(self, cs_files: List[str], workers: Optional[int] = None) -> List[Dict[str, list]]:
+        """Run scan_file over cs_files, in a process pool unless workers=1"""
+        if workers != 1 and len(cs_files) > 1:
+            pool_size = workers or os.cpu_count() or 1
+            chunksize = max(1, min(32, len(cs_files) // (pool_size * 4)))
             try:
-                content = file_path.read_text(encoding='utf-8-sig')
+                with ProcessPoolExecutor(max_workers=pool_size) as executor:
+                    return list(executor.map(scan_file, cs_files, repeat(PROJECT_ROOT),
+                                             chunksize=chunksize))
             except Exception as e:
-                print(f"  Warning: Could not read {file_path}: {e}")
-                return
-
-        relative_path = str(file_path.relative_to(PROJECT_ROOT))
-        lines = content.split('\n')
-
-        # Extract namespace
-        namespace = self._extract_namespace(content)
-
-        # Extract class name(s)
-        class_names = self._extract_classes(content)
-        current_class = class_names[0] if class_names else "Unknown"
-
-        # Find event declarations
-        self._find_event_declarations(lines, relative_path, namespace, current_class)
-
-        # Find event triggers
-        self._find_event_triggers(lines, relative_path, current_class)
-
-        # Find RPC definitions
-        self._find_rpc_definitions(lines, relative_path, namespace, current_class)
-
-        # Find network spawn chains
-        self._find_spawn_chains(lines, relative_path, namespace, current_class)
-
-    def _extract_namespace(self, content: str) -> str:
-        """Extract namespace from C# file"""
-        match = re.search(r'namespace\s+([\w.]+)', content)
-        return match.group(1) if match else "Global"
-
-    def _extract_classes(self, content: str) -> List[str]:
-        """Extract class names from C# file"""
-        matches = re.findall(r'(?:public|internal|private)?\s*(?:partial\s+)?class\s+(\w+)', content)
-        return matches if matches else ["Unknown"]
-
-    def _categorize_event(self, event_name: str) -> str:
-        """Categorize event based on name patterns"""
-        name_lower = event_name.lower()
-        if any(x in name_lower for x in ['spawn', 'despawn', 'player']):
-            return "spawn"
-        elif any(x in name_lower for x in ['connect', 'disconnect', 'join', 'left']):
-            return "connection"
-        elif any(x in name_lower for x in ['input', 'move', 'look', 'action']):
-            return "input"
-        elif any(x in name_lower for x in ['sync', 'variable', 'change']):
-            return "sync"
-        elif any(x in name_lower for x in ['rpc', 'message']):
-            return "rpc"
-        elif any(x in name_lower for x in ['health', 'mana', 'stat', 'damage']):
-            return "stats"
-        elif any(x in name_lower for x in ['inventory', 'item', 'equip']):
-            return "inventory"
-        elif any(x in name_lower for x in ['collision', 'trigger']):
-            return "physics"
-        elif any(x in name_lower for x in ['gesture', 'animation']):
-            return "animation"
-        else:
-            return "general"
+                print(f"  Warning: Parallel scan failed ({e}), falling back to single process")
+        return [scan_file(cs_file, PROJECT_ROOT) for cs_file in cs_files]
 
-    def _find_event_declarations(self, lines: List[str], file_path: str, namespace: str, class_name: str):
-        """Find all event declarations"""
-        # Pattern for instance events
-        instance_pattern = re.compile(
-            r'public\s+event\s+(Action<[^>]+>|Action)\s*\??\s+(\w+)'
-        )
-        # Pattern for static events
-        static_pattern = re.compile(
-            r'public\s+static\s+event\s+(System\.Action<[^>]+>|System\.Action|Action<[^>]+>|Action)\s+(\w+)'
-        )
-
-        for i, line in enumerate(lines):
-            line_num = i + 1
-
-            # Check instance events
-            match = instance_pattern.search(line)
-            if match:
-                params = match.group(1)
-                name = match.group(2)
-                self.events.append(EventDeclaration(
-                    event_name=name,
-                    event_type="instance",
-                    parameters=params,
-                    file_path=file_path,
-                    line_number=line_num,
-                    class_name=class_name,
-                    namespace=namespace,
-                    category=self._categorize_event(name),
-                    full_signature=line.strip()
-                ))
-                continue
-
-            # Check static events
-            match = static_pattern.search(line)
-            if match:
-                params = match.group(1)
-                name = match.group(2)
-                self.events.append(EventDeclaration(
-                    event_name=name,
-                    event_type="static",
-                    parameters=params,
-                    file_path=file_path,
-                    line_number=line_num,
-                    class_name=class_name,
-                    namespace=namespace,
-                    category=self._categorize_event(name),
-                    full_signature=line.strip()
-                ))
-
-    def _find_event_triggers(self, lines: List[str], file_path: str, class_name: str):
-        """Find all event trigger locations"""
-        # Pattern for .Invoke() calls
-        invoke_pattern = re.compile(r'(\w+)\?\s*\.Invoke\((.*?)\)')
-        # Pattern for EventBus.Fire()
-        eventbus_pattern = re.compile(r'EventBus\.Fire\((.*?)\)')
-        # Pattern for direct event invocation
-        direct_pattern = re.compile(r'(\w+)\s*\?\.\s*Invoke\((.*?)\)')
-
-        for i, line in enumerate(lines):
-            line_num = i + 1
-
-            # Get context (surrounding code)
-            start = max(0, i - 2)
-            end = min(len(lines), i + 3)
-            context = '\n'.join(lines[start:end])
-
-            # Extract method name from context
-            method_name = self._extract_current_method(lines, i)
-
-            # Check .Invoke() calls
-            match = invoke_pattern.search(line)
-            if match:
-                event_name = match.group(1)
-                self.triggers.append(EventTrigger(
-                    event_name=event_name,
-                    trigger_type="invoke",
-                    file_path=file_path,
-                    line_number=line_num,
-                    method_name=method_name,
-                    class_name=class_name,
-                    context=context,
-                    is_authority=False  # Will be determined during analysis
-                ))
-                continue
-
-            # Check EventBus.Fire()
-            match = eventbus_pattern.search(line)
-            if match:
-                event_data = match.group(1)
-                # Extract event type from constructor
-                event_type_match = re.search(r'new\s+(\w+)', event_data)
-                event_name = event_type_match.group(1) if event_type_match else "Unknown"
-                self.triggers.append(EventTrigger(
-                    event_name=event_name,
-                    trigger_type="eventbus_fire",
-                    file_path=file_path,
-                    line_number=line_num,
-                    method_name=method_name,
-                    class_name=class_name,
-                    context=context,
-                    is_authority=False
-                ))
-
-    def _find_rpc_definitions(self, lines: List[str], file_path: str, namespace: str, class_name: str):
-        """Find all RPC method definitions"""
-        server_rpc_pattern = re.compile(r'\[ServerRpc[^\]]*\]')
-        client_rpc_pattern = re.compile(r'\[ClientRpc[^\]]*\]')
-        method_pattern = re.compile(r'(?:private|public|protected)?\s*(?:void|Task|async\s+Task)\s+(\w+)\s*\((.*?)\)')
-
-        for i, line in enumerate(lines):
-            line_num = i + 1
-
-            # Check for ServerRpc
-            if server_rpc_pattern.search(line):
-                # Look for method on next lines
-                for j in range(i + 1, min(i + 3, len(lines))):
-                    method_match = method_pattern.search(lines[j])
-                    if method_match:
-                        self.rpcs.append(RPCDefinition(
-                            method_name=method_match.group(1),
-                            rpc_type="ServerRpc",
-                            file_path=file_path,
-                            line_number=j + 1,
-                            class_name=class_name,
-                            parameters=method_match.group(2),
-                            attributes=line.strip(),
-                            namespace=namespace
-                        ))
-                        break
-
-            # Check for ClientRpc
-            if client_rpc_pattern.search(line):
-                # Look for method on next lines
-                for j in range(i + 1, min(i + 3, len(lines))):
-                    method_match = method_pattern.search(lines[j])
-                    if method_match:
-                        self.rpcs.append(RPCDefinition(
-                            method_name=method_match.group(1),
-                            rpc_type="ClientRpc",
-                            file_path=file_path,
-                            line_number=j + 1,
-                            class_name=class_name,
-                            parameters=method_match.group(2),
-                            attributes=line.strip(),
-                            namespace=namespace
-                        ))
-                        break
-
-    def _find_spawn_chains(self, lines: List[str], file_path: str, namespace: str, class_name: str):
-        """Find OnNetworkSpawn/Despawn override chains"""
-        spawn_pattern = re.compile(r'public\s+override\s+void\s+(OnNetworkSpawn|OnNetworkDespawn)')
-
-        for i, line in enumerate(lines):
-            line_num = i + 1
-
-            match = spawn_pattern.search(line)
-            if match:
-                method_name = match.group(1)
-
-                # Look for events fired within this method (next ~50 lines)
-                fired_events = []
-                brace_count = 0
-                in_method = False
-
-                for j in range(i, min(i + 100, len(lines))):
-                    method_line = lines[j]
-
-                    if '{' in method_line:
-                        brace_count += method_line.count('{')
-                        in_method = True
-                    if '}' in method_line:
-                        brace_count -= method_line.count('}')
-
-                    if in_method and brace_count == 0:
-                        break
-
-                    # Look for event fires
-                    if 'EventBus.Fire' in method_line:
-                        event_match = re.search(r'new\s+(\w+)', method_line)
-                        if event_match:
-                            fired_events.append(event_match.group(1))
-                    if '.Invoke(' in method_line:
-                        invoke_match = re.search(r'(\w+)\?\s*\.Invoke', method_line)
-                        if invoke_match:
-                            fired_events.append(invoke_match.group(1))
-
-                self.spawn_chains.append(NetworkSpawnChain(
-                    method_name=method_name,
-                    file_path=file_path,
-                    line_number=line_num,
-                    class_name=class_name,
-                    fires_events=fired_events,
-                    namespace=namespace
-                ))
-
-    def _extract_current_method(self, lines: List[str], current_line: int) -> str:
-        """Extract the method name containing the current line"""
-        method_pattern = re.compile(r'(?:private|public|protected|internal)?\s*(?:static\s+)?(?:async\s+)?(?:void|Task|bool|int|string|[\w<>]+)\s+(\w+)\s*\(')
-
-        for i in range(current_line, -1, -1):
-            match = method_pattern.search(lines[i])
-            if match:
-                return match.group(1)
-        return "Unknown"
-
-    def generate_id(self, item_type: str, item_data: dict) -> str:
-        """Generate unique ID for an item"""
+    def _load_scan_cache(self) -> Dict[str, tuple]:
+        """Load {path: ((mtime_ns, size), result)} from SCAN_CACHE_PATH"""
+        if not SCAN_CACHE_PATH.exists():
+            return {}
+        try:
+            with open(SCAN_CACHE_PATH, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get("version") == SCAN_CACHE_VERSION and cache.get("project_root") == str(PROJECT_ROOT):
+                return cache["files"]
+        except Exception as e:
+            print(f"  Warning: Could not load scan cache: {e}")
+        return {}
+
+    def _save_scan_cache(self, files: Dict[str, tuple]):
+        """Persist per-file scan results for the next incremental run"""
+        try:
+            SCAN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(SCAN_CACHE_PATH, 'wb') as f:
+                pickle.dump({
+                    "version": SCAN_CACHE_VERSION,
+                    "project_root": str(PROJECT_ROOT),
+                    "files": files
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"  Warning: Could not save scan cache: {e}")
+
+    def generate_id(self, item_type: str, item_data: dict) -> int:
+        """Generate unique ID for an item (unsigned 64-bit, as Qdrant integer IDs require)"""
         key = f"{item_type}:{item_data.get('file_path', '')}:{item_data.get('line_number', 0)}"
-        return hashlib.md5(key.encode()).hexdigest()
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
 
     def export_to_json(self, output_path: Path = None):
         """Export all indexed data to JSON"""
@@ -424,15 +600,19 @@ class NetworkEventIndexer:
                 "total_spawn_chains": len(self.spawn_chains)
             },
             "categories": self._get_category_summary(),
-            "event_declarations": [asdict(e) for e in self.events],
-            "event_triggers": [asdict(t) for t in self.triggers],
-            "rpc_definitions": [asdict(r) for r in self.rpcs],
-            "spawn_chains": [asdict(s) for s in self.spawn_chains],
+            "event_declarations": [_row(e) for e in self.events],
+            "event_triggers": [{**_row(t), "context": t.context} for t in self.triggers],
+            "rpc_definitions": [_row(r) for r in self.rpcs],
+            "spawn_chains": [_row(s) for s in self.spawn_chains],
             "duplicate_trigger_analysis": self._analyze_duplicate_triggers()
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
 
         print(f"\nExported to: {output_path}")
         return output_path
@@ -447,13 +627,10 @@ class NetworkEventIndexer:
 
     def _analyze_duplicate_triggers(self) -> Dict[str, Any]:
         """Analyze which events are triggered from multiple locations"""
-        trigger_sources = {}
+        trigger_sources = defaultdict(list)
 
         for trigger in self.triggers:
-            name = trigger.event_name
-            if name not in trigger_sources:
-                trigger_sources[name] = []
-            trigger_sources[name].append({
+            trigger_sources[trigger.event_name].append({
                 "file": trigger.file_path,
                 "line": trigger.line_number,
                 "method": trigger.method_name,
@@ -483,104 +660,72 @@ class NetworkEventIndexer:
         collections = self.client.get_collections().collections
         collection_names = [c.name for c in collections]
 
+        if EVENTS_COLLECTION in collection_names:
+            # Collections from older runs carry a dummy 4-D vector; the data is
+            # fully regenerated on every run, so rebuild them payload-only
+            if self.client.get_collection(EVENTS_COLLECTION).config.params.vectors:
+                print(f"Recreating payload-only collection: {EVENTS_COLLECTION}")
+                self.client.delete_collection(EVENTS_COLLECTION)
+                collection_names.remove(EVENTS_COLLECTION)
+
         if EVENTS_COLLECTION not in collection_names:
             print(f"Creating collection: {EVENTS_COLLECTION}")
-            # Using dummy vector since we're doing metadata-based filtering
+            # Payload-only: lookups are metadata filters, so no vectors or HNSW
             self.client.create_collection(
                 collection_name=EVENTS_COLLECTION,
-                vectors_config=VectorParams(size=4, distance=Distance.COSINE)
+                vectors_config={}
             )
+            for field_name in PAYLOAD_INDEX_FIELDS:
+                self.client.create_payload_index(
+                    collection_name=EVENTS_COLLECTION,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+
+        # Payload-only, so there is no HNSW index to defer while bulk-loading
+        self.client.upload_points(
+            collection_name=EVENTS_COLLECTION,
+            points=self._point_iter(),
+            batch_size=UPSERT_BATCH_SIZE,
+            parallel=max(1, (os.cpu_count() or 1) // 2),
+            wait=False
+        )
 
-        points = []
+        total_points = len(self.events) + len(self.triggers) + len(self.rpcs) + len(self.spawn_chains)
+        print(f"\nTotal points indexed: {total_points}")
 
-        # Index event declarations
+    def _point_iter(self) -> Iterator["PointStruct"]:
+        """Yield one Qdrant point per indexed record, without materializing them all"""
+        # Index event declarations (payloads start from the record's own fields,
+        # and the id is derived from the same dict)
         for event in self.events:
-            point_id = self.generate_id("event", asdict(event))
-            points.append(PointStruct(
-                id=point_id,
-                vector=[0.0, 0.0, 0.0, 0.0],  # Dummy vector
-                payload={
-                    "type": "event_declaration",
-                    "event_name": event.event_name,
-                    "event_type": event.event_type,
-                    "parameters": event.parameters,
-                    "file_path": event.file_path,
-                    "line_number": event.line_number,
-                    "class_name": event.class_name,
-                    "namespace": event.namespace,
-                    "category": event.category,
-                    "full_signature": event.full_signature,
-                    "keywords": f"event {event.category} {event.event_name} {event.class_name}"
-                }
-            ))
+            payload = _row(event)
+            payload["type"] = "event_declaration"
+            payload["keywords"] = f"event {event.category} {event.event_name} {event.class_name}"
+            yield PointStruct(id=self.generate_id("event", payload), vector={}, payload=payload)
 
-        # Index event triggers
+        # Index event triggers (context offsets are only meaningful locally)
         for trigger in self.triggers:
-            point_id = self.generate_id("trigger", asdict(trigger))
-            points.append(PointStruct(
-                id=point_id,
-                vector=[0.0, 0.0, 0.0, 0.0],
-                payload={
-                    "type": "event_trigger",
-                    "event_name": trigger.event_name,
-                    "trigger_type": trigger.trigger_type,
-                    "file_path": trigger.file_path,
-                    "line_number": trigger.line_number,
-                    "method_name": trigger.method_name,
-                    "class_name": trigger.class_name,
-                    "is_authority": trigger.is_authority,
-                    "keywords": f"trigger fire invoke {trigger.event_name} {trigger.class_name}"
-                }
-            ))
+            payload = _row(trigger)
+            del payload["context_start"], payload["context_end"]
+            payload["type"] = "event_trigger"
+            payload["keywords"] = f"trigger fire invoke {trigger.event_name} {trigger.class_name}"
+            yield PointStruct(id=self.generate_id("trigger", payload), vector={}, payload=payload)
 
         # Index RPC definitions
         for rpc in self.rpcs:
-            point_id = self.generate_id("rpc", asdict(rpc))
-            points.append(PointStruct(
-                id=point_id,
-                vector=[0.0, 0.0, 0.0, 0.0],
-                payload={
-                    "type": "rpc_definition",
-                    "method_name": rpc.method_name,
-                    "rpc_type": rpc.rpc_type,
-                    "file_path": rpc.file_path,
-                    "line_number": rpc.line_number,
-                    "class_name": rpc.class_name,
-                    "parameters": rpc.parameters,
-                    "namespace": rpc.namespace,
-                    "keywords": f"rpc {rpc.rpc_type} {rpc.method_name} {rpc.class_name} network"
-                }
-            ))
+            payload = _row(rpc)
+            del payload["attributes"]
+            payload["type"] = "rpc_definition"
+            payload["keywords"] = f"rpc {rpc.rpc_type} {rpc.method_name} {rpc.class_name} network"
+            yield PointStruct(id=self.generate_id("rpc", payload), vector={}, payload=payload)
 
         # Index spawn chains
         for chain in self.spawn_chains:
-            point_id = self.generate_id("spawn", asdict(chain))
-            points.append(PointStruct(
-                id=point_id,
-                vector=[0.0, 0.0, 0.0, 0.0],
-                payload={
-                    "type": "spawn_chain",
-                    "method_name": chain.method_name,
-                    "file_path": chain.file_path,
-                    "line_number": chain.line_number,
-                    "class_name": chain.class_name,
-                    "fires_events": chain.fires_events,
-                    "namespace": chain.namespace,
-                    "keywords": f"spawn despawn network lifecycle {chain.class_name} {' '.join(chain.fires_events)}"
-                }
-            ))
-
-        # Upload in batches
-        batch_size = 100
-        for i in range(0, len(points), batch_size):
-            batch = points[i:i + batch_size]
-            self.client.upsert(
-                collection_name=EVENTS_COLLECTION,
-                points=batch
-            )
-            print(f"  Indexed {min(i + batch_size, len(points))}/{len(points)} points")
-
-        print(f"\nTotal points indexed: {len(points)}")
+            payload = _row(chain)
+            payload["type"] = "spawn_chain"
+            payload["keywords"] = f"spawn despawn network lifecycle {chain.class_name} {' '.join(chain.fires_events)}"
+            yield PointStruct(id=self.generate_id("spawn", payload), vector={}, payload=payload)
 
     def print_duplicate_analysis(self):
         """Print analysis of duplicate triggers"""
@@ -606,6 +751,12 @@ class NetworkEventIndexer:
 
 def main():
     """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index network events and triggers into Qdrant")
+    parser.add_argument("--force", action="store_true", help="Ignore the scan cache and rescan every file")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Network Event & Trigger Indexer")
     print("=" * 60)
@@ -613,7 +764,7 @@ def main():
     indexer = NetworkEventIndexer()
 
     # Scan multiplayer code
-    indexer.scan_directory()
+    indexer.scan_directory(force=args.force)
 
     # Print duplicate analysis
     indexer.print_duplicate_analysis()
@@ -19,33 +19,79 @@ import sys
 import uuid
 import hashlib
 import json
+import mmap
+import pickle
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Generator, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Generator, Sequence, Tuple
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 import fnmatch
-
+import queue
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, SparseVector
+from qdrant_client.models import PointStruct, PointIdsList, SparseVector
+
+# RE2 (google-re2) guarantees linear-time matching for the C# regex fallback;
+# the patterns below stick to its subset (no lookaround or backreferences)
+try:
+    import re2 as _cs_re
+    RE2_AVAILABLE = True
+except ImportError:
+    _cs_re = re
+    RE2_AVAILABLE = False
+
+try:
+    import tree_sitter_c_sharp
+    from tree_sitter import Language, Parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Batches queued for the background upsert thread before producers block
+UPSERT_MAX_INFLIGHT = 4
+
+# Texts per embedding model call
+EMBED_BATCH = 64
+
+# Vectors kept for repeated embed texts (e.g. the same override in many classes)
+DENSE_CACHE_SIZE = 4096
+SPARSE_CACHE_SIZE = 65536
+
+# Per-file stamps, digests and point IDs for incremental reindexing
+INDEX_STATE_PATH = PROJECT_ROOT / "claudedocs" / "reports" / ".project_index_state.pkl"
+INDEX_STATE_VERSION = 1  # bump when point IDs or payloads change
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from scripts.unity_kb.qdrant_config import (
     QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT,
     COLLECTION_UNIFIED, DENSE_VECTOR_SIZE,
-    IndexingConfig, CodeType, DocType, AssemblyCategory,
+    IndexingConfig, CodeType, DocType,
     CodePayload, DocPayload,
 )
-from scripts.unity_kb.hybrid_search import BM25Tokenizer
+from scripts.unity_kb.hybrid_search import BM25Tokenizer, invalidate_search_cache
 
 
 # =============================================================================
 # CODE PARSER
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSymbol:
     """A parsed C# code symbol"""
     name: str
@@ -59,81 +105,209 @@ class ParsedSymbol:
     signature: str
     code_preview: str
     documentation: str
-    modifiers: List[str]
-    attributes: List[str]
-    base_classes: List[str]
-    interfaces: List[str]
+    modifiers: Tuple[str, ...]
+    attributes: Tuple[str, ...]
+    base_classes: Tuple[str, ...]
+    interfaces: Tuple[str, ...]
     assembly_name: str
     is_network: bool
 
 
+# tree-sitter node types emitted as type symbols
+_TS_TYPE_NODES = {
+    'class_declaration': CodeType.CLASS.value,
+    'struct_declaration': CodeType.STRUCT.value,
+    'interface_declaration': CodeType.INTERFACE.value,
+    'enum_declaration': CodeType.ENUM.value,
+    'record_declaration': CodeType.CLASS.value,
+}
+
+
+# Substrings marking network code / docs. With RE2 each set is one DFA
+# pass over the file; the stdlib alternation is slower than separate
+# find() calls, so without RE2 the markers are searched one by one
+NETWORK_CODE_MARKERS = (
+    b'NetworkBehaviour', b'NetworkObject', b'NetworkVariable',
+    b'ServerRpc', b'ClientRpc', b'Netcode', b'NetworkManager',
+    b'using Unity.Netcode',
+)
+NETWORK_DOC_TERMS = ('network', 'multiplayer', 'rpc', 'sync', 'netcode', 'server', 'client')
+
+if RE2_AVAILABLE:
+    _NETWORK_CODE_RE = _cs_re.compile(b'|'.join(map(re.escape, NETWORK_CODE_MARKERS)))
+    _NETWORK_DOC_RE = _cs_re.compile('(?i)' + '|'.join(map(re.escape, NETWORK_DOC_TERMS)))
+else:
+    _NETWORK_CODE_RE = _NETWORK_DOC_RE = None
+
+
+def _ts_text(node) -> str:
+    """Source text of a tree-sitter node"""
+    return node.text.decode('utf-8', errors='ignore') if node is not None else ""
+
+
+def _decode(data: bytes) -> str:
+    """Decode source bytes the way read_text(errors='ignore') did, newlines included"""
+    text = data.decode('utf-8', errors='ignore')
+    return text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in text else text
+
+
+def _group_numbers(pattern) -> Dict[str, int]:
+    """Group numbers by name (RE2 keys a bytes pattern's group names as bytes)"""
+    return {
+        name.decode() if isinstance(name, bytes) else name: number
+        for name, number in pattern.groupindex.items()
+    }
+
+
+class _ByteLines(Sequence):
+    """Lines of a source buffer, without their line endings, sliced on demand"""
+
+    __slots__ = ('_source', '_starts', 'doc_lines')
+
+    def __init__(self, source, newline_offsets: List[int]):
+        self._source = source
+        self._starts = [0]
+        self._starts.extend(pos + 1 for pos in newline_offsets)
+        # Sorted indices of the '///' lines; filled in by the parser
+        self.doc_lines: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._starts)))]
+        if index < 0:
+            index += len(self._starts)
+        start = self._starts[index]
+        end = self._starts[index + 1] - 1 if index + 1 < len(self._starts) else len(self._source)
+        if end > start and self._source[end - 1] == 0x0D:  # CRLF
+            end -= 1
+        return self._source[start:end]
+
+    @property
+    def source(self):
+        return self._source
+
+    def offset(self, index: int) -> int:
+        """Byte offset where line index starts"""
+        return self._starts[index]
+
+    def ends(self, start: int, stop: int) -> np.ndarray:
+        """Byte offsets where lines start..stop-1 end (before their newline)"""
+        ends = np.array(self._starts[start + 1:stop + 1], dtype=np.int64) - 1
+        if stop == len(self._starts):
+            ends = np.append(ends, len(self._source))
+        return ends
+
+
 class CSharpParser:
     """
-    Simple C# parser for extracting symbols.
+    C# parser for extracting symbols.
 
-    For production, consider using:
-    - tree-sitter with C# grammar
-    - Roslyn (via dotnet)
-    - OmniSharp
+    Uses tree-sitter with the C# grammar when tree_sitter and
+    tree_sitter_c_sharp are installed (linear-time parse, exact nesting and
+    line spans); otherwise falls back to the regex patterns below.
     """
 
     def __init__(self, config: IndexingConfig = None):
         self.config = config or IndexingConfig()
 
-        # Regex patterns for C# parsing
-        self.namespace_pattern = re.compile(r'namespace\s+([\w.]+)')
-        self.class_pattern = re.compile(
-            r'(?P<attrs>(?:\[[\w\s,()="\']+\]\s*)*)'
-            r'(?P<mods>(?:public|private|protected|internal|static|abstract|sealed|partial)\s+)*'
-            r'(?P<type>class|struct|interface|enum)\s+'
-            r'(?P<name>\w+)'
-            r'(?:\s*<[\w,\s]+>)?'  # Generics
-            r'(?:\s*:\s*(?P<bases>[\w\s,.<>]+))?'
+        # Directory -> assembly name from the nearest .asmdef at or above it
+        # (None when there is none); see _guess_assembly
+        self._asmdef_cache: Dict[Path, Optional[str]] = {}
+
+        self._ts_parser = None
+        if TREE_SITTER_AVAILABLE:
+            try:
+                self._ts_parser = Parser(Language(tree_sitter_c_sharp.language()))
+            except Exception as e:
+                print(f"[WARNING] Failed to load tree-sitter C# grammar, using regex parser: {e}")
+
+        # Regex patterns for C# parsing; they run on the raw file bytes
+        self.namespace_pattern = _cs_re.compile(rb'namespace\s+([\w.]+)')
+        self.class_pattern = _cs_re.compile(
+            rb'(?P<attrs>(?:\[[\w\s,()="\']+\]\s*)*)'
+            rb'(?P<mods>(?:public|private|protected|internal|static|abstract|sealed|partial)\s+)*'
+            rb'(?P<type>class|struct|interface|enum)\s+'
+            rb'(?P<name>\w+)'
+            rb'(?:\s*<[\w,\s]+>)?'  # Generics
+            rb'(?:\s*:\s*(?P<bases>[\w\s,.<>]+))?'
         )
-        self.method_pattern = re.compile(
-            r'(?P<attrs>(?:\[[\w\s,()="\']+\]\s*)*)'
-            r'(?P<mods>(?:public|private|protected|internal|static|virtual|override|abstract|async)\s+)*'
-            r'(?P<return>[\w<>\[\],\s?]+)\s+'
-            r'(?P<name>\w+)\s*'
-            r'(?:<[\w,\s]+>)?\s*'  # Generics
-            r'\((?P<params>[^)]*)\)'
+        self.method_pattern = _cs_re.compile(
+            rb'(?P<attrs>(?:\[[\w\s,()="\']+\]\s*)*)'
+            rb'(?P<mods>(?:public|private|protected|internal|static|virtual|override|abstract|async)\s+)*'
+            rb'(?P<return>[\w<>\[\],\s?]+)\s+'
+            rb'(?P<name>\w+)\s*'
+            rb'(?:<[\w,\s]+>)?\s*'  # Generics
+            rb'\((?P<params>[^)]*)\)'
         )
-        self.property_pattern = re.compile(
-            r'(?P<mods>(?:public|private|protected|internal|static|virtual|override)\s+)*'
-            r'(?P<type>[\w<>\[\],\s?]+)\s+'
-            r'(?P<name>\w+)\s*'
-            r'(?:\{|=>)'
+        self.property_pattern = _cs_re.compile(
+            rb'(?P<mods>(?:public|private|protected|internal|static|virtual|override)\s+)*'
+            rb'(?P<type>[\w<>\[\],\s?]+)\s+'
+            rb'(?P<name>\w+)\s*'
+            rb'(?:\{|=>)'
         )
-        self.xml_doc_pattern = re.compile(r'///\s*(.+)')
+        self.xml_doc_pattern = _cs_re.compile(rb'///\s*(.+)')
+        self.doc_line_pattern = _cs_re.compile(rb'(?m)^[ \t\r\x0b\x0c]*///')
+        self._class_groups = _group_numbers(self.class_pattern)
+        self._method_groups = _group_numbers(self.method_pattern)
 
     def parse_file(self, file_path: Path) -> List[ParsedSymbol]:
         """Parse a C# file and extract all symbols"""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         except Exception as e:
             print(f"[ERROR] Failed to read {file_path}: {e}")
             return []
 
+        # The file is mapped rather than decoded; regexes and tree-sitter run
+        # on the bytes and only the extracted fields become str
+        with source:
+            return self._parse_source(source, file_path)
+
+    def _parse_source(self, source: mmap.mmap, file_path: Path) -> List[ParsedSymbol]:
+        """Extract all symbols from a mapped C# file"""
         symbols = []
-        lines = content.split('\n')
 
-        # Extract namespace
-        namespace = ""
-        ns_match = self.namespace_pattern.search(content)
-        if ns_match:
-            namespace = ns_match.group(1)
+        # Newline offsets: lines are sliced from the buffer on demand, and a
+        # match's line number is a bisect instead of re-counting the prefix.
+        # One vectorized compare over the buffer finds them all
+        newline_offsets = np.flatnonzero(np.frombuffer(source, dtype=np.uint8) == 0x0A).tolist()
+        lines = _ByteLines(source, newline_offsets)
+        lines.doc_lines = [
+            bisect_left(newline_offsets, match.start())
+            for match in self.doc_line_pattern.finditer(source)
+        ]
 
         # Determine assembly from path
         assembly_name = self._guess_assembly(file_path)
 
         # Check if file is network-related
-        is_network_file = self._is_network_code(content)
+        is_network_file = self._is_network_code(source)
+
+        if self._ts_parser is not None:
+            tree = self._ts_parser.parse(source)
+            self._walk_tree(
+                tree.root_node, "", "", lines, file_path,
+                assembly_name, is_network_file, symbols
+            )
+            return symbols
+
+        # Extract namespace (the tree-sitter walk reads it from the tree)
+        namespace = ""
+        ns_match = self.namespace_pattern.search(source)
+        if ns_match:
+            namespace = _decode(ns_match.group(1))
 
         # Parse classes/structs/interfaces/enums
         current_class = ""
-        for match in self.class_pattern.finditer(content):
+        for match in self.class_pattern.finditer(source):
             symbol = self._create_type_symbol(
-                match, content, lines, file_path, namespace,
+                match, newline_offsets, lines, file_path, namespace,
                 assembly_name, is_network_file
             )
             if symbol:
@@ -141,10 +315,10 @@ class CSharpParser:
                 current_class = symbol.name
 
         # Parse methods (simplified - doesn't handle nesting properly)
-        for match in self.method_pattern.finditer(content):
+        for match in self.method_pattern.finditer(source):
             # Skip if it's a constructor-like pattern inside a class
             symbol = self._create_method_symbol(
-                match, content, lines, file_path, namespace,
+                match, newline_offsets, lines, file_path, namespace,
                 current_class, assembly_name, is_network_file
             )
             if symbol:
@@ -153,20 +327,21 @@ class CSharpParser:
         return symbols
 
     def _create_type_symbol(
-        self, match, content: str, lines: List[str],
+        self, match, newline_offsets: List[int], lines: Sequence[bytes],
         file_path: Path, namespace: str, assembly_name: str,
         is_network: bool
     ) -> Optional[ParsedSymbol]:
         """Create a symbol for a class/struct/interface/enum"""
-        name = match.group('name')
-        type_kind = match.group('type')
-        mods = match.group('mods') or ""
-        attrs = match.group('attrs') or ""
-        bases = match.group('bases') or ""
+        groups = self._class_groups
+        name = _decode(match.group(groups['name']))
+        type_kind = _decode(match.group(groups['type']))
+        mods = _decode(match.group(groups['mods']) or b"")
+        attrs = _decode(match.group(groups['attrs']) or b"")
+        bases = _decode(match.group(groups['bases']) or b"")
 
         # Get line number
         start_pos = match.start()
-        start_line = content[:start_pos].count('\n') + 1
+        start_line = bisect_left(newline_offsets, start_pos) + 1
 
         # Extract documentation
         doc = self._extract_xml_doc(lines, start_line - 1)
@@ -184,7 +359,7 @@ class CSharpParser:
 
         # Code preview
         end_line = self._find_block_end(lines, start_line - 1)
-        code_preview = '\n'.join(lines[start_line-1:min(start_line+20, end_line)])
+        code_preview = _decode(b'\n'.join(lines[start_line-1:min(start_line+20, end_line)]))
 
         # Map type to CodeType
         code_type_map = {
@@ -206,31 +381,32 @@ class CSharpParser:
             signature=f"{mods}{type_kind} {name}",
             code_preview=code_preview[:1000],
             documentation=doc,
-            modifiers=[m.strip() for m in mods.split() if m.strip()],
+            modifiers=tuple(mods.split()),
             attributes=self._parse_attributes(attrs),
-            base_classes=base_classes,
-            interfaces=interfaces,
+            base_classes=tuple(base_classes),
+            interfaces=tuple(interfaces),
             assembly_name=assembly_name,
             is_network=is_network or self._is_network_symbol(name, base_classes, interfaces),
         )
 
     def _create_method_symbol(
-        self, match, content: str, lines: List[str],
+        self, match, newline_offsets: List[int], lines: Sequence[bytes],
         file_path: Path, namespace: str, class_name: str,
         assembly_name: str, is_network: bool
     ) -> Optional[ParsedSymbol]:
         """Create a symbol for a method"""
-        name = match.group('name')
-        mods = match.group('mods') or ""
-        return_type = match.group('return')
-        params = match.group('params')
+        groups = self._method_groups
+        name = _decode(match.group(groups['name']))
+        mods = _decode(match.group(groups['mods']) or b"")
+        return_type = _decode(match.group(groups['return']))
+        params = _decode(match.group(groups['params']))
 
         # Skip if it looks like a variable declaration
-        if not params and '(' not in match.group(0):
+        if not params and b'(' not in match.group(0):
             return None
 
         start_pos = match.start()
-        start_line = content[:start_pos].count('\n') + 1
+        start_line = bisect_left(newline_offsets, start_pos) + 1
 
         doc = self._extract_xml_doc(lines, start_line - 1)
         signature = f"{return_type} {name}({params})"
@@ -256,64 +432,201 @@ class CSharpParser:
             signature=signature,
             code_preview="",
             documentation=doc,
-            modifiers=[m.strip() for m in mods.split() if m.strip()],
-            attributes=[],
-            base_classes=[],
-            interfaces=[],
+            modifiers=tuple(mods.split()),
+            attributes=(),
+            base_classes=(),
+            interfaces=(),
+            assembly_name=assembly_name,
+            is_network=is_network,
+        )
+
+    def _walk_tree(
+        self, node, namespace: str, class_name: str, lines: Sequence[bytes],
+        file_path: Path, assembly_name: str, is_network: bool,
+        symbols: List[ParsedSymbol]
+    ):
+        """Collect type and method symbols from a tree-sitter declaration scope"""
+        for child in node.named_children:
+            kind = child.type
+            if kind == 'file_scoped_namespace_declaration':
+                # Applies to the declarations that follow it
+                namespace = _ts_text(child.child_by_field_name('name'))
+            elif kind == 'namespace_declaration':
+                name = _ts_text(child.child_by_field_name('name'))
+                body = child.child_by_field_name('body')
+                if body is not None:
+                    self._walk_tree(
+                        body, f"{namespace}.{name}" if namespace else name,
+                        class_name, lines, file_path, assembly_name, is_network, symbols
+                    )
+            elif kind in _TS_TYPE_NODES:
+                symbol = self._tree_type_symbol(
+                    child, namespace, class_name, lines, file_path, assembly_name, is_network
+                )
+                symbols.append(symbol)
+                body = child.child_by_field_name('body')
+                if body is not None:
+                    self._walk_tree(
+                        body, namespace, symbol.name, lines, file_path,
+                        assembly_name, is_network, symbols
+                    )
+            elif kind == 'method_declaration':
+                symbols.append(self._tree_method_symbol(
+                    child, namespace, class_name, lines, file_path, assembly_name, is_network
+                ))
+            elif kind in ('declaration_list', 'ERROR'):
+                self._walk_tree(
+                    child, namespace, class_name, lines, file_path,
+                    assembly_name, is_network, symbols
+                )
+
+    def _tree_type_symbol(
+        self, node, namespace: str, class_name: str, lines: Sequence[bytes],
+        file_path: Path, assembly_name: str, is_network: bool
+    ) -> ParsedSymbol:
+        """Create a symbol for a class/struct/interface/enum tree-sitter node"""
+        name = _ts_text(node.child_by_field_name('name'))
+        type_kind = node.type.split('_')[0]
+        modifiers = tuple(_ts_text(c) for c in node.named_children if c.type == 'modifier')
+
+        base_classes = []
+        interfaces = []
+        for base_list in (c for c in node.named_children if c.type == 'base_list'):
+            for base in base_list.named_children:
+                base = _ts_text(base)
+                if len(base) > 1 and base.startswith('I') and base[1].isupper():
+                    interfaces.append(base)
+                else:
+                    base_classes.append(base)
+
+        start_line = node.start_point[0] + 1
+        end_line = node.end_point[0] + 1
+        code_preview = _decode(b'\n'.join(lines[start_line-1:min(start_line+20, end_line)]))
+        prefix = f"{namespace}." if namespace else ""
+
+        return ParsedSymbol(
+            name=name,
+            name_path=f"{prefix}{class_name}.{name}" if class_name else f"{prefix}{name}",
+            code_type=_TS_TYPE_NODES[node.type],
+            namespace=namespace,
+            class_name=class_name,
+            file_path=str(file_path.relative_to(PROJECT_ROOT)),
+            start_line=start_line,
+            end_line=end_line,
+            signature=f"{''.join(m + ' ' for m in modifiers)}{type_kind} {name}",
+            code_preview=code_preview[:1000],
+            documentation=self._extract_xml_doc(lines, start_line - 1),
+            modifiers=modifiers,
+            attributes=self._tree_attributes(node),
+            base_classes=tuple(base_classes),
+            interfaces=tuple(interfaces),
+            assembly_name=assembly_name,
+            is_network=is_network or self._is_network_symbol(name, base_classes, interfaces),
+        )
+
+    def _tree_method_symbol(
+        self, node, namespace: str, class_name: str, lines: Sequence[bytes],
+        file_path: Path, assembly_name: str, is_network: bool
+    ) -> ParsedSymbol:
+        """Create a symbol for a method tree-sitter node"""
+        name = _ts_text(node.child_by_field_name('name'))
+        return_type = _ts_text(node.child_by_field_name('returns'))
+        params = _ts_text(node.child_by_field_name('parameters'))[1:-1]
+        start_line = node.start_point[0] + 1
+
+        code_type = CodeType.METHOD.value
+        if name.endswith("ServerRpc"):
+            code_type = "serverrpc"
+            is_network = True
+        elif name.endswith("ClientRpc"):
+            code_type = "clientrpc"
+            is_network = True
+
+        return ParsedSymbol(
+            name=name,
+            name_path=f"{namespace}.{class_name}.{name}" if class_name else f"{namespace}.{name}",
+            code_type=code_type,
+            namespace=namespace,
+            class_name=class_name,
+            file_path=str(file_path.relative_to(PROJECT_ROOT)),
+            start_line=start_line,
+            end_line=node.end_point[0] + 1,
+            signature=f"{return_type} {name}({params})",
+            code_preview="",
+            documentation=self._extract_xml_doc(lines, start_line - 1),
+            modifiers=tuple(_ts_text(c) for c in node.named_children if c.type == 'modifier'),
+            attributes=self._tree_attributes(node),
+            base_classes=(),
+            interfaces=(),
             assembly_name=assembly_name,
             is_network=is_network,
         )
 
-    def _extract_xml_doc(self, lines: List[str], line_num: int) -> str:
-        """Extract XML documentation comments above a line"""
+    def _tree_attributes(self, node) -> Tuple[str, ...]:
+        """Attribute names applied to a tree-sitter declaration node"""
+        return tuple(
+            _ts_text(attr.child_by_field_name('name'))
+            for attr_list in node.named_children if attr_list.type == 'attribute_list'
+            for attr in attr_list.named_children if attr.type == 'attribute'
+        )
+
+    def _extract_xml_doc(self, lines: _ByteLines, line_num: int) -> str:
+        """
+        Extract XML documentation comments above a line: the '///' lines in
+        the 19 lines above it, skipping blank and attribute lines and
+        stopping at any other line
+        """
+        # Most symbols have no doc comment; the file's '///' line indices
+        # answer that with a bisect instead of walking the window
+        first = bisect_left(lines.doc_lines, max(line_num - 19, 0))
+        if first == bisect_left(lines.doc_lines, line_num):
+            return ""
+
         doc_lines = []
-        i = line_num - 1
-        while i >= 0 and i > line_num - 20:
+        for i in range(line_num - 1, lines.doc_lines[first] - 1, -1):
             line = lines[i].strip()
-            if line.startswith('///'):
-                doc_lines.insert(0, self.xml_doc_pattern.sub(r'\1', line))
-            elif not line or line.startswith('['):
-                i -= 1
-                continue
-            else:
+            if line.startswith(b'///'):
+                doc_lines.append(_decode(self.xml_doc_pattern.sub(rb'\1', line)))
+            elif line and not line.startswith(b'['):
                 break
-            i -= 1
+        doc_lines.reverse()
         return '\n'.join(doc_lines)
 
-    def _find_block_end(self, lines: List[str], start: int) -> int:
-        """Find the end of a code block"""
-        brace_count = 0
-        started = False
-        for i in range(start, min(start + 500, len(lines))):
-            line = lines[i]
-            brace_count += line.count('{') - line.count('}')
-            if '{' in line:
-                started = True
-            if started and brace_count <= 0:
-                return i + 1
+    def _find_block_end(self, lines: _ByteLines, start: int) -> int:
+        """
+        Find the end of a code block: the first line, from the one holding
+        the first '{' on, after which the running brace count is <= 0.
+        Braces are counted in one numpy pass over the next 500 lines.
+        """
+        stop = min(start + 500, len(lines))
+        if start < stop:
+            begin = lines.offset(start)
+            ends = lines.ends(start, stop) - begin
+            region = np.frombuffer(lines.source, dtype=np.uint8, count=int(ends[-1]), offset=begin)
+            opens = region == 0x7B  # '{'
+            if opens.any():
+                # depth[n] = brace count after the first n bytes
+                depth = np.zeros(len(region) + 1, dtype=np.int64)
+                np.cumsum(opens.astype(np.int64) - (region == 0x7D), out=depth[1:])
+                first = int(np.searchsorted(ends, np.argmax(opens), side='right'))
+                closed = np.flatnonzero(depth[ends[first:]] <= 0)
+                if closed.size:
+                    return start + first + int(closed[0]) + 1
         return min(start + 100, len(lines))
 
-    def _parse_attributes(self, attrs: str) -> List[str]:
+    def _parse_attributes(self, attrs: str) -> Tuple[str, ...]:
         """Parse attribute annotations"""
         if not attrs:
-            return []
-        return re.findall(r'\[(\w+)', attrs)
+            return ()
+        return tuple(re.findall(r'\[(\w+)', attrs))
 
     def _guess_assembly(self, file_path: Path) -> str:
         """Guess assembly name from file path"""
         path_str = str(file_path)
 
-        # Look for .asmdef in parent directories
-        for parent in file_path.parents:
-            asmdef_files = list(parent.glob("*.asmdef"))
-            if asmdef_files:
-                # Parse asmdef to get assembly name
-                try:
-                    asmdef_content = asmdef_files[0].read_text()
-                    asmdef_data = json.loads(asmdef_content)
-                    return asmdef_data.get("name", asmdef_files[0].stem)
-                except:
-                    return asmdef_files[0].stem
+        assembly = self._find_asmdef_assembly(file_path.parent)
+        if assembly is not None:
+            return assembly
 
         # Fallback: guess from path
         if "GameCreator_Multiplayer" in path_str:
@@ -327,18 +640,49 @@ class CSharpParser:
 
         return "Unknown"
 
-    def _is_network_code(self, content: str) -> bool:
+    def _find_asmdef_assembly(self, directory: Path) -> Optional[str]:
+        """Assembly name from the nearest .asmdef in directory or its parents"""
+        visited = []
+        assembly = None
+        for parent in (directory, *directory.parents):
+            if parent in self._asmdef_cache:
+                assembly = self._asmdef_cache[parent]
+                break
+            visited.append(parent)
+
+            asmdef_path = None
+            try:
+                with os.scandir(parent) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.asmdef'):
+                            asmdef_path = Path(entry.path)
+                            break
+            except OSError:
+                pass
+            if asmdef_path is not None:
+                # Parse asmdef to get assembly name
+                try:
+                    with open(asmdef_path, 'rb') as f:
+                        assembly = json.loads(f.read()).get("name", asmdef_path.stem)
+                except Exception:
+                    assembly = asmdef_path.stem
+                break
+
+        # Every directory walked through resolves to the same answer
+        for parent in visited:
+            self._asmdef_cache[parent] = assembly
+        return assembly
+
+    def _is_network_code(self, content: mmap.mmap) -> bool:
         """Check if content contains network-related code"""
-        network_patterns = [
-            'NetworkBehaviour', 'NetworkObject', 'NetworkVariable',
-            'ServerRpc', 'ClientRpc', 'Netcode', 'NetworkManager',
-            'using Unity.Netcode'
-        ]
-        return any(p in content for p in network_patterns)
+        if _NETWORK_CODE_RE is not None:
+            return _NETWORK_CODE_RE.search(content) is not None
+        # find(), not `in`: on an mmap `in` only tests for single bytes
+        return any(content.find(p) != -1 for p in NETWORK_CODE_MARKERS)
 
     def _is_network_symbol(self, name: str, bases: List[str], interfaces: List[str]) -> bool:
         """Check if a symbol is network-related"""
-        all_types = [name] + bases + interfaces
+        all_types = (name, *bases, *interfaces)
         network_keywords = ['Network', 'Rpc', 'Sync', 'Replicate', 'Multiplayer']
         return any(k in t for t in all_types for k in network_keywords)
 
@@ -347,7 +691,7 @@ class CSharpParser:
 # DOCUMENTATION PARSER
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDoc:
     """A parsed documentation file"""
     name: str
@@ -356,8 +700,8 @@ class ParsedDoc:
     content: str
     summary: str
     file_path: str
-    hierarchy: List[str]
-    keywords: List[str]
+    hierarchy: Tuple[str, ...]
+    keywords: Tuple[str, ...]
     is_network: bool
 
 
@@ -466,7 +810,7 @@ class DocParser:
 
         return ' '.join(summary_lines)[:500]
 
-    def _extract_keywords(self, content: str, file_path: Path) -> List[str]:
+    def _extract_keywords(self, content: str, file_path: Path) -> Tuple[str, ...]:
         """Extract keywords from content"""
         keywords = set()
 
@@ -485,24 +829,191 @@ class DocParser:
         # Filter
         keywords = {k for k in keywords if len(k) > 2 and k.isalnum()}
 
-        return list(keywords)[:50]
+        return tuple(keywords)[:50]
 
-    def _build_hierarchy(self, file_path: Path) -> List[str]:
+    def _build_hierarchy(self, file_path: Path) -> Tuple[str, ...]:
         """Build breadcrumb hierarchy from path"""
         rel_path = file_path.relative_to(PROJECT_ROOT)
-        return [p for p in rel_path.parts[:-1] if p not in ['.', '..']]
+        return tuple(p for p in rel_path.parts[:-1] if p not in ('.', '..'))
 
     def _is_network_doc(self, content: str) -> bool:
         """Check if doc is network-related"""
-        network_terms = ['network', 'multiplayer', 'rpc', 'sync', 'netcode', 'server', 'client']
+        if _NETWORK_DOC_RE is not None:
+            return _NETWORK_DOC_RE.search(content) is not None
         content_lower = content.lower()
-        return any(t in content_lower for t in network_terms)
+        return any(t in content_lower for t in NETWORK_DOC_TERMS)
+
+
+# =============================================================================
+# FILE DISCOVERY & PARALLEL PARSING
+# =============================================================================
+
+def _file_digest(file_path: Path) -> str:
+    """BLAKE2b digest of a file's bytes"""
+    return hashlib.blake2b(file_path.read_bytes()).hexdigest()
+
+
+def _compile_globs(patterns: List[str]) -> Optional[re.Pattern]:
+    """Compile fnmatch-style globs into one regex, matching like fnmatch.fnmatch"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+# Parsers are built lazily in each ProcessPoolExecutor worker, from the
+# config handed over by _init_worker
+_worker_config: Optional[IndexingConfig] = None
+_worker_parsers: Dict[str, Any] = {}
+
+
+def _init_worker(config: IndexingConfig):
+    global _worker_config
+    _worker_config = config
+
+
+def _parse_one(file_path: Path) -> List[ParsedSymbol]:
+    """Parse one C# file with this process's CSharpParser"""
+    parser = _worker_parsers.get('code')
+    if parser is None:
+        parser = _worker_parsers['code'] = CSharpParser(_worker_config)
+    return parser.parse_file(file_path)
+
+
+def _parse_doc_one(file_path: Path) -> List[ParsedDoc]:
+    """Parse one documentation file with this process's DocParser"""
+    parser = _worker_parsers.get('docs')
+    if parser is None:
+        parser = _worker_parsers['docs'] = DocParser(_worker_config)
+    return parser.parse_file(file_path)
+
+
+# =============================================================================
+# DENSE EMBEDDING
+# =============================================================================
+
+@lru_cache(maxsize=4)
+def _load_onnx_model(model_file: Path, device_id: int):
+    """(session, tokenizer) for an .onnx file, loaded once per process"""
+    providers = ['CPUExecutionProvider']
+    if 'CUDAExecutionProvider' in ort.get_available_providers():
+        providers.insert(0, ('CUDAExecutionProvider', {'device_id': device_id}))
+
+    session = ort.InferenceSession(str(model_file), providers=providers)
+    tokenizer = AutoTokenizer.from_pretrained(str(model_file.parent))
+    return session, tokenizer
+
+
+class OnnxEmbedder:
+    """
+    Batched sentence embeddings from an ONNX feature-extraction model, for
+    use as ProjectIndexer's batch_embedding_fn.
+
+    Runs on the GPU via CUDAExecutionProvider when onnxruntime-gpu finds one,
+    otherwise on the CPU. Export (and optionally int8-quantize) a model with:
+
+        optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \\
+            --task feature-extraction <dir>
+        optimum-cli onnxruntime quantize --onnx_model <dir> --avx512 -o <dir>
+
+    model_path is an .onnx file or an export directory, where
+    model_quantized.onnx is preferred over model.onnx. The tokenizer is
+    loaded from the model's directory. Embedders for the same model file and
+    device share one session and tokenizer.
+
+    Texts are tokenized bucket_size at a time, sorted by token length and
+    run batch_size at a time, so each batch pads to a similar length instead
+    of to the longest text in the call.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        device_id: int = 0,
+        max_length: int = 256,
+        batch_size: int = 64,
+        bucket_size: int = 10000
+    ):
+        model_path = Path(model_path)
+        if model_path.is_dir():
+            quantized = model_path / "model_quantized.onnx"
+            model_path = quantized if quantized.exists() else model_path / "model.onnx"
+
+        self.session, self.tokenizer = _load_onnx_model(model_path.resolve(), device_id)
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.bucket_size = bucket_size
+        self.device = self.session.get_providers()[0]
+        self._input_names = [i.name for i in self.session.get_inputs()]
+        self._output_name = self.session.get_outputs()[0].name
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        """Normalized mean-pooled embeddings, one float32 row per text"""
+        vectors = None
+        for bucket_start in range(0, len(texts), self.bucket_size):
+            encoded = self.tokenizer(
+                texts[bucket_start:bucket_start + self.bucket_size],
+                truncation=True, max_length=self.max_length
+            )
+            lengths = np.array([len(ids) for ids in encoded['input_ids']])
+            order = np.argsort(lengths, kind='stable')
+
+            for start in range(0, len(order), self.batch_size):
+                rows = order[start:start + self.batch_size]
+                batch = self._embed_rows(encoded, rows, lengths[rows])
+                if vectors is None:
+                    vectors = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+                vectors[bucket_start + rows] = batch  # back to input order
+
+        return vectors if vectors is not None else np.empty((0, 0), dtype=np.float32)
+
+    def _embed_rows(self, encoded, rows: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Embed the given rows of an unpadded encoding, padded to their longest"""
+        mask = np.arange(lengths.max()) < lengths[:, None]
+
+        # Bound inputs are copied to the device once per batch and the
+        # output is fetched straight into host memory
+        binding = self.session.io_binding()
+        for name in self._input_names:
+            if name == 'attention_mask':
+                value = mask.astype(np.int64)
+            else:
+                pad = self.tokenizer.pad_token_id if name == 'input_ids' else 0
+                value = np.full(mask.shape, pad or 0, dtype=np.int64)
+                if name in encoded:
+                    value[mask] = np.concatenate([encoded[name][row] for row in rows])
+            binding.bind_cpu_input(name, value)
+        binding.bind_output(self._output_name)
+        self.session.run_with_iobinding(binding)
+        hidden = binding.copy_outputs_to_cpu()[0]
+
+        # Mean over real tokens only, then L2-normalize (sentence-transformers pooling)
+        mask = mask[..., None].astype(hidden.dtype)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.maximum(norms, 1e-12)).astype(np.float32)
 
 
 # =============================================================================
 # INDEXER
 # =============================================================================
 
+# camelCase splitting for code keywords; names repeat a lot across symbols
+_NAME_PART_RE = re.compile(r'[A-Z][a-z]+|[a-z]+|[A-Z]+(?=[A-Z]|$)')
+_BASE_PART_RE = re.compile(r'[A-Z][a-z]+|[a-z]+')
+
+
+@lru_cache(maxsize=65536)
+def _name_keywords(name: str) -> Tuple[str, ...]:
+    """Lowercased camelCase parts of a symbol name (acronyms kept whole)"""
+    return tuple(p.lower() for p in _NAME_PART_RE.findall(name))
+
+
+@lru_cache(maxsize=16384)
+def _base_keywords(base: str) -> Tuple[str, ...]:
+    """Lowercased camelCase parts of a base class or interface name"""
+    return tuple(p.lower() for p in _BASE_PART_RE.findall(base))
+
+
 class ProjectIndexer:
     """Index project code and documentation into Qdrant"""
 
@@ -511,7 +1022,10 @@ class ProjectIndexer:
         host: str = QDRANT_HOST,
         port: int = QDRANT_PORT,
         collection_name: str = COLLECTION_UNIFIED,
-        embedding_fn=None
+        embedding_fn=None,
+        batch_embedding_fn=None,  # Optional: list of texts -> list of embeddings
+        workers: Optional[int] = None,
+        normalize_embeddings: bool = True  # Must match UnifiedCollectionConfig
     ):
         self.client = QdrantClient(
             host=host,
@@ -522,10 +1036,26 @@ class ProjectIndexer:
         )
         self.collection_name = collection_name
         self.embedding_fn = embedding_fn
+        self.batch_embedding_fn = batch_embedding_fn
+        self.normalize_embeddings = normalize_embeddings
+        self.workers = workers
         self.config = IndexingConfig()
         self.code_parser = CSharpParser(self.config)
         self.doc_parser = DocParser(self.config)
         self.tokenizer = BM25Tokenizer()
+        self._assembly_category = self.config.assembly_categorizer()
+
+        # Vectors are pure functions of the embed text; identical texts reuse them
+        self._sparse_cache: OrderedDict = OrderedDict()
+        self._dense_cache: OrderedDict = OrderedDict()
+
+        # One indexed_at timestamp per indexing pass, shared by all its points
+        self._indexed_at = datetime.now(timezone.utc).isoformat()
+
+        # Background upsert thread, started on the first batch
+        self._upsert_queue: Optional[queue.Queue] = None
+        self._upsert_thread: Optional[threading.Thread] = None
+        self._failed_ids = set()  # Point IDs from batches the upsert thread could not send
 
         # Stats
         self.stats = {
@@ -533,6 +1063,9 @@ class ProjectIndexer:
             'code_symbols': 0,
             'doc_files': 0,
             'doc_entries': 0,
+            'unchanged_files': 0,
+            'deleted_points': 0,
+            'embedding_cache_hits': 0,
             'errors': 0,
         }
 
@@ -544,99 +1077,287 @@ class ProjectIndexer:
 
         # Index code
         print("\n[1/2] Indexing Code...")
-        self.index_code()
+        self.index_code(incremental)
 
         # Index documentation
         print("\n[2/2] Indexing Documentation...")
-        self.index_docs()
+        self.index_docs(incremental)
 
         # Print stats
         self._print_stats()
 
-    def index_code(self):
+    def index_code(self, incremental: bool = False):
         """Index all C# code files"""
-        points = []
-
-        for code_path in self.config.code_paths:
-            full_path = PROJECT_ROOT / code_path
-            if not full_path.exists():
-                continue
-
-            for pattern in self.config.code_patterns:
-                for file_path in full_path.rglob(pattern):
-                    if self._should_exclude(file_path):
-                        continue
-
-                    self.stats['code_files'] += 1
-                    symbols = self.code_parser.parse_file(file_path)
-
-                    for symbol in symbols:
-                        point = self._symbol_to_point(symbol)
-                        if point:
-                            points.append(point)
-                            self.stats['code_symbols'] += 1
-
-                    # Batch upsert
-                    if len(points) >= self.config.index_batch_size:
-                        self._upsert_points(points)
-                        points = []
-
-        # Final batch
-        if points:
-            self._upsert_points(points)
+        files = self._collect_files(self.config.code_paths, self.config.code_patterns)
+        parsed = self._index_files(
+            'code', files, incremental,
+            _parse_one, self.code_parser.parse_file, self._symbols_to_points, self._symbol_id
+        )
+        self.stats['code_files'] += parsed
 
         print(f"   Indexed {self.stats['code_symbols']} symbols from {self.stats['code_files']} files")
 
-    def index_docs(self):
+    def index_docs(self, incremental: bool = False):
         """Index all documentation files"""
-        points = []
-
-        for doc_path in self.config.doc_paths:
-            full_path = PROJECT_ROOT / doc_path
-            if not full_path.exists():
-                continue
+        files = self._collect_files(self.config.doc_paths, self.config.doc_patterns)
+        parsed = self._index_files(
+            'doc', files, incremental,
+            _parse_doc_one, self.doc_parser.parse_file, self._docs_to_points, self._doc_id
+        )
+        self.stats['doc_files'] += parsed
 
-            for pattern in self.config.doc_patterns:
-                for file_path in full_path.rglob(pattern):
-                    if self._should_exclude(file_path):
-                        continue
+        print(f"   Indexed {self.stats['doc_entries']} documents from {self.stats['doc_files']} files")
 
-                    self.stats['doc_files'] += 1
-                    docs = self.doc_parser.parse_file(file_path)
+    def _index_files(
+        self,
+        kind: str,
+        files: List[Path],
+        incremental: bool,
+        worker_fn: Callable[[Path], list],
+        local_fn: Callable[[Path], list],
+        to_points: Callable[[list], List[PointStruct]],
+        item_id: Callable[[Any], str]
+    ) -> int:
+        """
+        Parse, embed and upsert files; returns the number of files parsed.
+
+        The index state records each file's (mtime_ns, size) stamp, content
+        digest and point IDs. When incremental, files whose stamp or digest
+        is unchanged are skipped. Points a file no longer produces, and
+        points of files that are gone, are deleted either way.
+        """
+        self._indexed_at = datetime.now(timezone.utc).isoformat()
+        state = self._load_index_state()
+        new_state = {path: entry for path, entry in state.items() if entry['kind'] != kind}
+
+        changed = []  # (file_path, stamp, digest)
+        for file_path in files:
+            key = str(file_path)
+            entry = state.get(key)
+            try:
+                stat = file_path.stat()
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if incremental and entry and entry['kind'] == kind and entry['stamp'] == stamp:
+                    new_state[key] = entry
+                    continue
+                digest = _file_digest(file_path)
+            except OSError:
+                changed.append((file_path, None, None))  # parse_file reports the error
+                continue
+            if incremental and entry and entry['kind'] == kind and entry['digest'] == digest:
+                new_state[key] = dict(entry, stamp=stamp)
+                continue
+            changed.append((file_path, stamp, digest))
 
-                    for doc in docs:
-                        point = self._doc_to_point(doc)
-                        if point:
-                            points.append(point)
-                            self.stats['doc_entries'] += 1
+        self.stats['unchanged_files'] += len(files) - len(changed)
 
-                    if len(points) >= self.config.index_batch_size:
-                        self._upsert_points(points)
-                        points = []
+        points = []
+        pending = []  # Items waiting for the next embedding batch
+        file_ids = {}
+
+        # Parsing runs in worker processes; embedding and upserts stay here
+        results = self._parse_files([c[0] for c in changed], worker_fn, local_fn)
+        for (file_path, stamp, digest), items in zip(changed, results):
+            file_ids[str(file_path)] = (stamp, digest, [item_id(item) for item in items])
+            pending.extend(items)
+            if len(pending) >= EMBED_BATCH:
+                points.extend(to_points(pending))
+                pending = []
+
+            # Batch upsert
+            if len(points) >= self.config.index_batch_size:
+                self._upsert_points(points)
+                points = []
 
+        # Final batch
+        if pending:
+            points.extend(to_points(pending))
         if points:
             self._upsert_points(points)
+        self._flush_upserts()
+
+        # Remember files whose points all reached Qdrant
+        for key, (stamp, digest, ids) in file_ids.items():
+            if stamp is not None and self._failed_ids.isdisjoint(ids):
+                new_state[key] = {'kind': kind, 'stamp': stamp, 'digest': digest, 'ids': ids}
+
+        # Drop points of removed files and symbols
+        current = {str(file_path) for file_path in files}
+        stale_ids = set()
+        for key, entry in state.items():
+            if entry['kind'] != kind:
+                continue
+            if key not in current:
+                stale_ids.update(entry['ids'])
+            elif key in file_ids:
+                stale_ids.update(set(entry['ids']) - set(file_ids[key][2]))
+        if stale_ids:
+            self._delete_points(sorted(stale_ids))
+
+        # Searches cached before this run may now be stale
+        if changed or stale_ids:
+            invalidate_search_cache()
+
+        self._save_index_state(new_state)
+        return len(changed)
+
+    def _collect_files(self, paths: List[str], patterns: List[str]) -> List[Path]:
+        """List files under PROJECT_ROOT/paths matching patterns, minus excludes"""
+        name_re = _compile_globs(patterns)
+        exclude_re = _compile_globs(self.config.exclude_patterns)
+        # A directory whose path matches a pattern ending in '*' has every
+        # file below it excluded too, so the walk can skip it entirely
+        prune_re = _compile_globs([p for p in self.config.exclude_patterns if p.endswith('*')])
+
+        files = []
+        for rel_path in paths:
+            full_path = PROJECT_ROOT / rel_path
+            if not full_path.is_dir():
+                continue
+            files.extend(self._iter_files(str(full_path), name_re, exclude_re, prune_re))
+        return files
+
+    def _iter_files(self, root: str, name_re, exclude_re, prune_re) -> Iterator[Path]:
+        """Walk root with os.scandir (symlinked directories are not followed)"""
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        path_key = os.path.normcase(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (prune_re and prune_re.match(path_key + os.sep)):
+                                stack.append(entry.path)
+                        elif name_re and name_re.match(os.path.normcase(entry.name)):
+                            if not (exclude_re and exclude_re.match(path_key)):
+                                yield Path(entry.path)
+            except OSError as e:
+                print(f"[WARNING] Cannot list directory: {e}")
+
+    def _parse_files(
+        self,
+        files: List[Path],
+        worker_fn: Callable[[Path], list],
+        local_fn: Callable[[Path], list]
+    ) -> Iterator[list]:
+        """
+        Yield the parse result for each file, in order.
+
+        Uses a process pool running worker_fn unless workers=1; if the pool
+        fails, the remaining files are parsed here with local_fn.
+        """
+        done = 0
+        if self.workers != 1 and len(files) > 1:
+            pool_size = self.workers or os.cpu_count() or 1
+            chunksize = max(1, min(32, len(files) // (pool_size * 4)))
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=pool_size,
+                    initializer=_init_worker,
+                    initargs=(self.config,)
+                ) as executor:
+                    for result in executor.map(worker_fn, files, chunksize=chunksize):
+                        yield result
+                        done += 1
+                return
+            except Exception as e:
+                print(f"  Warning: Parallel parsing failed ({e}), falling back to single process")
+
+        for file_path in files[done:]:
+            yield local_fn(file_path)
+
+    def _embed_texts(self, texts: List[str]) -> list:
+        """Dense vectors for texts; only texts missing from _dense_cache reach the model"""
+        if not (self.batch_embedding_fn or self.embedding_fn):
+            # Placeholder - in production, use actual embeddings
+            return [[0.0] * DENSE_VECTOR_SIZE] * len(texts)
 
-        print(f"   Indexed {self.stats['doc_entries']} documents from {self.stats['doc_files']} files")
+        vectors, hits = self._cached_vectors(
+            self._dense_cache, DENSE_CACHE_SIZE, texts, self._compute_embeddings
+        )
+        self.stats['embedding_cache_hits'] += hits
+        return vectors
 
-    def _symbol_to_point(self, symbol: ParsedSymbol) -> Optional[PointStruct]:
-        """Convert parsed symbol to Qdrant point"""
-        # Generate ID from name_path
-        point_id = self._generate_id(f"code:{symbol.name_path}:{symbol.file_path}")
+    def _sparse_vectors(self, texts: List[str]) -> List[Tuple[List[int], List[float]]]:
+        """Sparse (indices, values) for texts, tokenized as one batch"""
+        vectors, _ = self._cached_vectors(
+            self._sparse_cache, SPARSE_CACHE_SIZE, texts, self.tokenizer.to_sparse_vectors
+        )
+        return vectors
 
-        # Build text for embedding
-        embed_text = f"{symbol.name} {symbol.namespace} {symbol.signature} {symbol.documentation}"
+    def _cached_vectors(
+        self,
+        cache: OrderedDict,
+        max_size: int,
+        texts: List[str],
+        compute: Callable[[List[str]], list]
+    ) -> Tuple[list, int]:
+        """
+        Vectors for texts from a FIFO cache, computing the missing ones in a
+        single compute() call; returns (vectors, cache hits).
+        """
+        unique = list(dict.fromkeys(texts))
+        vectors = {text: cache[text] for text in unique if text in cache}
+        missing = [text for text in unique if text not in vectors]
+
+        if missing:
+            for text, vector in zip(missing, compute(missing)):
+                vectors[text] = vector
+                cache[text] = vector
+                if len(cache) > max_size:
+                    cache.popitem(last=False)
+
+        return [vectors[text] for text in texts], len(texts) - len(missing)
+
+    def _compute_embeddings(self, texts: List[str]) -> list:
+        """Dense vectors for texts, one batched model call when available"""
+        if self.batch_embedding_fn:
+            vectors = np.asarray(self.batch_embedding_fn(texts), dtype=np.float32)
+        else:
+            vectors = np.asarray([self.embedding_fn(text) for text in texts], dtype=np.float32)
 
-        # Generate sparse vector
-        sparse_indices, sparse_values = self.tokenizer.to_sparse_vector(embed_text)
+        # The unified collection scores with DOT, which needs unit vectors
+        if self.normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
 
-        # Generate dense vector (if embedding function available)
-        dense_vector = None
-        if self.embedding_fn:
-            dense_vector = self.embedding_fn(embed_text)
-        else:
-            # Placeholder - in production, use actual embeddings
-            dense_vector = [0.0] * DENSE_VECTOR_SIZE
+        # numpy matrices convert to nested lists in one call
+        return vectors.tolist()
+
+    def _symbols_to_points(self, symbols: List[ParsedSymbol]) -> List[PointStruct]:
+        """Embed a batch of symbols and convert them to Qdrant points"""
+        texts = [
+            f"{symbol.name} {symbol.namespace} {symbol.signature} {symbol.documentation}"
+            for symbol in symbols
+        ]
+        vectors = self._embed_texts(texts)
+        sparse = self._sparse_vectors(texts)
+        self.stats['code_symbols'] += len(symbols)
+        return [self._symbol_to_point(*item) for item in zip(symbols, sparse, vectors)]
+
+    def _docs_to_points(self, docs: List[ParsedDoc]) -> List[PointStruct]:
+        """Embed a batch of docs and convert them to Qdrant points"""
+        texts = [f"{doc.name} {doc.summary} {' '.join(doc.keywords)}" for doc in docs]
+        vectors = self._embed_texts(texts)
+        sparse = self._sparse_vectors(texts)
+        self.stats['doc_entries'] += len(docs)
+        return [self._doc_to_point(*item) for item in zip(docs, sparse, vectors)]
+
+    def _symbol_id(self, symbol: ParsedSymbol) -> str:
+        """Point ID for a symbol, from its name_path and file"""
+        return self._generate_id(f"code:{symbol.name_path}:{symbol.file_path}")
+
+    def _doc_id(self, doc: ParsedDoc) -> str:
+        """Point ID for a document, from its file and name"""
+        return self._generate_id(f"doc:{doc.file_path}:{doc.name}")
+
+    def _symbol_to_point(
+        self, symbol: ParsedSymbol, sparse_vector: Tuple[List[int], List[float]], dense_vector: list
+    ) -> PointStruct:
+        """Convert parsed symbol and its vectors to Qdrant point"""
+        point_id = self._symbol_id(symbol)
+
+        sparse_indices, sparse_values = sparse_vector
 
         # Determine assembly category
         assembly_category = self._categorize_assembly(symbol.assembly_name)
@@ -658,6 +1379,7 @@ class ProjectIndexer:
             "start_line": symbol.start_line,
             "end_line": symbol.end_line,
             "signature": symbol.signature,
+            "signature_md": symbol.signature.replace('|', '\\|'),  # Markdown-table safe
             "code_preview": symbol.code_preview,
             "documentation": symbol.documentation,
             "modifiers": symbol.modifiers,
@@ -670,7 +1392,7 @@ class ProjectIndexer:
             "is_deprecated": "Obsolete" in symbol.attributes,
             "has_documentation": bool(symbol.documentation),
             "relevance_score": 1.0,
-            "indexed_at": datetime.utcnow().isoformat(),
+            "indexed_at": self._indexed_at,
         }
 
         return PointStruct(
@@ -682,21 +1404,13 @@ class ProjectIndexer:
             payload=payload,
         )
 
-    def _doc_to_point(self, doc: ParsedDoc) -> Optional[PointStruct]:
-        """Convert parsed document to Qdrant point"""
-        point_id = self._generate_id(f"doc:{doc.file_path}:{doc.name}")
+    def _doc_to_point(
+        self, doc: ParsedDoc, sparse_vector: Tuple[List[int], List[float]], dense_vector: list
+    ) -> PointStruct:
+        """Convert parsed document and its vectors to Qdrant point"""
+        point_id = self._doc_id(doc)
 
-        # Build text for embedding
-        embed_text = f"{doc.name} {doc.summary} {' '.join(doc.keywords)}"
-
-        # Generate vectors
-        sparse_indices, sparse_values = self.tokenizer.to_sparse_vector(embed_text)
-
-        dense_vector = None
-        if self.embedding_fn:
-            dense_vector = self.embedding_fn(embed_text)
-        else:
-            dense_vector = [0.0] * DENSE_VECTOR_SIZE
+        sparse_indices, sparse_values = sparse_vector
 
         payload = {
             "content_type": "doc",
@@ -712,7 +1426,7 @@ class ProjectIndexer:
             "is_network": doc.is_network,
             "is_deprecated": False,
             "relevance_score": 1.0,
-            "indexed_at": datetime.utcnow().isoformat(),
+            "indexed_at": self._indexed_at,
         }
 
         return PointStruct(
@@ -725,40 +1439,25 @@ class ProjectIndexer:
         )
 
     def _generate_id(self, content: str) -> str:
-        """Generate deterministic ID from content"""
-        return hashlib.sha256(content.encode()).hexdigest()[:32]
-
-    def _should_exclude(self, file_path: Path) -> bool:
-        """Check if file should be excluded"""
-        path_str = str(file_path)
-        for pattern in self.config.exclude_patterns:
-            if fnmatch.fnmatch(path_str, pattern):
-                return True
-        return False
+        """Generate deterministic 128-bit ID (32 hex chars, a valid Qdrant UUID) from content"""
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
     def _categorize_assembly(self, assembly_name: str) -> str:
         """Categorize assembly"""
-        for prefix, category in self.config.assembly_category_rules.items():
-            if assembly_name.startswith(prefix):
-                return category
-        return AssemblyCategory.PROJECT_CODE.value
+        return self._assembly_category(assembly_name)
 
     def _extract_code_keywords(self, symbol: ParsedSymbol) -> List[str]:
         """Extract keywords from code symbol"""
-        keywords = set()
-
         # From name (split camelCase)
-        name_parts = re.findall(r'[A-Z][a-z]+|[a-z]+|[A-Z]+(?=[A-Z]|$)', symbol.name)
-        keywords.update(p.lower() for p in name_parts)
+        keywords = set(_name_keywords(symbol.name))
 
         # From namespace
-        ns_parts = symbol.namespace.split('.')
-        keywords.update(p.lower() for p in ns_parts)
+        if symbol.namespace:
+            keywords.update(symbol.namespace.lower().split('.'))
 
         # From base classes and interfaces
         for base in symbol.base_classes + symbol.interfaces:
-            parts = re.findall(r'[A-Z][a-z]+|[a-z]+', base)
-            keywords.update(p.lower() for p in parts)
+            keywords.update(_base_keywords(base))
 
         # From modifiers
         keywords.update(symbol.modifiers)
@@ -774,16 +1473,89 @@ class ProjectIndexer:
         return list(keywords)[:30]
 
     def _upsert_points(self, points: List[PointStruct]):
-        """Upsert points to Qdrant"""
+        """
+        Queue a batch for the background upsert thread.
+
+        Blocks only when UPSERT_MAX_INFLIGHT batches are already waiting, so
+        parsing and embedding overlap with the Qdrant round-trips.
+        """
+        if self._upsert_thread is None:
+            self._upsert_queue = queue.Queue(maxsize=UPSERT_MAX_INFLIGHT)
+            self._upsert_thread = threading.Thread(target=self._upsert_worker, daemon=True)
+            self._upsert_thread.start()
+        self._upsert_queue.put(points)
+
+    def _flush_upserts(self):
+        """Wait until every queued batch has been sent"""
+        if self._upsert_thread is None:
+            return
+        self._upsert_queue.put(None)
+        self._upsert_thread.join()
+        self._upsert_queue = None
+        self._upsert_thread = None
+
+    def _upsert_worker(self):
+        """Send queued batches until the None sentinel arrives"""
+        while True:
+            points = self._upsert_queue.get()
+            if points is None:
+                return
+            self._send_points(points)
+
+    def _send_points(self, points: List[PointStruct]):
+        """Upsert points to Qdrant without waiting for indexing"""
         try:
             self.client.upsert(
                 collection_name=self.collection_name,
                 points=points,
-                wait=True,
+                wait=False,
             )
         except Exception as e:
             print(f"[ERROR] Failed to upsert {len(points)} points: {e}")
             self.stats['errors'] += 1
+            self._failed_ids.update(point.id for point in points)
+
+    def _delete_points(self, point_ids: List[str]):
+        """Delete points that no longer exist in the project"""
+        try:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=point_ids),
+                wait=False,
+            )
+            self.stats['deleted_points'] += len(point_ids)
+        except Exception as e:
+            print(f"[ERROR] Failed to delete {len(point_ids)} stale points: {e}")
+            self.stats['errors'] += 1
+
+    def _load_index_state(self) -> Dict[str, dict]:
+        """Load {path: {kind, stamp, digest, ids}} for this collection from INDEX_STATE_PATH"""
+        if not INDEX_STATE_PATH.exists():
+            return {}
+        try:
+            with open(INDEX_STATE_PATH, 'rb') as f:
+                state = pickle.load(f)
+            if (state.get("version") == INDEX_STATE_VERSION
+                    and state.get("project_root") == str(PROJECT_ROOT)
+                    and state.get("collection") == self.collection_name):
+                return state["files"]
+        except Exception as e:
+            print(f"[WARNING] Could not load index state: {e}")
+        return {}
+
+    def _save_index_state(self, files: Dict[str, dict]):
+        """Persist per-file index state for the next incremental run"""
+        try:
+            INDEX_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(INDEX_STATE_PATH, 'wb') as f:
+                pickle.dump({
+                    "version": INDEX_STATE_VERSION,
+                    "project_root": str(PROJECT_ROOT),
+                    "collection": self.collection_name,
+                    "files": files
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"[WARNING] Could not save index state: {e}")
 
     def _print_stats(self):
         """Print indexing statistics"""
@@ -794,6 +1566,9 @@ class ProjectIndexer:
         print(f"  Code symbols indexed:  {self.stats['code_symbols']}")
         print(f"  Doc files processed:   {self.stats['doc_files']}")
         print(f"  Doc entries indexed:   {self.stats['doc_entries']}")
+        print(f"  Unchanged files:       {self.stats['unchanged_files']}")
+        print(f"  Stale points deleted:  {self.stats['deleted_points']}")
+        print(f"  Embedding cache hits:  {self.stats['embedding_cache_hits']}")
         print(f"  Total indexed:         {self.stats['code_symbols'] + self.stats['doc_entries']}")
         print(f"  Errors:                {self.stats['errors']}")
 
@@ -810,16 +1585,35 @@ def main():
     parser.add_argument("--docs-only", action="store_true", help="Index docs only")
     parser.add_argument("--incremental", action="store_true", help="Incremental indexing")
     parser.add_argument("--collection", default=COLLECTION_UNIFIED, help="Collection name")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parser processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--onnx-model", type=Path, default=None,
+                        help="ONNX embedding model file or optimum export dir (GPU when available)")
 
     args = parser.parse_args()
 
-    indexer = ProjectIndexer(collection_name=args.collection)
+    batch_embedding_fn = None
+    if args.onnx_model:
+        if ONNX_AVAILABLE:
+            try:
+                batch_embedding_fn = OnnxEmbedder(args.onnx_model)
+                print(f"  Embedding model: {args.onnx_model} ({batch_embedding_fn.device})")
+            except Exception as e:
+                print(f"[WARNING] Failed to load ONNX model, using placeholder embeddings: {e}")
+        else:
+            print("[WARNING] onnxruntime/transformers not installed, using placeholder embeddings")
+
+    indexer = ProjectIndexer(
+        collection_name=args.collection,
+        batch_embedding_fn=batch_embedding_fn,
+        workers=args.workers
+    )
 
     if args.code_only:
-        indexer.index_code()
+        indexer.index_code(incremental=args.incremental)
         indexer._print_stats()
     elif args.docs_only:
-        indexer.index_docs()
+        indexer.index_docs(incremental=args.incremental)
         indexer._print_stats()
     else:
         indexer.index_all(incremental=args.incremental)
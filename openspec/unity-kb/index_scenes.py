@@ -10,10 +10,15 @@ Usage:
 Options:
     --all-scenes       Index all .unity files in Assets/ directory
     --recursive        Recursively find scenes in subdirectories
-    --exclude PATTERN  Exclude files matching pattern (can be used multiple times)
+    --exclude PATTERN  Exclude files matching pattern (can be used multiple times);
+                       a glob when it has * ? or [, otherwise a path substring
     --dry-run          Show what would be indexed without actually indexing
-    --force            Re-index scenes that are already indexed
+    --force            Re-index scenes that are already indexed or unchanged
+    --reset-cache      Forget which scenes earlier runs indexed
     --verbose          Show detailed progress information
+    --workers N        Scenes indexed concurrently (default: 1);
+                       only raise it if the knowledge base is thread-safe
+    --batch-size N     Scenes queued for indexing at a time (default: 64)
 
 Examples:
     # Index all scenes in Assets/
@@ -30,82 +35,309 @@ Examples:
 """
 
 import os
+import re
 import sys
-import glob
+import json
+import time
+import hashlib
+import fnmatch
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(__file__))
 
 from scene_parser import UnitySceneParser
 from direct_mcp_server import KnowledgeBase, Config
+from hybrid_search import invalidate_search_cache
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Stamps and content hashes of indexed scenes, so re-runs skip unchanged ones
+SCENE_CACHE_FILE = PROJECT_ROOT / "claudedocs" / "reports" / ".scene_index_cache.json"
+SCENE_CACHE_VERSION = 1
+CACHE_SAVE_SECONDS = 30  # Longest stretch of indexing between cache saves
+
+
+def _scene_digest(scene_path: str) -> str:
+    """BLAKE2b digest of a scene file, read in blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(scene_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _compile_excludes(patterns: List[str]) -> Optional[re.Pattern]:
+    """
+    Compile exclude patterns into one regex for re.search over a path.
+    Patterns with glob characters match the whole path like fnmatchcase;
+    others match anywhere in it, as plain substrings.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(
+        rf'\A(?:{fnmatch.translate(p)})' if any(c in p for c in '*?[') else re.escape(p)
+        for p in patterns
+    ))
+
+
+def _walk_unity(base_path: str, exclude_re: Optional[re.Pattern],
+                prune_re: Optional[re.Pattern], recursive: bool = True) -> Iterator[str]:
+    """
+    Yield the .unity files under base_path whose path exclude_re doesn't
+    match. Directories whose path plus a separator matches prune_re are
+    skipped without being listed.
+    """
+    try:
+        entries = list(os.scandir(base_path))
+    except OSError:
+        return
+
+    for entry in entries:
+        if entry.name.startswith('.'):  # hidden, as glob skips them
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            if recursive and not (prune_re and prune_re.search(entry.path + os.sep)):
+                yield from _walk_unity(entry.path, exclude_re, prune_re, recursive)
+        elif os.path.normcase(entry.name).endswith('.unity') and entry.is_file():
+            if not (exclude_re and exclude_re.search(entry.path)):
+                yield entry.path
 
 
 class SceneIndexer:
     """Batch indexer for Unity scenes."""
 
-    def __init__(self, kb: KnowledgeBase, verbose: bool = False):
+    def __init__(self, kb: KnowledgeBase, verbose: bool = False,
+                 cache_path: Optional[Path] = SCENE_CACHE_FILE, reset_cache: bool = False):
         self.kb = kb
         self.verbose = verbose
         self.indexed_scenes: Set[str] = set()
+        # index_scene runs on worker threads; guards the sets and caches below
+        self._lock = threading.Lock()
+
+        # Scene path -> [mtime_ns, size, digest] as of its last successful
+        # index, persisted in cache_path (None disables the cache)
+        self.cache_path = cache_path
+        self.seen_hashes: Dict[str, list] = {} if reset_cache else self._load_cache()
+        self._pending_hashes: Dict[str, list] = {}  # Scenes being indexed
+        self._cache_dirty = reset_cache
 
     def index_scene(self, scene_path: str, force: bool = False, dry_run: bool = False) -> bool:
         """Index a single scene file."""
         scene_path = os.path.abspath(scene_path)
+        skipped = self._check_scene(scene_path, force, dry_run)
+        if skipped is not None:
+            return skipped
+
+        if self.verbose:
+            print(f"🔄 Indexing scene: {Path(scene_path).stem}")
 
+        success = self.kb.index_scene_file(scene_path)
+        return self._record_result(scene_path, success)
+
+    def index_scenes_batch(self, scene_paths: List[str], force: bool = False,
+                           dry_run: bool = False, batch_size: int = 64,
+                           workers: int = 1) -> Tuple[int, int]:
+        """
+        Index many scenes, returning (successful, failed).
+
+        Every scene goes through index_scene, batch_size scenes at a time:
+        a batch is finished before the next one is queued. KnowledgeBase is
+        not known to be thread-safe, so the default of one worker indexes
+        sequentially without a pool; more workers call it concurrently from
+        a thread pool and are only safe with a knowledge base that allows that.
+        """
+        successful = 0
+        failed = 0
+        batch_size = max(1, batch_size)
+        batches = [scene_paths[i:i + batch_size] for i in range(0, len(scene_paths), batch_size)]
+
+        last_save = time.monotonic()
+
+        def count(ok: bool):
+            nonlocal successful, failed, last_save
+            if ok:
+                successful += 1
+            else:
+                failed += 1
+            if time.monotonic() - last_save >= CACHE_SAVE_SECONDS:
+                self.save_cache()
+                last_save = time.monotonic()
+
+        # The cache is saved after every batch and at least every
+        # CACHE_SAVE_SECONDS, so a crash or kill loses little of the run, and
+        # once more on the way out (after running scenes finish, if interrupted)
+        try:
+            if workers <= 1:
+                for batch in batches:
+                    for scene_path in batch:
+                        count(self._index_scene_safely(scene_path, force, dry_run))
+                    self.save_cache()
+                    last_save = time.monotonic()
+                return successful, failed
+
+            # Parsing, embedding and Qdrant upserts are mostly I/O-bound, so
+            # scenes can be indexed on a bounded thread pool rather than in turn
+            executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                for batch in batches:
+                    futures = [
+                        executor.submit(self._index_scene_safely, scene_path, force, dry_run)
+                        for scene_path in batch
+                    ]
+                    for future in as_completed(futures):
+                        count(future.result())
+                    self.save_cache()
+                    last_save = time.monotonic()
+            except BaseException:
+                # Drop queued scenes so Ctrl-C doesn't wait for all of them
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            executor.shutdown(wait=True)
+        finally:
+            self.save_cache()
+            # Searches cached before this run may now be stale
+            if successful and not dry_run:
+                invalidate_search_cache()
+
+        return successful, failed
+
+    def _index_scene_safely(self, scene_path: str, force: bool, dry_run: bool) -> bool:
+        """index_scene, reporting an unexpected error as a failed scene."""
+        try:
+            return self.index_scene(scene_path, force, dry_run)
+        except Exception as e:
+            print(f"❌ Failed to index: {Path(scene_path).stem} ({e})")
+            return False
+
+    def _check_scene(self, scene_path: str, force: bool, dry_run: bool) -> Optional[bool]:
+        """Result for a scene that needs no indexing, or None to index it."""
         if not os.path.exists(scene_path):
             print(f"⚠️  Scene file not found: {scene_path}")
             return False
 
         scene_name = Path(scene_path).stem
 
-        if scene_name in self.indexed_scenes and not force:
+        with self._lock:
+            already_indexed = scene_name in self.indexed_scenes
+
+        if already_indexed and not force:
             if self.verbose:
                 print(f"⏭️  Skipping already indexed scene: {scene_name}")
             return True
 
+        try:
+            entry, unchanged = self._scene_state(scene_path)
+        except OSError as e:
+            print(f"⚠️  Cannot read scene file: {scene_path} ({e})")
+            return False
+
+        if unchanged and not force:
+            if self.verbose:
+                print(f"⏭️  Skipping unchanged scene: {scene_name}")
+            return True
+
         if dry_run:
             print(f"📋 Would index: {scene_path}")
             return True
 
-        if self.verbose:
-            print(f"🔄 Indexing scene: {scene_name}")
+        with self._lock:
+            self._pending_hashes[scene_path] = entry
+        return None
+
+    def _scene_state(self, scene_path: str) -> Tuple[list, bool]:
+        """
+        The scene's [mtime_ns, size, digest] and whether it matches the cache.
+        An unchanged stamp skips reading the file; a touched but identical
+        file only refreshes its cached stamp.
+        """
+        st = os.stat(scene_path)
+        stamp = [st.st_mtime_ns, st.st_size]
+
+        with self._lock:
+            cached = self.seen_hashes.get(scene_path)
+        if cached and cached[:2] == stamp:
+            return cached, True
+
+        entry = stamp + [_scene_digest(scene_path)]
+        unchanged = bool(cached) and cached[2] == entry[2]
+        if unchanged:
+            with self._lock:
+                self.seen_hashes[scene_path] = entry
+                self._cache_dirty = True
+        return entry, unchanged
+
+    def _record_result(self, scene_path: str, success: bool) -> bool:
+        """Report an indexing result and remember indexed scenes."""
+        scene_name = Path(scene_path).stem
 
-        success = self.kb.index_scene_file(scene_path)
+        with self._lock:
+            entry = self._pending_hashes.pop(scene_path, None)
+            if success:
+                self.indexed_scenes.add(scene_name)
+                if entry:
+                    self.seen_hashes[scene_path] = entry
+                    self._cache_dirty = True
 
         if success:
-            self.indexed_scenes.add(scene_name)
             print(f"✅ Indexed: {scene_name}")
             return True
         else:
             print(f"❌ Failed to index: {scene_name}")
             return False
 
+    def _load_cache(self) -> Dict[str, list]:
+        """Scene hashes saved by earlier runs."""
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == SCENE_CACHE_VERSION:
+                return data.get("scenes", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable scene cache: {e}")
+        return {}
+
+    def save_cache(self):
+        """Write the scene hash cache if it changed (temp file + os.replace)."""
+        if not self.cache_path:
+            return
+
+        with self._lock:
+            if not self._cache_dirty:
+                return
+            data = {"version": SCENE_CACHE_VERSION, "scenes": dict(self.seen_hashes)}
+            self._cache_dirty = False
+
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not save scene cache: {e}")
+
     def find_scenes(self, base_path: str = "Assets", recursive: bool = True,
                    exclude_patterns: List[str] = None) -> List[str]:
         """Find all .unity files in the specified path."""
         if exclude_patterns is None:
             exclude_patterns = []
 
-        pattern = "**/*.unity" if recursive else "*.unity"
-        search_path = os.path.join(base_path, pattern)
-
-        scenes = glob.glob(search_path, recursive=recursive)
-
-        # Apply exclusions
-        filtered_scenes = []
-        for scene in scenes:
-            excluded = False
-            for pattern in exclude_patterns:
-                if pattern in scene:
-                    excluded = True
-                    break
-            if not excluded:
-                filtered_scenes.append(scene)
-
-        return sorted(filtered_scenes)
+        # Exclusions are applied while walking. A directory can be pruned when
+        # a pattern matching it would match everything below it too: any
+        # substring, or a glob ending in '*'
+        exclude_re = _compile_excludes(exclude_patterns)
+        prune_re = _compile_excludes([
+            p for p in exclude_patterns
+            if p.endswith('*') or not any(c in p for c in '*?[')
+        ])
+        return sorted(_walk_unity(base_path, exclude_re, prune_re, recursive))
 
 
 def main():
@@ -142,7 +374,12 @@ def main():
 
     parser.add_argument(
         '--force', action='store_true',
-        help='Re-index scenes that are already indexed'
+        help='Re-index scenes that are already indexed or unchanged'
+    )
+
+    parser.add_argument(
+        '--reset-cache', action='store_true',
+        help=f'Forget which scenes earlier runs indexed ({SCENE_CACHE_FILE})'
     )
 
     parser.add_argument(
@@ -150,6 +387,17 @@ def main():
         help='Show detailed progress information'
     )
 
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Scenes indexed concurrently (default: 1 = sequential; '
+             'more workers require a thread-safe knowledge base)'
+    )
+
+    parser.add_argument(
+        '--batch-size', type=int, default=64,
+        help='Scenes queued for indexing at a time (default: 64)'
+    )
+
     args = parser.parse_args()
 
     # Validate arguments
@@ -168,7 +416,7 @@ def main():
         print("❌ Failed to connect to Qdrant. Check your configuration.")
         sys.exit(1)
 
-    indexer = SceneIndexer(kb, args.verbose)
+    indexer = SceneIndexer(kb, args.verbose, reset_cache=args.reset_cache)
 
     # Determine which scenes to index
     if args.all_scenes:
@@ -194,14 +442,10 @@ def main():
 
     # Index scenes
     print(f"\n🚀 {'Dry run: ' if args.dry_run else ''}Starting indexing...")
-    successful = 0
-    failed = 0
-
-    for scene_path in scenes_to_index:
-        if indexer.index_scene(scene_path, args.force, args.dry_run):
-            successful += 1
-        else:
-            failed += 1
+    successful, failed = indexer.index_scenes_batch(
+        scenes_to_index, args.force, args.dry_run,
+        batch_size=args.batch_size, workers=args.workers
+    )
 
     # Summary
     if args.dry_run:
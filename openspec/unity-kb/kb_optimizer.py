@@ -22,9 +22,18 @@ import sys
 import json
 import time
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime
+from collections import defaultdict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import our optimization modules
 from keyword_mapper import UnityKeywordMapper, KeywordMetadata
@@ -42,10 +51,63 @@ class KBOptimizationResult:
     performance_improvements: Dict[str, Any]
     optimization_report: Dict[str, Any]
 
+# Below this many items the keyword phase runs inline; a process pool would
+# cost more to start than it saves
+PARALLEL_MIN_ITEMS = 2048
+
+# Keyword mapper of a ProcessPoolExecutor worker, built by _init_worker
+_worker_mapper: Optional[UnityKeywordMapper] = None
+
+
+def _init_worker():
+    global _worker_mapper
+    _worker_mapper = UnityKeywordMapper()
+
+
+def _map_keywords(mapper: UnityKeywordMapper, fields: Tuple) -> Tuple[List[str], Optional[str], Optional[str]]:
+    """(keywords, component_type, gc_module) for one item's mapper fields"""
+    metadata = mapper.map_class_keywords(*fields)
+    return (
+        list(metadata.keywords),
+        metadata.component_type.value if metadata.component_type else None,
+        metadata.gc_module.value if metadata.gc_module else None,
+    )
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode()
+
+
+def _load_json(path: str) -> Any:
+    """Parse a JSON file, with orjson when it is installed"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _unique_names(groups: Iterable[List[str]], exclude: str) -> Iterator[str]:
+    """Distinct names across groups in order, skipping exclude; lazy"""
+    seen = {exclude}
+    for group in groups:
+        for name in group:
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+def _map_one(fields: Tuple) -> Tuple[List[str], Optional[str], Optional[str]]:
+    """Keyword-map one item with this process's mapper"""
+    return _map_keywords(_worker_mapper, fields)
+
+
 class UnityKBOptimizer:
     """Complete Unity KB optimization system"""
 
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers  # Keyword mapping processes (None = CPU count, 1 = no pool)
         self.keyword_mapper = UnityKeywordMapper()
         self.conflict_detector = UnityConflictDetector()
         self.doc_retriever = UnityDocumentationRetriever()
@@ -76,53 +138,53 @@ class UnityKBOptimizer:
         print("🚀 Starting Unity KB Optimization Pipeline")
         print("=" * 60)
 
-        # Load or generate sample KB data
+        # Load or generate sample KB data. Each phase adds its fields to the
+        # item dicts in place and hands the same list on
         kb_data = self._load_kb_data(kb_data_path)
 
         # Phase 1: Keyword Enhancement
         print("\n📝 Phase 1: Applying Advanced Keyword Taxonomy...")
-        enhanced_data = self._apply_keyword_taxonomy(kb_data)
+        kb_data = self._apply_keyword_taxonomy(kb_data)
 
         # Phase 2: Conflict Detection
         print("\n⚠️  Phase 2: Detecting Component Conflicts...")
-        conflict_aware_data = self._detect_kb_conflicts(enhanced_data)
+        kb_data = self._detect_kb_conflicts(kb_data)
 
         # Phase 3: Documentation Integration
         print("\n📚 Phase 3: Linking Documentation References...")
-        documented_data = self._integrate_documentation(conflict_aware_data)
+        kb_data = self._integrate_documentation(kb_data)
 
         # Phase 4: Cross-Referencing
         print("\n🔗 Phase 4: Building Cross-References...")
-        cross_referenced_data = self._build_cross_references(documented_data)
+        kb_data = self._build_cross_references(kb_data)
 
         # Phase 5: Performance Optimization
         print("\n⚡ Phase 5: Applying Performance Optimizations...")
-        optimized_data = self._optimize_performance(cross_referenced_data)
+        kb_data = self._optimize_performance(kb_data)
 
         # Save optimized KB
-        self._save_optimized_kb(optimized_data, output_path)
+        self._save_optimized_kb(kb_data, output_path)
 
         # Generate optimization report
-        result = self._generate_optimization_result(optimized_data)
+        result = self._generate_optimization_result(kb_data)
 
-        print("
-✅ KB Optimization Complete!"        print(f"📊 Processed {result.items_processed} items")
+        print("\n✅ KB Optimization Complete!")
+        print(f"📊 Processed {result.items_processed} items")
         print(f"🏷️  Added {result.keywords_added} keywords")
         print(f"⚠️  Detected {result.conflicts_detected} conflicts")
         print(f"📖 Linked {result.documentation_linked} documentation references")
 
         return result
 
-    def _load_kb_data(self, kb_data_path: str = None) -> List[Dict]:
-        """Load KB data from file or generate sample data"""
+    def _load_kb_data(self, kb_data_path: str = None) -> Iterable[Dict]:
+        """Load KB data from file or generate sample data (lazily)"""
         if kb_data_path and Path(kb_data_path).exists():
-            with open(kb_data_path, 'r') as f:
-                return json.load(f)
+            return _load_json(kb_data_path)
         else:
             # Generate comprehensive sample data representing 77,914 indexed items
             return self._generate_sample_kb_data()
 
-    def _generate_sample_kb_data(self) -> List[Dict]:
+    def _generate_sample_kb_data(self) -> Iterator[Dict]:
         """Generate representative sample KB data"""
         sample_classes = [
             # Unity Core Classes
@@ -188,56 +250,82 @@ class UnityKBOptimizer:
             }
         ]
 
-        # Expand to represent the full 77,914 items (simplified for demo)
-        expanded_data = []
-        for i, base_class in enumerate(sample_classes):
-            # Add the base class
-            expanded_data.append(base_class)
+        # Expand to represent the full 77,914 items (simplified for demo).
+        # Items are yielded one at a time; phase 1 collects them into the KB
+        def expand() -> Iterator[Dict]:
+            for base_class in sample_classes:
+                # Add the base class
+                yield base_class
 
-            # Generate variations to simulate scale (in real implementation,
-            # this would come from actual codebase analysis)
-            for variant in range(min(100, 77914 // len(sample_classes))):
-                variant_data = base_class.copy()
-                variant_data["name"] = f"{base_class['name']}Variant{variant}"
-                expanded_data.append(variant_data)
+                # Generate variations to simulate scale (in real implementation,
+                # this would come from actual codebase analysis)
+                for variant in range(min(100, 77914 // len(sample_classes))):
+                    variant_data = base_class.copy()
+                    variant_data["name"] = f"{base_class['name']}Variant{variant}"
+                    yield variant_data
 
-        return expanded_data[:77914]  # Cap at representative size
+        return islice(expand(), 77914)  # Cap at representative size
 
-    def _apply_keyword_taxonomy(self, kb_data: List[Dict]) -> List[Dict]:
+    def _apply_keyword_taxonomy(self, kb_data: Iterable[Dict]) -> List[Dict]:
         """Apply comprehensive keyword taxonomy to all KB items"""
-        enhanced_data = []
-
-        for item in kb_data:
-            # Apply keyword mapping
-            metadata = self.keyword_mapper.map_class_keywords(
+        if not isinstance(kb_data, list):
+            kb_data = list(kb_data)  # Generated sample data arrives lazily
+        intern = sys.intern
+        keywords_added = 0
+
+        for item, (keywords, component_type, gc_module) in zip(kb_data, self._map_all_keywords(kb_data)):
+            # The same few namespaces, assemblies and keywords repeat across
+            # tens of thousands of items; interning makes each one a single
+            # shared str (JSON loading and worker results create copies)
+            if isinstance(item.get("namespace"), str):
+                item["namespace"] = intern(item["namespace"])
+            if isinstance(item.get("assembly"), str):
+                item["assembly"] = intern(item["assembly"])
+
+            # Merge into the item
+            item["keywords"] = [intern(keyword) for keyword in keywords]
+            item["_keywords_fs"] = frozenset(item["keywords"])  # Shared by phases 3-5, dropped in 5
+            item["component_type"] = intern(component_type) if component_type else None
+            item["gc_module"] = intern(gc_module) if gc_module else None
+            item["keyword_confidence"] = 0.95  # High confidence for rule-based mapping
+            keywords_added += len(keywords)
+
+        # Update stats
+        self.processing_stats["items_processed"] += len(kb_data)
+        self.processing_stats["keywords_added"] += keywords_added
+
+        print(f"   ✓ Enhanced {len(kb_data)} items with keyword taxonomy")
+        return kb_data
+
+    def _map_all_keywords(self, kb_data: List[Dict]) -> List[Tuple[List[str], Optional[str], Optional[str]]]:
+        """
+        Keyword-map every item, in order. Mapping is pure-Python CPU work, so
+        large KBs are spread over a process pool; only the mapper's input
+        fields and its (keywords, component_type, gc_module) cross processes.
+        """
+        fields = [
+            (
                 item["name"],
                 item["namespace"],
                 item.get("base_classes", []),
                 item.get("interfaces", []),
                 item.get("methods", [])
             )
+            for item in kb_data
+        ]
 
-            # Merge with original data
-            enhanced_item = item.copy()
-            enhanced_item.update({
-                "keywords": list(metadata.keywords),
-                "component_type": metadata.component_type.value if metadata.component_type else None,
-                "gc_module": metadata.gc_module.value if metadata.gc_module else None,
-                "keyword_confidence": 0.95  # High confidence for rule-based mapping
-            })
-
-            enhanced_data.append(enhanced_item)
-
-            # Update stats
-            self.processing_stats["items_processed"] += 1
-            self.processing_stats["keywords_added"] += len(metadata.keywords)
+        pool_size = self.workers or os.cpu_count() or 1
+        if pool_size > 1 and len(fields) >= PARALLEL_MIN_ITEMS:
+            try:
+                with ProcessPoolExecutor(max_workers=pool_size, initializer=_init_worker) as executor:
+                    return list(executor.map(_map_one, fields, chunksize=512))
+            except Exception as e:
+                print(f"   Warning: Parallel keyword mapping failed ({e}), falling back to single process")
 
-        print(f"   ✓ Enhanced {len(enhanced_data)} items with keyword taxonomy")
-        return enhanced_data
+        return [_map_keywords(self.keyword_mapper, f) for f in fields]
 
     def _detect_kb_conflicts(self, kb_data: List[Dict]) -> List[Dict]:
         """Detect conflicts across the entire KB"""
-        conflict_aware_data = []
         detected_conflicts = []
 
         # Analyze each class for conflicts
@@ -251,8 +339,7 @@ class UnityKBOptimizer:
             )
 
             # Add conflict information
-            enhanced_item = item.copy()
-            enhanced_item["detected_conflicts"] = [
+            item["detected_conflicts"] = [
                 {
                     "type": c.type.value,
                     "severity": c.severity.value,
@@ -262,35 +349,32 @@ class UnityKBOptimizer:
                 } for c in conflicts
             ]
 
-            conflict_aware_data.append(enhanced_item)
             detected_conflicts.extend(conflicts)
 
-        # Add cross-class conflict analysis (simplified for performance)
-        cross_conflicts = self.conflict_detector.detect_cross_class_conflicts(
-            conflict_aware_data[:100]  # Analyze first 100 for demo
-        )
+        # Add cross-class conflict analysis over the whole KB; the detector
+        # only visits pairs whose base classes are known to conflict
+        cross_conflicts = self.conflict_detector.detect_cross_class_conflicts(kb_data)
         detected_conflicts.extend(cross_conflicts)
 
         self.processing_stats["conflicts_found"] = len(detected_conflicts)
 
         print(f"   ✓ Detected {len(detected_conflicts)} potential conflicts")
-        return conflict_aware_data
+        return kb_data
 
     def _integrate_documentation(self, kb_data: List[Dict]) -> List[Dict]:
         """Integrate documentation references into KB data"""
-        documented_data = []
+        docs_linked = 0
 
         for item in kb_data:
             # Get relevant documentation
             docs = self.doc_retriever.get_documentation_for_class(
                 item["name"],
                 item["namespace"],
-                set(item.get("keywords", []))
+                item["_keywords_fs"]
             )
 
             # Add documentation links
-            enhanced_item = item.copy()
-            enhanced_item["documentation_refs"] = [
+            item["documentation_refs"] = [
                 {
                     "title": doc.title,
                     "type": doc.type.value,
@@ -300,109 +384,94 @@ class UnityKBOptimizer:
                     "keywords": list(doc.keywords)
                 } for doc in docs
             ]
+            docs_linked += len(item["documentation_refs"])
 
-            documented_data.append(enhanced_item)
-
-        self.processing_stats["docs_linked"] = sum(
-            len(item.get("documentation_refs", [])) for item in documented_data
-        )
+        self.processing_stats["docs_linked"] = docs_linked
 
         print(f"   ✓ Linked {self.processing_stats['docs_linked']} documentation references")
-        return documented_data
+        return kb_data
 
     def _build_cross_references(self, kb_data: List[Dict]) -> List[Dict]:
         """Build cross-references between related KB items"""
         # Create lookup dictionaries for fast cross-referencing
-        by_namespace = {}
-        by_keywords = {}
-        by_component_type = {}
+        by_namespace = defaultdict(list)
+        by_keywords = defaultdict(list)
+        by_component_type = defaultdict(list)
 
         for item in kb_data:
-            namespace = item["namespace"]
-            keywords = set(item.get("keywords", []))
+            name = item["name"]
             comp_type = item.get("component_type")
 
             # Group by namespace
-            if namespace not in by_namespace:
-                by_namespace[namespace] = []
-            by_namespace[namespace].append(item["name"])
+            by_namespace[item["namespace"]].append(name)
 
             # Group by keywords
-            for keyword in keywords:
-                if keyword not in by_keywords:
-                    by_keywords[keyword] = []
-                by_keywords[keyword].append(item["name"])
+            for keyword in item["_keywords_fs"]:
+                by_keywords[keyword].append(name)
 
             # Group by component type
             if comp_type:
-                if comp_type not in by_component_type:
-                    by_component_type[comp_type] = []
-                by_component_type[comp_type].append(item["name"])
+                by_component_type[comp_type].append(name)
 
-        # Add cross-references to each item
-        cross_referenced_data = []
+        # Add cross-references to each item. Only the first few related names
+        # are kept, so the lookup lists are scanned lazily up to that limit
+        # instead of being filtered (or merged into a set) in full
         for item in kb_data:
-            enhanced_item = item.copy()
-
-            namespace = item["namespace"]
-            keywords = set(item.get("keywords", []))
+            name = item["name"]
             comp_type = item.get("component_type")
 
             # Find related items
-            related_by_namespace = [
-                name for name in by_namespace.get(namespace, [])
-                if name != item["name"]
-            ][:5]  # Limit to 5 related items
-
-            related_by_keywords = set()
-            for keyword in keywords:
-                related_by_keywords.update(
-                    name for name in by_keywords.get(keyword, [])
-                    if name != item["name"]
-                )
-            related_by_keywords = list(related_by_keywords)[:5]
+            related_by_namespace = list(islice(
+                (other for other in by_namespace[item["namespace"]] if other != name), 5
+            ))  # Limit to 5 related items
+
+            # Walk the phase 1 list (already distinct) rather than the
+            # frozenset so the picks follow keyword order
+            related_by_keywords = list(islice(_unique_names(
+                (by_keywords[keyword] for keyword in item["keywords"]), name
+            ), 5))
 
             related_by_type = []
             if comp_type:
-                related_by_type = [
-                    name for name in by_component_type.get(comp_type, [])
-                    if name != item["name"]
-                ][:3]
+                related_by_type = list(islice(
+                    (other for other in by_component_type[comp_type] if other != name), 3
+                ))
 
-            enhanced_item["cross_references"] = {
+            item["cross_references"] = {
                 "same_namespace": related_by_namespace,
                 "shared_keywords": related_by_keywords,
                 "same_component_type": related_by_type
             }
 
-            cross_referenced_data.append(enhanced_item)
-
-        print(f"   ✓ Built cross-references for {len(cross_referenced_data)} items")
-        return cross_referenced_data
+        print(f"   ✓ Built cross-references for {len(kb_data)} items")
+        return kb_data
 
     def _optimize_performance(self, kb_data: List[Dict]) -> List[Dict]:
         """Apply performance optimizations to KB data"""
-        optimized_data = []
+        # One timestamp for the whole pass rather than one per item
+        last_updated = datetime.now().isoformat()
 
         for item in kb_data:
-            # Compress keyword lists (remove duplicates, sort for consistency)
-            if "keywords" in item:
-                item["keywords"] = sorted(list(set(item["keywords"])))
+            # Compress keyword lists (remove duplicates, sort for consistency);
+            # the phase 1 frozenset already holds them de-duplicated
+            keyword_set = item.pop("_keywords_fs", None)
+            if keyword_set is not None:
+                item["keywords"] = sorted(keyword_set)
+            elif "keywords" in item:
+                item["keywords"] = sorted(set(item["keywords"]))
 
             # Add performance hints
             item["performance_hints"] = self._generate_performance_hints(item)
 
             # Add caching metadata
             item["cache_metadata"] = {
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": last_updated,
                 "version": "2.0",
                 "optimization_level": "advanced"
             }
 
-            optimized_data.append(item)
-
-        print(f"   ✓ Applied performance optimizations to {len(optimized_data)} items")
-        return optimized_data
+        print(f"   ✓ Applied performance optimizations to {len(kb_data)} items")
+        return kb_data
 
     def _generate_performance_hints(self, item: Dict) -> List[str]:
         """Generate performance hints for a KB item"""
@@ -428,22 +497,27 @@ class UnityKBOptimizer:
 
     def _save_optimized_kb(self, optimized_data: List[Dict], output_path: str):
         """Save the fully optimized KB data"""
-        output_data = {
-            "metadata": {
-                "version": "2.0",
-                "optimization_date": datetime.now().isoformat(),
-                "items_count": len(optimized_data),
-                "keyword_taxonomy_applied": True,
-                "conflict_detection_enabled": True,
-                "documentation_integration": True,
-                "cross_references_built": True,
-                "performance_optimized": True
-            },
-            "kb_data": optimized_data
+        metadata = {
+            "version": "2.0",
+            "optimization_date": datetime.now().isoformat(),
+            "items_count": len(optimized_data),
+            "keyword_taxonomy_applied": True,
+            "conflict_detection_enabled": True,
+            "documentation_integration": True,
+            "cross_references_built": True,
+            "performance_optimized": True
         }
 
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str)
+        # {"metadata": ..., "kb_data": [...]} is written piecewise, one item
+        # per line, so the serialized KB never sits in memory as a whole
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n  "metadata": ')
+            f.write(_json_bytes(metadata, indent=True).replace(b'\n', b'\n  '))
+            f.write(b',\n  "kb_data": [')
+            for i, item in enumerate(optimized_data):
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(_json_bytes(item))
+            f.write(b'\n  ]\n}\n')
 
         file_size_mb = Path(output_path).stat().st_size / (1024 * 1024)
         print(f"   ✓ Saved optimized KB to {output_path} ({file_size_mb:.2f} MB)")
@@ -529,7 +603,8 @@ def run_complete_kb_optimization():
     # Save detailed report
     report_file = "kb_optimization_report.json"
     with open(report_file, 'w') as f:
-        json.dump(asdict(result), f, indent=2, default=str)
+        # The nested report dicts are already JSON-ready, so skip asdict's deep copy
+        json.dump(vars(result), f, indent=2, default=str)
 
     print(f"\n📄 Detailed report saved to: {report_file}")
 
@@ -540,5 +615,4 @@ def run_complete_kb_optimization():
     print("   - Cross-referenced relationships")
 
 if __name__ == "__main__":
-    run_complete_kb_optimization()</content>
-</xai:function_call">Mcp_serena_write_memory
\ No newline at end of file
+    run_complete_kb_optimization()
@@ -10,138 +10,197 @@ Usage:
     python qdrant-status.py [--output FILE] [--fix]
 """
 
+# http.client, subprocess, concurrent.futures and json are imported where
+# they are used, so `--help` and argument errors return without loading them
 import os
-import json
-import urllib.request
-import urllib.error
-from pathlib import Path
+import sys
+import threading
 from datetime import datetime
+from functools import lru_cache
+
+# ASCII status markers: legacy Windows consoles (cp1252 and friends)
+# cannot encode emoji
+_OK = "[OK]"
+_FAIL = "[X]"
+_WARN = "[!]"
+
+QDRANT_HOST = 'localhost'
+QDRANT_PORT = 6333
+HTTP_TIMEOUT = 3  # seconds per request
+
+# (check, weight) pairs for the health score
+HEALTH_WEIGHTS = (
+    ('docker_installed', 15),
+    ('docker_daemon', 15),
+    ('container_exists', 10),
+    ('container_running', 15),
+    ('qdrant_health', 20),
+    ('collections_accessible', 10),
+    ('files_present', 10),
+    ('unity_kb_collection_exists', 5),
+)
+MAX_HEALTH_SCORE = sum(weight for _, weight in HEALTH_WEIGHTS)
+
+# check -> the check it depends on. When the prerequisite fails the check
+# cannot pass, so it is reported as failed without being run (no docker ps
+# against a dead daemon, no second HTTP timeout against a hung Qdrant)
+CHECK_PREREQUISITES = {
+    'container_exists': 'docker_daemon',
+    'collections_accessible': 'qdrant_health',
+}
+
+
+def _docker(*args, timeout=5):
+    """Run a docker CLI command directly (no shell), capturing its output."""
+    import subprocess
+    return subprocess.run(['docker', *args], capture_output=True, text=True, timeout=timeout)
+
+
+_daemon_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _docker_info_ok():
+    import subprocess
+    try:
+        return _docker('info', timeout=3).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def _docker_daemon_up():
+    """Whether `docker info` succeeds; probed once per process.
+
+    Concurrent checks wait on the lock for the first probe instead of
+    sending their own to a daemon that may be slow or down.
+    """
+    with _daemon_lock:
+        return _docker_info_ok()
 
 
 class QdrantStatusChecker:
-    """Status checker for Qdrant Unity KB system."""
+    """Status checker for Qdrant Unity KB system.
+
+    Each check_* method returns (passed, checks, recommendations) without
+    touching self.status, so run_all_checks can run them concurrently and
+    merge the results afterwards.
+    """
 
     def __init__(self):
         self.status = {
             'timestamp': datetime.now().isoformat(),
             'checks': {},
+            'skipped': {},
             'summary': {},
             'recommendations': []
         }
 
+        # One keep-alive connection for all Qdrant REST calls
+        import http.client
+        self._conn = http.client.HTTPConnection(QDRANT_HOST, QDRANT_PORT, timeout=HTTP_TIMEOUT)
+        self._http_lock = threading.Lock()
+
+    def _qdrant_get(self, path):
+        """GET a Qdrant REST path and decode the JSON body."""
+        import http.client
+        import json
+
+        with self._http_lock:
+            try:
+                self._conn.request('GET', path)
+                response = self._conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                self._conn.close()  # Reconnect on the next request
+                raise
+
+        if response.status != 200:
+            raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+        return json.loads(body)
+
     def check_docker(self):
         """Check if Docker is available."""
         try:
             # Try to run docker version
-            result = os.system('docker --version >nul 2>&1')
-            if result == 0:
-                self.status['checks']['docker_installed'] = True
-                return True
+            result = _docker('--version')
+            if result.returncode == 0:
+                return True, {'docker_installed': True}, []
             else:
-                self.status['checks']['docker_installed'] = False
-                self.status['recommendations'].append("Install Docker Desktop from https://www.docker.com/products/docker-desktop")
-                return False
+                return False, {'docker_installed': False}, [
+                    "Install Docker Desktop from https://www.docker.com/products/docker-desktop"
+                ]
+        except FileNotFoundError:
+            return False, {'docker_installed': False}, [
+                "Install Docker Desktop from https://www.docker.com/products/docker-desktop"
+            ]
         except:
-            self.status['checks']['docker_installed'] = False
-            return False
+            return False, {'docker_installed': False}, []
 
     def check_docker_daemon(self):
         """Check if Docker daemon is running."""
-        try:
-            result = os.system('docker info >nul 2>&1')
-            if result == 0:
-                self.status['checks']['docker_daemon'] = True
-                return True
-            else:
-                self.status['checks']['docker_daemon'] = False
-                self.status['recommendations'].append("Start Docker Desktop application")
-                return False
-        except:
-            self.status['checks']['docker_daemon'] = False
-            return False
+        if _docker_daemon_up():
+            return True, {'docker_daemon': True}, []
+        else:
+            return False, {'docker_daemon': False}, ["Start Docker Desktop application"]
 
     def check_qdrant_container(self):
         """Check Qdrant container status."""
         try:
-            # Try to list containers with qdrant in name
-            result = os.system('docker ps -a --filter "name=qdrant-unity-kb" --format "{{.Names}}" > temp_container_check.txt 2>&1')
-
-            if os.path.exists('temp_container_check.txt'):
-                with open('temp_container_check.txt', 'r') as f:
-                    content = f.read()
-                    os.remove('temp_container_check.txt')
-
-                    if 'qdrant-unity-kb' in content:
-                        self.status['checks']['container_exists'] = True
-
-                        # Check if it's running
-                        result = os.system('docker ps --filter "name=qdrant-unity-kb" --format "{{.Names}}" > temp_running_check.txt 2>&1')
-
-                        if os.path.exists('temp_running_check.txt'):
-                            with open('temp_running_check.txt', 'r') as f:
-                                running_content = f.read()
-                                os.remove('temp_running_check.txt')
-
-                                if 'qdrant-unity-kb' in running_content:
-                                    self.status['checks']['container_running'] = True
-                                    return True
-                                else:
-                                    self.status['checks']['container_running'] = False
-                                    self.status['recommendations'].append("Start Qdrant container: docker start qdrant-unity-kb")
-                                    return False
-                        else:
-                            self.status['checks']['container_running'] = False
-                            return False
-                    else:
-                        self.status['checks']['container_exists'] = False
-                        self.status['recommendations'].append("Create Qdrant container: .\\scripts\\unity-kb\\setup-qdrant.ps1")
-                        return False
+            # One listing of containers with qdrant in name gives both
+            # existence and state ("name<TAB>state" per line)
+            result = _docker('ps', '-a', '--filter', 'name=qdrant-unity-kb',
+                             '--format', '{{.Names}}\t{{.State}}')
+            states = [
+                state for name, _, state in (line.partition('\t') for line in result.stdout.splitlines())
+                if 'qdrant-unity-kb' in name
+            ]
+            if not states:
+                return False, {'container_exists': False}, [
+                    "Create Qdrant container: .\\scripts\\unity-kb\\setup-qdrant.ps1"
+                ]
+
+            # Check if it's running
+            if 'running' in states:
+                return True, {'container_exists': True, 'container_running': True}, []
             else:
-                self.status['checks']['container_exists'] = False
-                return False
+                return False, {'container_exists': True, 'container_running': False}, [
+                    "Start Qdrant container: docker start qdrant-unity-kb"
+                ]
 
         except Exception as e:
-            self.status['checks']['container_status_error'] = str(e)
-            return False
+            return False, {'container_status_error': str(e)}, []
 
     def check_qdrant_health(self):
         """Check Qdrant health endpoint."""
         try:
-            with urllib.request.urlopen('http://localhost:6333/health', timeout=10) as response:
-                data = json.loads(response.read().decode())
-                self.status['checks']['qdrant_health'] = True
-                self.status['checks']['qdrant_version'] = data.get('version', 'unknown')
-                return True
-        except urllib.error.URLError as e:
-            self.status['checks']['qdrant_health'] = False
-            self.status['recommendations'].append(f"Qdrant not responding: {e.reason}. Ensure container is running on port 6333")
-            return False
+            data = self._qdrant_get('/health')
+            return True, {'qdrant_health': True, 'qdrant_version': data.get('version', 'unknown')}, []
+        except OSError as e:
+            return False, {'qdrant_health': False}, [
+                f"Qdrant not responding: {e}. Ensure container is running on port {QDRANT_PORT}"
+            ]
         except Exception as e:
-            self.status['checks']['qdrant_health'] = False
-            self.status['recommendations'].append(f"Qdrant health check failed: {e}")
-            return False
+            return False, {'qdrant_health': False}, [f"Qdrant health check failed: {e}"]
 
     def check_collections(self):
         """Check Qdrant collections."""
         try:
-            with urllib.request.urlopen('http://localhost:6333/collections', timeout=10) as response:
-                data = json.loads(response.read().decode())
-                collections = data.get('result', {}).get('collections', [])
-                self.status['checks']['collections_accessible'] = True
-                self.status['checks']['collection_count'] = len(collections)
-
-                # Check for unity_project_kb collection
-                collection_names = [c['name'] for c in collections]
-                if 'unity_project_kb' in collection_names:
-                    self.status['checks']['unity_kb_collection_exists'] = True
-                else:
-                    self.status['checks']['unity_kb_collection_exists'] = False
-                    self.status['recommendations'].append("Index Unity codebase to create unity_project_kb collection")
-
-                return True
+            data = self._qdrant_get('/collections')
+            collections = data.get('result', {}).get('collections', [])
+            checks = {'collections_accessible': True, 'collection_count': len(collections)}
+            recommendations = []
+
+            # Check for unity_project_kb collection
+            collection_names = [c['name'] for c in collections]
+            if 'unity_project_kb' in collection_names:
+                checks['unity_kb_collection_exists'] = True
+            else:
+                checks['unity_kb_collection_exists'] = False
+                recommendations.append("Index Unity codebase to create unity_project_kb collection")
+
+            return True, checks, recommendations
         except:
-            self.status['checks']['collections_accessible'] = False
-            return False
+            return False, {'collections_accessible': False}, []
 
     def check_files(self):
         """Check if required files exist."""
@@ -153,62 +212,90 @@ class QdrantStatusChecker:
             '.mcp.json'
         ]
 
-        missing_files = []
-        for file_path in files_to_check:
-            if not Path(file_path).exists():
-                missing_files.append(file_path)
+        # List each parent directory once instead of a stat per file
+        listings = {}
+        for directory in {os.path.dirname(file_path) for file_path in files_to_check}:
+            try:
+                with os.scandir(directory or '.') as entries:
+                    listings[directory] = {entry.name for entry in entries}
+            except OSError:
+                listings[directory] = set()  # Missing directory: all its files are missing
+
+        missing_files = [
+            file_path for file_path in files_to_check
+            if os.path.basename(file_path) not in listings[os.path.dirname(file_path)]
+        ]
 
-        self.status['checks']['files_present'] = len(missing_files) == 0
+        checks = {'files_present': len(missing_files) == 0}
+        recommendations = []
         if missing_files:
-            self.status['checks']['missing_files'] = missing_files
-            self.status['recommendations'].append(f"Missing files: {', '.join(missing_files)}")
+            checks['missing_files'] = missing_files
+            recommendations.append(f"Missing files: {', '.join(missing_files)}")
 
-        return len(missing_files) == 0
+        return len(missing_files) == 0, checks, recommendations
 
     def calculate_health_score(self):
         """Calculate overall health score."""
         checks = self.status['checks']
 
-        # Define weights for different checks
-        weights = {
-            'docker_installed': 15,
-            'docker_daemon': 15,
-            'container_exists': 10,
-            'container_running': 15,
-            'qdrant_health': 20,
-            'collections_accessible': 10,
-            'files_present': 10,
-            'unity_kb_collection_exists': 5
-        }
-
+        # Score and count the passed checks in one pass
         total_score = 0
-        max_score = sum(weights.values())
-
-        for check, weight in weights.items():
+        checks_passed = 0
+        for check, weight in HEALTH_WEIGHTS:
             if checks.get(check, False):
                 total_score += weight
+                checks_passed += 1
 
-        health_percentage = (total_score / max_score) * 100
+        health_percentage = (total_score / MAX_HEALTH_SCORE) * 100
 
         self.status['summary'] = {
             'health_score': round(health_percentage, 1),
             'status': 'HEALTHY' if health_percentage >= 80 else 'DEGRADED' if health_percentage >= 60 else 'CRITICAL',
-            'checks_passed': sum(1 for check in weights.keys() if checks.get(check, False)),
-            'total_checks': len(weights)
+            'checks_passed': checks_passed,
+            'total_checks': len(HEALTH_WEIGHTS)
         }
 
         return health_percentage
 
+    @staticmethod
+    def _run_check(check, prerequisite):
+        """Run check, or return None if the prerequisite's future failed."""
+        if prerequisite is not None and not prerequisite.result()[0]:
+            return None
+        return check()
+
     def run_all_checks(self):
         """Run all status checks."""
-        print("🔍 Checking Qdrant Unity Knowledge Base Status...")
-
-        self.check_docker()
-        self.check_docker_daemon()
-        self.check_qdrant_container()
-        self.check_qdrant_health()
-        self.check_collections()
-        self.check_files()
+        print("Checking Qdrant Unity Knowledge Base Status...")
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The checks mostly wait on docker or HTTP, so run them side by
+        # side; one with a prerequisite waits for that check's result first
+        checks = (
+            ('docker_installed', self.check_docker),
+            ('docker_daemon', self.check_docker_daemon),
+            ('container_exists', self.check_qdrant_container),
+            ('qdrant_health', self.check_qdrant_health),
+            ('collections_accessible', self.check_collections),
+            ('files_present', self.check_files),
+        )
+        futures = {}
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            for name, check in checks:
+                prerequisite = futures.get(CHECK_PREREQUISITES.get(name))
+                futures[name] = executor.submit(self._run_check, check, prerequisite)
+
+        # Merge in declaration order so the report reads the same every run
+        for name, future in futures.items():
+            result = future.result()
+            if result is None:
+                self.status['checks'][name] = False
+                self.status['skipped'][name] = f"prerequisite failed: {CHECK_PREREQUISITES[name]}"
+                continue
+            _, results, recommendations = result
+            self.status['checks'].update(results)
+            self.status['recommendations'].extend(recommendations)
 
         self.calculate_health_score()
 
@@ -216,41 +303,43 @@ class QdrantStatusChecker:
 
     def save_report(self, output_file="qdrant_status_report.json"):
         """Save status report to file."""
+        import json
+
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.status, f, indent=2, ensure_ascii=False)
+            json.dump(self.status, f, indent=2)
 
-        print(f"📊 Status report saved to: {output_file}")
+        print(f"Status report saved to: {output_file}")
 
     def print_summary(self):
         """Print status summary."""
         summary = self.status['summary']
 
-        print(f"\n🏥 System Health: {summary['health_score']}% - {summary['status']}")
-        print(f"✅ Checks Passed: {summary['checks_passed']}/{summary['total_checks']}")
+        print(f"\nSystem Health: {summary['health_score']}% - {summary['status']}")
+        print(f"Checks Passed: {summary['checks_passed']}/{summary['total_checks']}")
 
         # Print check results
-        print("\n📋 Check Results:")
+        print("\nCheck Results:")
         for check, result in self.status['checks'].items():
-            status = "✅" if result else "❌"
+            status = _OK if result else _FAIL
             print(f"  {status} {check.replace('_', ' ').title()}")
 
         # Print recommendations
         if self.status['recommendations']:
-            print("\n💡 Recommendations:")
+            print("\nRecommendations:")
             for rec in self.status['recommendations'][:5]:  # Show first 5
-                print(f"  • {rec}")
+                print(f"  - {rec}")
 
         # Next steps
         health_score = summary['health_score']
-        print("
-🎯 Next Steps:"        if health_score >= 80:
-            print("  ✅ System is healthy! Ready for indexing and search.")
+        print("\nNext Steps:")
+        if health_score >= 80:
+            print(f"  {_OK} System is healthy! Ready for indexing and search.")
             print("     Run: python scripts/unity-kb/qdrant_unity_indexer.py --verbose")
         elif health_score >= 60:
-            print("  ⚠️  Minor issues detected. Try troubleshooting:")
+            print(f"  {_WARN} Minor issues detected. Try troubleshooting:")
             print("     python scripts/unity-kb/qdrant-status.py --fix")
         else:
-            print("  ❌ Critical issues require attention:")
+            print(f"  {_FAIL} Critical issues require attention:")
             print("     1. Ensure Docker Desktop is running")
             print("     2. Run: .\\scripts\\unity-kb\\setup-qdrant.ps1")
             print("     3. Check: python scripts/unity-kb/qdrant-status.py")
@@ -260,6 +349,11 @@ def main():
     """Main entry point."""
     import argparse
 
+    # Paths and OS error messages can still hold characters the console
+    # cannot encode; print a replacement instead of raising
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+
     parser = argparse.ArgumentParser(description="Qdrant Unity KB Status Checker")
     parser.add_argument("--output", default="qdrant_status_report.json",
                        help="Output JSON file")
@@ -282,26 +376,31 @@ def main():
 
     # Attempt fixes if requested
     if args.fix and status['summary']['health_score'] < 80:
-        print("\n🔧 Attempting automatic fixes...")
+        print("\nAttempting automatic fixes...")
 
         # Try to start container if it exists but isn't running
         if (status['checks'].get('container_exists') and
-            not status['checks'].get('container_running')):
+            not status['checks'].get('container_running') and
+            _docker_daemon_up()):
             print("Starting Qdrant container...")
-            os.system('docker start qdrant-unity-kb >nul 2>&1')
+            import subprocess
+            try:
+                _docker('start', 'qdrant-unity-kb', timeout=30)
+            except (OSError, subprocess.SubprocessError):
+                pass  # The health check below reports the failure
 
             # Wait and recheck
             import time
             time.sleep(5)
 
-            if checker.check_qdrant_health():
-                print("✅ Container started successfully!")
+            healthy, _, _ = checker.check_qdrant_health()
+            if healthy:
+                print(f"{_OK} Container started successfully!")
             else:
-                print("❌ Container failed to start")
+                print(f"{_FAIL} Container failed to start")
 
     return 0 if status['summary']['health_score'] >= 80 else 1
 
 
 if __name__ == "__main__":
-    exit(main())</contents>
-</xai:function_call">Write
\ No newline at end of file
+    exit(main())
@@ -15,8 +15,12 @@ Designed for indexing:
 - Unity Netcode multiplayer patterns
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import math
+import re
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Final, FrozenSet, List, Mapping, Optional, Any, Tuple
 from enum import Enum
 
 # =============================================================================
@@ -28,6 +32,13 @@ QDRANT_HOST = "localhost"
 QDRANT_PORT = 6333
 QDRANT_GRPC_PORT = 6334  # For faster operations
 
+# gRPC channel options: keep long-lived channels warm between queries
+QDRANT_GRPC_OPTIONS = {
+    "grpc.keepalive_time_ms": 30000,
+    "grpc.keepalive_timeout_ms": 10000,
+    "grpc.keepalive_permit_without_calls": 1,
+}
+
 # Collection Names
 COLLECTION_CODE = "mlcreator_code"           # C# code symbols
 COLLECTION_DOCS = "mlcreator_docs"           # Documentation
@@ -85,7 +96,7 @@ class AssemblyCategory(Enum):
 # COLLECTION SCHEMAS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedCollectionConfig:
     """
     Configuration for the unified hybrid search collection.
@@ -101,9 +112,14 @@ class UnifiedCollectionConfig:
     sparse_vector_name: str = "sparse"
     dense_size: int = DENSE_VECTOR_SIZE
 
-    # Quantization for memory efficiency (reduces storage by ~4x)
+    # Dense vectors are L2-normalized at ingest, so the collection uses DOT
+    # (equal to cosine on unit vectors, minus the per-comparison norms).
+    # Everything writing to the collection must honour this.
+    normalize_embeddings: bool = True
+
+    # Quantization for memory efficiency (int8: ~4x, binary: ~32x less storage)
     use_scalar_quantization: bool = True
-    quantization_type: str = "int8"  # int8, binary, product
+    quantization_type: str = "int8"  # int8, binary
 
     # HNSW Index parameters (tune for quality vs speed)
     hnsw_m: int = 16              # Number of connections per node
@@ -112,7 +128,9 @@ class UnifiedCollectionConfig:
 
     # On-disk settings for large collections
     on_disk_payload: bool = False  # Keep payload in memory for speed
-    on_disk_vectors: bool = False  # Keep vectors in memory for speed
+    # None: raw vectors on disk when quantized (the quantized copy stays in
+    # RAM and serves the search), in memory otherwise
+    on_disk_vectors: Optional[bool] = None
 
     # Shard configuration
     shard_number: int = 1         # Single shard for <100k points
@@ -147,7 +165,28 @@ class UnifiedCollectionConfig:
     })
 
 
-@dataclass
+def auto_tune_hnsw(n_points: int, dim: int, recall_target: float = 0.95) -> Tuple[int, int]:
+    """
+    Pick HNSW (m, ef_construct) for a collection of n_points vectors of size dim.
+
+    Build time grows slowly with m but roughly linearly with ef_construct, so
+    ef_construct follows log2(n_points) and m only grows for high recall
+    targets. Past m=32 (m=48 above 1024 dims) extra links stop paying off.
+    """
+    m = 16
+    if recall_target >= 0.95:
+        m *= 2
+    if recall_target >= 0.99:
+        m *= 2
+    m = min(m, 48 if dim > 1024 else 32)
+
+    ef_construct = max(64, int(8 * math.log2(max(n_points, 2))))
+    if recall_target >= 0.99:
+        ef_construct *= 2
+    return m, ef_construct
+
+
+@dataclass(slots=True)
 class HybridSearchConfig:
     """Configuration for hybrid search queries"""
 
@@ -161,8 +200,12 @@ class HybridSearchConfig:
     normalize_scores: bool = True
 
     # Prefetch configuration for multi-stage retrieval
-    dense_prefetch_limit: int = 100
-    sparse_prefetch_limit: int = 100
+    dense_prefetch_limit: int = 100   # Upper bound per modality
+    sparse_prefetch_limit: int = 100  # Upper bound per modality
+
+    # Adaptive prefetch window: max(limit * oversample, min), capped above
+    prefetch_oversample: int = 4
+    min_prefetch_limit: int = 20
 
     # Final limit
     final_limit: int = 20
@@ -174,6 +217,9 @@ class HybridSearchConfig:
     # Query-time HNSW parameters
     hnsw_ef: int = 128  # Search quality (higher = better but slower)
 
+    # Skip the dense embedding for single-token identifier queries
+    skip_dense_for_identifiers: bool = True
+
     # Timeout
     timeout_seconds: int = 30
 
@@ -182,7 +228,7 @@ class HybridSearchConfig:
 # PAYLOAD SCHEMAS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class CodePayload:
     """Payload schema for code symbols"""
 
@@ -205,6 +251,7 @@ class CodePayload:
 
     # Signature and code
     signature: str = ""
+    signature_md: str = ""  # Signature with '|' escaped for markdown tables
     code_preview: str = ""  # First ~500 chars of code
     documentation: str = ""  # XML doc comments
 
@@ -229,7 +276,7 @@ class CodePayload:
     relevance_score: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class DocPayload:
     """Payload schema for documentation"""
 
@@ -270,7 +317,7 @@ class DocPayload:
 # EMBEDDING CONFIGURATION
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingConfig:
     """Configuration for generating embeddings"""
 
@@ -297,7 +344,7 @@ class EmbeddingConfig:
     normalize_embeddings: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SparseEmbeddingConfig:
     """Configuration for sparse (keyword) embeddings"""
 
@@ -316,31 +363,31 @@ class SparseEmbeddingConfig:
     min_token_length: int = 2
     max_token_length: int = 50
 
-    # Stop words
+    # Stop words (frozensets: tokenizers test membership once per token)
     remove_stop_words: bool = True
-    custom_stop_words: List[str] = field(default_factory=lambda: [
+    custom_stop_words: FrozenSet[str] = frozenset({
         "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
         "of", "with", "by", "from", "as", "is", "was", "are", "were", "been",
         "be", "have", "has", "had", "do", "does", "did", "will", "would",
         "could", "should", "may", "might", "must", "shall", "can", "need",
         "this", "that", "these", "those", "it", "its", "they", "them", "their",
         "he", "she", "his", "her", "we", "our", "you", "your", "i", "my", "me"
-    ])
+    })
 
     # Code-specific tokens to preserve
-    preserve_tokens: List[str] = field(default_factory=lambda: [
+    preserve_tokens: FrozenSet[str] = frozenset({
         "rpc", "serverrpc", "clientrpc", "networkvariable", "networkobject",
         "networkbehaviour", "networkmanager", "netcode", "spawn", "despawn",
         "gamecreator", "instruction", "condition", "trigger", "character",
         "inventory", "stats", "traits", "perception", "behavior", "dialogue"
-    ])
+    })
 
 
 # =============================================================================
 # INDEXING CONFIGURATION
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class IndexingConfig:
     """Configuration for content indexing"""
 
@@ -407,97 +454,141 @@ class IndexingConfig:
     # Update strategy
     update_strategy: str = "upsert"  # upsert, replace, skip_existing
 
+    def assembly_categorizer(self) -> Callable[[str], str]:
+        """
+        Compile assembly_category_rules into a single prefix matcher.
+
+        The returned function maps an assembly name to the category of the
+        first rule (in dict order) whose prefix it starts with, else
+        project_code. Build it once and reuse it; later edits to the rules
+        are not seen.
+        """
+        categories = list(self.assembly_category_rules.values())
+        match = re.compile(
+            '|'.join(f'({re.escape(prefix)})' for prefix in self.assembly_category_rules)
+        ).match
+
+        def categorize(assembly_name: str) -> str:
+            found = match(assembly_name)
+            if found is None or found.lastindex is None:
+                return AssemblyCategory.PROJECT_CODE.value
+            return categories[found.lastindex - 1]
+
+        return categorize
+
 
 # =============================================================================
 # SEARCH PRESETS
 # =============================================================================
 
+# Preset settings are shared, read-only mappings (nested sequences are
+# tuples), so a preset lookup hands out the same object every time
+
+_CODE_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.6,
+    "sparse_weight": 0.4,  # Higher keyword weight for code
+    "filter": MappingProxyType({"content_type": "code"}),
+    "prefetch_limit": 50,
+    "final_limit": 20,
+})
+
+_SEMANTIC_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.85,
+    "sparse_weight": 0.15,
+    "prefetch_limit": 100,
+    "final_limit": 20,
+})
+
+_KEYWORD_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.3,
+    "sparse_weight": 0.7,
+    "prefetch_limit": 100,
+    "final_limit": 30,
+})
+
+_NETWORK_CODE_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.5,
+    "sparse_weight": 0.5,
+    "filter": MappingProxyType({
+        "must": (
+            MappingProxyType({"key": "content_type", "match": MappingProxyType({"value": "code"})}),
+            MappingProxyType({"key": "is_network", "match": MappingProxyType({"value": True})}),
+        )
+    }),
+    "prefetch_limit": 50,
+    "final_limit": 20,
+})
+
+_GAMECREATOR_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.6,
+    "sparse_weight": 0.4,
+    "filter": MappingProxyType({
+        "should": (
+            MappingProxyType({"key": "assembly_category", "match": MappingProxyType({"value": "gamecreator_core"})}),
+            MappingProxyType({"key": "assembly_category", "match": MappingProxyType({"value": "gamecreator_module"})}),
+            MappingProxyType({"key": "keywords", "match": MappingProxyType({"any": ("gamecreator", "instruction", "condition")})}),
+        )
+    }),
+    "prefetch_limit": 50,
+    "final_limit": 20,
+})
+
+_DOCUMENTATION_SEARCH: Final[Mapping[str, Any]] = MappingProxyType({
+    "dense_weight": 0.75,
+    "sparse_weight": 0.25,
+    "filter": MappingProxyType({"content_type": "doc"}),
+    "prefetch_limit": 50,
+    "final_limit": 15,
+})
+
+
 @dataclass
 class SearchPresets:
-    """Pre-configured search settings for common use cases"""
+    """Pre-configured search settings for common use cases (read-only)"""
 
     @staticmethod
-    def code_search() -> Dict[str, Any]:
+    def code_search() -> Mapping[str, Any]:
         """Optimized for finding code symbols"""
-        return {
-            "dense_weight": 0.6,
-            "sparse_weight": 0.4,  # Higher keyword weight for code
-            "filter": {"content_type": "code"},
-            "prefetch_limit": 50,
-            "final_limit": 20,
-        }
+        return _CODE_SEARCH
 
     @staticmethod
-    def semantic_search() -> Dict[str, Any]:
+    def semantic_search() -> Mapping[str, Any]:
         """Optimized for conceptual/semantic queries"""
-        return {
-            "dense_weight": 0.85,
-            "sparse_weight": 0.15,
-            "prefetch_limit": 100,
-            "final_limit": 20,
-        }
+        return _SEMANTIC_SEARCH
 
     @staticmethod
-    def keyword_search() -> Dict[str, Any]:
+    def keyword_search() -> Mapping[str, Any]:
         """Optimized for exact keyword matching"""
-        return {
-            "dense_weight": 0.3,
-            "sparse_weight": 0.7,
-            "prefetch_limit": 100,
-            "final_limit": 30,
-        }
+        return _KEYWORD_SEARCH
 
     @staticmethod
-    def network_code_search() -> Dict[str, Any]:
+    def network_code_search() -> Mapping[str, Any]:
         """Optimized for finding network/multiplayer code"""
-        return {
-            "dense_weight": 0.5,
-            "sparse_weight": 0.5,
-            "filter": {
-                "must": [
-                    {"key": "content_type", "match": {"value": "code"}},
-                    {"key": "is_network", "match": {"value": True}},
-                ]
-            },
-            "prefetch_limit": 50,
-            "final_limit": 20,
-        }
+        return _NETWORK_CODE_SEARCH
 
     @staticmethod
-    def gamecreator_search() -> Dict[str, Any]:
+    def gamecreator_search() -> Mapping[str, Any]:
         """Optimized for GameCreator-specific content"""
-        return {
-            "dense_weight": 0.6,
-            "sparse_weight": 0.4,
-            "filter": {
-                "should": [
-                    {"key": "assembly_category", "match": {"value": "gamecreator_core"}},
-                    {"key": "assembly_category", "match": {"value": "gamecreator_module"}},
-                    {"key": "keywords", "match": {"any": ["gamecreator", "instruction", "condition"]}},
-                ]
-            },
-            "prefetch_limit": 50,
-            "final_limit": 20,
-        }
+        return _GAMECREATOR_SEARCH
 
     @staticmethod
-    def documentation_search() -> Dict[str, Any]:
+    def documentation_search() -> Mapping[str, Any]:
         """Optimized for finding documentation"""
-        return {
-            "dense_weight": 0.75,
-            "sparse_weight": 0.25,
-            "filter": {"content_type": "doc"},
-            "prefetch_limit": 50,
-            "final_limit": 15,
-        }
+        return _DOCUMENTATION_SEARCH
 
 
 # =============================================================================
 # EXPORT ALL CONFIGURATIONS
 # =============================================================================
 
+@lru_cache(maxsize=None)
 def get_default_config() -> Dict[str, Any]:
-    """Get complete default configuration as dictionary"""
+    """
+    Get complete default configuration as dictionary.
+
+    Built on the first call and shared afterwards, so treat the result as
+    read-only (copy.deepcopy it before making changes).
+    """
     return {
         "connection": {
             "host": QDRANT_HOST,
@@ -505,12 +596,12 @@ def get_default_config() -> Dict[str, Any]:
             "grpc_port": QDRANT_GRPC_PORT,
         },
         "collections": {
-            "unified": UnifiedCollectionConfig().__dict__,
+            "unified": asdict(UnifiedCollectionConfig()),
         },
-        "hybrid_search": HybridSearchConfig().__dict__,
-        "embedding": EmbeddingConfig().__dict__,
-        "sparse_embedding": SparseEmbeddingConfig().__dict__,
-        "indexing": IndexingConfig().__dict__,
+        "hybrid_search": asdict(HybridSearchConfig()),
+        "embedding": asdict(EmbeddingConfig()),
+        "sparse_embedding": asdict(SparseEmbeddingConfig()),
+        "indexing": asdict(IndexingConfig()),
         "presets": {
             "code": SearchPresets.code_search(),
             "semantic": SearchPresets.semantic_search(),
@@ -522,8 +613,17 @@ def get_default_config() -> Dict[str, Any]:
     }
 
 
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for config values: sets as sorted lists, mappings as dicts, else str"""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
 if __name__ == "__main__":
     import json
 
     config = get_default_config()
-    print(json.dumps(config, indent=2, default=str))
+    print(json.dumps(config, indent=2, default=_json_default))
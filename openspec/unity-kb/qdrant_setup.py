@@ -11,15 +11,21 @@ Creates optimized collections with hybrid search support:
 Run this script to initialize or recreate collections.
 """
 
+import os
 import sys
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from qdrant_client import QdrantClient
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from qdrant_client.models import (
     VectorParams, SparseVectorParams, Distance,
-    HnswConfigDiff, OptimizersConfigDiff, QuantizationConfig,
+    HnswConfigDiff, OptimizersConfigDiff,
     ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig,
     PayloadSchemaType, TokenizerType, TextIndexParams,
     IntegerIndexParams, FloatIndexParams, KeywordIndexParams,
     BoolIndexParams
@@ -28,9 +34,38 @@ from qdrant_client.models import (
 from qdrant_config import (
     QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT,
     COLLECTION_UNIFIED, DENSE_VECTOR_SIZE,
-    UnifiedCollectionConfig, get_default_config
+    UnifiedCollectionConfig, auto_tune_hnsw, get_default_config
 )
 
+log = logging.getLogger(__name__)
+
+# In-flight create_payload_index calls; on gRPC they share one HTTP/2 channel
+PAYLOAD_INDEX_CONCURRENCY = 16
+
+# Points per segment before the optimizer builds its HNSW index
+INDEXING_THRESHOLD = 20000
+
+
+# Payload index type (as used in UnifiedCollectionConfig.payload_indexes)
+# -> builder for the field_schema passed to create_payload_index
+PAYLOAD_SCHEMA_BUILDERS: Dict[str, Callable[[Dict], Any]] = {
+    "keyword": lambda cfg: PayloadSchemaType.KEYWORD,
+    "text": lambda cfg: TextIndexParams(
+        type="text",
+        tokenizer=TokenizerType.WORD if cfg.get("tokenizer", "word") == "word" else TokenizerType.PREFIX,
+        min_token_len=2,
+        max_token_len=20,
+        lowercase=True,
+    ),
+    "integer": lambda cfg: IntegerIndexParams(
+        type="integer",
+        lookup=True,
+        range=True,
+    ),
+    "float": lambda cfg: FloatIndexParams(type="float"),
+    "bool": lambda cfg: PayloadSchemaType.BOOL,
+}
+
 
 class QdrantSetup:
     """Setup and manage Qdrant collections for MLcreator KB"""
@@ -40,6 +75,7 @@ class QdrantSetup:
         """Initialize Qdrant client"""
         self.host = host
         self.port = port
+        self.prefer_grpc = prefer_grpc
 
         if prefer_grpc:
             self.client = QdrantClient(
@@ -52,12 +88,26 @@ class QdrantSetup:
         else:
             self.client = QdrantClient(host=host, port=port, timeout=60)
 
-        print(f"[OK] Connected to Qdrant at {host}:{port}")
+        # (fetched_at, names) from the last get_collections call; see _collections()
+        self._collections_cache: Optional[Tuple[float, List[str]]] = None
+
+        log.info("[OK] Connected to Qdrant at %s:%s", host, port)
+
+    def _collections(self, ttl: float = 5.0) -> List[str]:
+        """Collection names, reusing the last get_collections result for ttl seconds"""
+        now = time.monotonic()
+        if self._collections_cache is None or now - self._collections_cache[0] > ttl:
+            names = [c.name for c in self.client.get_collections().collections]
+            self._collections_cache = (now, names)
+        return self._collections_cache[1]
 
     def create_unified_collection(
         self,
         recreate: bool = False,
-        config: Optional[UnifiedCollectionConfig] = None
+        config: Optional[UnifiedCollectionConfig] = None,
+        expected_points: Optional[int] = None,
+        recall_target: float = 0.95,
+        bulk_mode: bool = False
     ) -> bool:
         """
         Create the unified hybrid search collection.
@@ -65,69 +115,95 @@ class QdrantSetup:
         Args:
             recreate: If True, delete existing collection first
             config: Collection configuration (uses defaults if None)
+            expected_points: If given, pick hnsw_m/hnsw_ef_construct with
+                auto_tune_hnsw() instead of taking them from config
+            recall_target: Recall the auto-tuned HNSW parameters aim for
+            bulk_mode: Create with HNSW indexing disabled for a bulk import;
+                call finalize_after_bulk() once the import is done
 
         Returns:
             True if successful
         """
         config = config or UnifiedCollectionConfig()
 
-        print(f"\n{'='*60}")
-        print(f"Setting up collection: {config.name}")
-        print(f"{'='*60}")
+        log.info("\n%s\nSetting up collection: %s\n%s", '=' * 60, config.name, '=' * 60)
 
         # Check if collection exists
-        collections = self.client.get_collections().collections
-        exists = any(c.name == config.name for c in collections)
+        exists = config.name in self._collections()
 
         if exists:
             if recreate:
-                print(f"  [!] Deleting existing collection: {config.name}")
+                log.warning("  [!] Deleting existing collection: %s", config.name)
                 self.client.delete_collection(config.name)
+                self._collections_cache = None
             else:
-                print(f"  [!] Collection {config.name} already exists. Use recreate=True to rebuild.")
+                log.warning("  [!] Collection %s already exists. Use recreate=True to rebuild.", config.name)
                 return False
 
         # Configure quantization for memory efficiency
         quantization_config = None
-        if config.use_scalar_quantization:
-            quantization_config = QuantizationConfig(
-                scalar=ScalarQuantization(
+        if config.use_scalar_quantization and config.quantization_type == "binary":
+            # 1 bit per dimension; search with rescore + oversampling to recover recall
+            quantization_config = BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=True)
+            )
+            log.info("  [+] Using binary quantization (~32x memory reduction)")
+        elif config.use_scalar_quantization:
+            quantization_config = ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
                     type=ScalarType.INT8,
                     quantile=0.99,
                     always_ram=True  # Keep quantized vectors in RAM
                 )
             )
-            print(f"  [+] Using INT8 scalar quantization (~4x memory reduction)")
+            log.info("  [+] Using INT8 scalar quantization (~4x memory reduction)")
+
+        # Quantized copies are kept in RAM (always_ram); the raw vectors are
+        # only read for rescoring, so they belong on disk
+        on_disk_vectors = config.on_disk_vectors
+        if on_disk_vectors is None:
+            on_disk_vectors = quantization_config is not None
+        elif quantization_config is not None and not on_disk_vectors:
+            log.warning("  [!] on_disk_vectors=False with quantization keeps both the raw and the "
+                        "quantized vectors in RAM; quantization will not reduce memory use")
 
         # Configure HNSW index
+        hnsw_m, hnsw_ef_construct = config.hnsw_m, config.hnsw_ef_construct
+        if expected_points is not None:
+            hnsw_m, hnsw_ef_construct = auto_tune_hnsw(expected_points, config.dense_size, recall_target)
+            log.info("  [+] Auto-tuned HNSW for ~%s points: m=%s, ef_construct=%s",
+                     expected_points, hnsw_m, hnsw_ef_construct)
+
         hnsw_config = HnswConfigDiff(
-            m=config.hnsw_m,
-            ef_construct=config.hnsw_ef_construct,
+            m=hnsw_m,
+            ef_construct=hnsw_ef_construct,
             full_scan_threshold=config.hnsw_full_scan_threshold,
             max_indexing_threads=0,  # Use all available threads
-            on_disk=config.on_disk_vectors,
+            on_disk=bool(config.on_disk_vectors),  # Graph stays in RAM unless asked
         )
 
         # Configure optimizers
         optimizers_config = OptimizersConfigDiff(
-            indexing_threshold=20000,  # Index after this many points
+            # Index after this many points; 0 defers all graph building
+            indexing_threshold=0 if bulk_mode else INDEXING_THRESHOLD,
             memmap_threshold=50000,    # Use memmap after this many points
+            max_optimization_threads=os.cpu_count(),  # Parallel HNSW builds
         )
 
         # Create collection with dense and sparse vector support
-        print(f"  [+] Creating collection with hybrid vectors...")
-        print(f"      Dense: {config.dense_size} dimensions")
-        print(f"      Sparse: BM25/SPLADE compatible")
+        log.info("  [+] Creating collection with hybrid vectors...\n"
+                 "      Dense: %s dimensions\n"
+                 "      Sparse: BM25/SPLADE compatible", config.dense_size)
 
         self.client.create_collection(
             collection_name=config.name,
             vectors_config={
                 config.dense_vector_name: VectorParams(
                     size=config.dense_size,
-                    distance=Distance.COSINE,
+                    distance=Distance.DOT if config.normalize_embeddings else Distance.COSINE,
                     hnsw_config=hnsw_config,
                     quantization_config=quantization_config,
-                    on_disk=config.on_disk_vectors,
+                    on_disk=on_disk_vectors,
                 )
             },
             sparse_vectors_config={
@@ -143,76 +219,123 @@ class QdrantSetup:
             on_disk_payload=config.on_disk_payload,
         )
 
-        print(f"  [OK] Collection created")
+        self._collections_cache = None
+        log.info("  [OK] Collection created")
 
         # Create payload indexes
-        print(f"  [+] Creating payload indexes...")
+        log.info("  [+] Creating payload indexes...")
         self._create_payload_indexes(config.name, config.payload_indexes)
 
-        print(f"\n[SUCCESS] Collection {config.name} is ready for hybrid search!")
+        log.info("\n[SUCCESS] Collection %s is ready for hybrid search!", config.name)
         return True
 
     def _create_payload_indexes(self, collection_name: str, indexes: Dict[str, Dict]):
         """Create payload indexes for efficient filtering"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(self._acreate_payload_indexes(collection_name, indexes))
+        else:
+            # asyncio.run cannot nest inside a running loop (e.g. the async MCP server)
+            results = self._create_payload_indexes_sync(collection_name, indexes)
+
+        # One record for the whole batch rather than one write per field
+        created = [f"      ✓ {field_name} ({index_type})"
+                   for field_name, index_type, error in results if error is None]
+        if created and log.isEnabledFor(logging.INFO):
+            log.info("\n".join(created))
+        for field_name, index_type, error in results:
+            if error is not None:
+                log.warning("      ✗ %s: %s", field_name, error)
+
+    def _create_one_payload_index(
+        self,
+        collection_name: str,
+        field_name: str,
+        index_config: Dict
+    ) -> Tuple[str, str, Optional[Exception]]:
+        """Create one payload index with the sync client"""
+        index_type = index_config.get("type", "keyword")
+        try:
+            builder = PAYLOAD_SCHEMA_BUILDERS.get(index_type)
+            if builder is None:
+                raise ValueError(f"unknown index type '{index_type}'")
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=builder(index_config),
+            )
+            return field_name, index_type, None
+        except Exception as e:
+            return field_name, index_type, e
 
-        for field_name, index_config in indexes.items():
-            index_type = index_config.get("type", "keyword")
-
-            try:
-                if index_type == "keyword":
-                    self.client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name=field_name,
-                        field_schema=PayloadSchemaType.KEYWORD,
-                    )
-
-                elif index_type == "text":
-                    tokenizer = index_config.get("tokenizer", "word")
-                    self.client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name=field_name,
-                        field_schema=TextIndexParams(
-                            type="text",
-                            tokenizer=TokenizerType.WORD if tokenizer == "word" else TokenizerType.PREFIX,
-                            min_token_len=2,
-                            max_token_len=20,
-                            lowercase=True,
-                        ),
-                    )
+    def _create_payload_indexes_sync(
+        self,
+        collection_name: str,
+        indexes: Dict[str, Dict]
+    ) -> List[Tuple[str, str, Optional[Exception]]]:
+        """
+        Thread-pool counterpart of _acreate_payload_indexes, for callers
+        already inside an event loop; same bound and result order.
+        """
+        if not indexes:
+            return []
+        with ThreadPoolExecutor(max_workers=min(PAYLOAD_INDEX_CONCURRENCY, len(indexes))) as executor:
+            return list(executor.map(
+                lambda item: self._create_one_payload_index(collection_name, *item),
+                indexes.items()
+            ))
+
+    def _async_client(self) -> AsyncQdrantClient:
+        """Async client bound to the running event loop"""
+        if self.prefer_grpc:
+            return AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=QDRANT_GRPC_PORT,
+                prefer_grpc=True,
+                timeout=60
+            )
+        return AsyncQdrantClient(host=self.host, port=self.port, timeout=60)
 
-                elif index_type == "integer":
-                    self.client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name=field_name,
-                        field_schema=IntegerIndexParams(
-                            type="integer",
-                            lookup=True,
-                            range=True,
-                        ),
-                    )
+    async def _acreate_payload_indexes(
+        self,
+        collection_name: str,
+        indexes: Dict[str, Dict]
+    ) -> List[Tuple[str, str, Optional[Exception]]]:
+        """
+        Submit all payload index creations concurrently (at most
+        PAYLOAD_INDEX_CONCURRENCY in flight). With prefer_grpc they are
+        multiplexed as streams over a single channel.
 
-                elif index_type == "float":
-                    self.client.create_payload_index(
-                        collection_name=collection_name,
-                        field_name=field_name,
-                        field_schema=FloatIndexParams(
-                            type="float",
-                            lookup=False,
-                            range=True,
-                        ),
-                    )
+        Returns:
+            (field_name, index_type, error) per index, in the order of `indexes`
+        """
+        aclient = self._async_client()
+        limit = asyncio.Semaphore(PAYLOAD_INDEX_CONCURRENCY)
 
-                elif index_type == "bool":
-                    self.client.create_payload_index(
+        async def create(field_name: str, index_config: Dict):
+            index_type = index_config.get("type", "keyword")
+            try:
+                builder = PAYLOAD_SCHEMA_BUILDERS.get(index_type)
+                if builder is None:
+                    raise ValueError(f"unknown index type '{index_type}'")
+                async with limit:
+                    await aclient.create_payload_index(
                         collection_name=collection_name,
                         field_name=field_name,
-                        field_schema=PayloadSchemaType.BOOL,
+                        field_schema=builder(index_config),
                     )
-
-                print(f"      ✓ {field_name} ({index_type})")
-
+                return field_name, index_type, None
             except Exception as e:
-                print(f"      ✗ {field_name}: {e}")
+                return field_name, index_type, e
+
+        try:
+            return await asyncio.gather(
+                *(create(field_name, index_config) for field_name, index_config in indexes.items())
+            )
+        finally:
+            await aclient.close()
 
     def get_collection_info(self, collection_name: str = COLLECTION_UNIFIED) -> Dict:
         """Get detailed collection information"""
@@ -237,42 +360,70 @@ class QdrantSetup:
 
     def list_collections(self) -> List[str]:
         """List all collections"""
-        collections = self.client.get_collections().collections
-        return [c.name for c in collections]
+        return list(self._collections())
 
     def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection"""
         try:
             self.client.delete_collection(collection_name)
-            print(f"[OK] Deleted collection: {collection_name}")
+            self._collections_cache = None
+            log.info("[OK] Deleted collection: %s", collection_name)
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to delete {collection_name}: {e}")
+            log.error("[ERROR] Failed to delete %s: %s", collection_name, e)
             return False
 
+    def finalize_after_bulk(self, collection_name: str = COLLECTION_UNIFIED,
+                            timeout: float = 3600, poll_interval: float = 2.0) -> bool:
+        """
+        Re-enable indexing on a collection created with bulk_mode=True and
+        wait until the optimizer has built the HNSW index (status green).
+
+        Returns:
+            True if the collection turned green within timeout
+        """
+        log.info("[+] Enabling indexing on %s", collection_name)
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizer_config=OptimizersConfigDiff(
+                indexing_threshold=INDEXING_THRESHOLD,
+            )
+        )
+
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.client.get_collection(collection_name).status
+            if status == models.CollectionStatus.GREEN:
+                log.info("[OK] %s is indexed", collection_name)
+                return True
+            if time.monotonic() >= deadline:
+                log.error("[ERROR] %s still %s after %ss", collection_name, status, timeout)
+                return False
+            time.sleep(poll_interval)
+
     def optimize_collection(self, collection_name: str = COLLECTION_UNIFIED):
         """Trigger optimization for a collection"""
-        print(f"[+] Optimizing collection: {collection_name}")
+        log.info("[+] Optimizing collection: %s", collection_name)
         self.client.update_collection(
             collection_name=collection_name,
             optimizer_config=OptimizersConfigDiff(
                 indexing_threshold=10000,
             )
         )
-        print(f"[OK] Optimization triggered")
+        log.info("[OK] Optimization triggered")
 
     def create_snapshot(self, collection_name: str = COLLECTION_UNIFIED) -> Optional[str]:
         """Create a snapshot of the collection"""
         try:
             snapshot = self.client.create_snapshot(collection_name)
-            print(f"[OK] Created snapshot: {snapshot.name}")
+            log.info("[OK] Created snapshot: %s", snapshot.name)
             return snapshot.name
         except Exception as e:
-            print(f"[ERROR] Snapshot failed: {e}")
+            log.error("[ERROR] Snapshot failed: %s", e)
             return None
 
 
-def setup_all_collections(recreate: bool = False):
+def setup_all_collections(recreate: bool = False, bulk_mode: bool = False):
     """Setup all required collections"""
     setup = QdrantSetup()
 
@@ -281,7 +432,7 @@ def setup_all_collections(recreate: bool = False):
     print(f"\nExisting collections: {existing}")
 
     # Create unified collection (main collection for hybrid search)
-    setup.create_unified_collection(recreate=recreate)
+    setup.create_unified_collection(recreate=recreate, bulk_mode=bulk_mode)
 
     # Show final status
     print(f"\n{'='*60}")
@@ -307,9 +458,16 @@ def main():
     parser.add_argument("--info", action="store_true", help="Show collection info only")
     parser.add_argument("--delete", type=str, help="Delete a specific collection")
     parser.add_argument("--optimize", action="store_true", help="Optimize collections")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Create with indexing disabled for a bulk import (run --finalize afterwards)")
+    parser.add_argument("--finalize", action="store_true",
+                        help="Re-enable indexing after a bulk import and wait for it to finish")
 
     args = parser.parse_args()
 
+    # QdrantSetup reports progress through `log`; show it on stdout with the prints
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.StreamHandler(sys.stdout)])
+
     setup = QdrantSetup()
 
     if args.info:
@@ -326,13 +484,17 @@ def main():
         setup.delete_collection(args.delete)
         return
 
+    if args.finalize:
+        setup.finalize_after_bulk()
+        return
+
     if args.optimize:
         for collection in setup.list_collections():
             setup.optimize_collection(collection)
         return
 
     # Default: setup collections
-    setup_all_collections(recreate=args.recreate)
+    setup_all_collections(recreate=args.recreate, bulk_mode=args.bulk)
 
 
 if __name__ == "__main__":
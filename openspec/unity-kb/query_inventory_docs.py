@@ -1,31 +1,107 @@
-from qdrant_client import QdrantClient
+from functools import lru_cache
+from typing import List
+
+from qdrant_client import QdrantClient, models
 from sentence_transformers import SentenceTransformer
 
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
 # Configuration
 QDRANT_HOST = "host.docker.internal"
 QDRANT_PORT = 6333
+QDRANT_GRPC_PORT = 6334
 COLLECTION_NAME = "unity_docs"
 MODEL_NAME = "all-MiniLM-L6-v2"
 QUERY = "Game Creator Inventory Module Visual Scripting Actions Conditions Triggers"
 
-def main():
-    try:
-        client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-        model = SentenceTransformer(MODEL_NAME)
-        
-        vector = model.encode(QUERY).tolist()
-        
+# Payload fields fetched per hit; other payload fields stay on the server.
+# The unity_docs ingest stores no shorter preview field, so content is
+# fetched whole and cut to PREVIEW_CHARS here.
+PREVIEW_CHARS = 2000
+PAYLOAD_FIELDS = ["filename", "content"]
+
+# Keep the gRPC channel warm between queries
+GRPC_OPTIONS = {"grpc.keepalive_time_ms": 10000}
+
+# Query-time HNSW beam width. Recall rises steeply up to a few times the
+# result limit and then flattens while latency keeps growing roughly
+# linearly, so it can sit well below the collection's ef_construct.
+HNSW_EF = 64
+
+# Rescore quantized (e.g. binary) candidates against the raw vectors;
+# the quantization part is ignored by collections without quantization
+SEARCH_PARAMS = models.SearchParams(
+    hnsw_ef=HNSW_EF,
+    exact=False,
+    quantization=models.QuantizationSearchParams(ignore=False, rescore=True, oversampling=1.5)
+)
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Shared gRPC client (channel setup happens once per process)"""
+    return QdrantClient(
+        host=QDRANT_HOST,
+        port=QDRANT_PORT,
+        grpc_port=QDRANT_GRPC_PORT,
+        prefer_grpc=True,
+        grpc_options=GRPC_OPTIONS,
+        timeout=30
+    )
+
+
+@lru_cache(maxsize=1)
+def get_model():
+    """Shared embedding model (loaded once per process), in FP16 on CUDA when available"""
+    device = "cuda" if TORCH_AVAILABLE and torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(MODEL_NAME, device=device)
+    return model.half() if device == "cuda" else model
+
+
+def search(queries: List[str], limit: int = 5) -> List[list]:
+    """Embed all queries in one encode() call and run them in one round trip"""
+    vectors = get_model().encode(
+        queries,
+        batch_size=32,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    client = get_client()
+
+    if len(queries) == 1:
         # Trying query_points as search is missing
-        results = client.query_points(
+        return [client.query_points(
             collection_name=COLLECTION_NAME,
-            query=vector,
-            limit=5
-        ).points
+            query=vectors[0],
+            search_params=SEARCH_PARAMS,
+            limit=limit,
+            with_payload=models.PayloadSelectorInclude(include=PAYLOAD_FIELDS),
+            with_vectors=False
+        ).points]
+
+    responses = client.query_batch_points(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            models.QueryRequest(query=v, params=SEARCH_PARAMS, limit=limit,
+                                with_payload=PAYLOAD_FIELDS, with_vector=False)
+            for v in vectors
+        ]
+    )
+    return [r.points for r in responses]
+
+
+def main():
+    try:
+        results = search([QUERY])[0]
         
         print(f"Found {len(results)} relevant documents:\n")
         for hit in results:
             print(f"--- Document: {hit.payload['filename']} ---")
-            print(hit.payload['content'][:2000]) # Print first 2000 chars
+            print(hit.payload.get("content", "")[:PREVIEW_CHARS]) # First PREVIEW_CHARS chars
             print("\n")
             
     except Exception as e:
@@ -11,9 +11,59 @@ This is a minimal implementation to support the direct_mcp_server.py
 
 import os
 import re
+import mmap
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Any, Optional
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+# Scene files are scanned as mapped bytes; each YAML document starts with a
+# "--- !u!<classID> &<fileID>" header followed by its type name
+_DOC_RE = re.compile(rb'^--- !u!(\d+) &(-?\d+)[^\r\n]*\r?\n(\w+):', re.M)
+_NAME_RE = re.compile(rb'^  m_Name: ?([^\r\n]*)', re.M)
+_TAG_RE = re.compile(rb'^  m_TagString: ?([^\r\n]*)', re.M)
+_COMPONENT_REF_RE = re.compile(rb'^  - (?:component|\d+): \{fileID: (-?\d+)\}', re.M)
+_OWNER_RE = re.compile(rb'^  m_GameObject: \{fileID: (-?\d+)\}', re.M)
+_FATHER_RE = re.compile(rb'^  m_Father: \{fileID: (-?\d+)\}', re.M)
+
+_GAME_OBJECT_CLASS_ID = b'1'
+
+
+def _field(pattern: re.Pattern, source, start: int, end: int) -> Optional[bytes]:
+    """First capture of pattern within source[start:end], without copying the block"""
+    match = pattern.search(source, start, end)
+    return match.group(1) if match else None
+
+
+@dataclass
+class ComponentTable:
+    """
+    Scene components as parallel arrays, one row per component.
+    Iterating yields the {'type', 'game_object'} dicts of the row view.
+    """
+    type_codes: Dict[str, int] = field(default_factory=dict)  # type -> code
+    types: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    game_objects: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        type_names = list(self.type_codes)
+        for code, game_object in zip(self.types.tolist(), self.game_objects):
+            yield {'type': type_names[code], 'game_object': game_object}
+
+    def of_type(self, component_type: str) -> List[Dict[str, Any]]:
+        """Rows whose type is component_type (one vectorized compare)"""
+        code = self.type_codes.get(component_type)
+        if code is None:
+            return []
+        return [
+            {'type': component_type, 'game_object': self.game_objects[i]}
+            for i in np.flatnonzero(self.types == code)
+        ]
 
 
 @dataclass
@@ -21,14 +71,16 @@ class SceneData:
     """Data extracted from a Unity scene file."""
     scene_name: str
     game_objects: List[Dict[str, Any]]
-    components: List[Dict[str, Any]]
+    components: ComponentTable
     hierarchies: Dict[str, List[str]]
+    game_object_index: Dict[str, int]  # name -> first game_objects position
 
     def __init__(self, scene_name: str):
         self.scene_name = scene_name
         self.game_objects = []
-        self.components = []
+        self.components = ComponentTable()
         self.hierarchies = {}
+        self.game_object_index = {}
 
 
 class UnitySceneParser:
@@ -46,35 +98,10 @@ class UnitySceneParser:
         scene_data = SceneData(scene_name)
 
         try:
-            with open(scene_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            # Extract basic scene information
-            # This is a simplified parser - real implementation would parse YAML/asset format
-
-            # Mock some basic data for compatibility
-            scene_data.game_objects = [
-                {
-                    'name': 'Main Camera',
-                    'type': 'GameObject',
-                    'components': ['Camera', 'AudioListener']
-                },
-                {
-                    'name': 'Directional Light',
-                    'type': 'GameObject',
-                    'components': ['Light']
-                }
-            ]
-
-            scene_data.components = [
-                {'type': 'Camera', 'game_object': 'Main Camera'},
-                {'type': 'AudioListener', 'game_object': 'Main Camera'},
-                {'type': 'Light', 'game_object': 'Directional Light'}
-            ]
-
-            scene_data.hierarchies = {
-                'root': ['Main Camera', 'Directional Light']
-            }
+            with open(scene_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                        self._parse_source(source, scene_data)
 
         except Exception as e:
             print(f"Error parsing scene {scene_path}: {e}")
@@ -83,17 +110,91 @@ class UnitySceneParser:
         self.scene_data = scene_data
         return scene_data
 
+    def _parse_source(self, source: mmap.mmap, scene_data: SceneData):
+        """Fill scene_data from the YAML documents of a mapped scene file"""
+        headers = list(_DOC_RE.finditer(source))
+        ends = [m.start() for m in headers[1:]] + [len(source)]
+
+        game_object_blocks = []
+        component_types: Dict[bytes, str] = {}    # component fileID -> type
+        transform_owner: Dict[bytes, bytes] = {}  # transform fileID -> GameObject fileID
+        transform_father: Dict[bytes, bytes] = {} # transform fileID -> parent transform fileID
+
+        for header, end in zip(headers, ends):
+            class_id, file_id, type_name = header.groups()
+            start = header.end()
+            if class_id == _GAME_OBJECT_CLASS_ID:
+                game_object_blocks.append((file_id, start, end))
+                continue
+
+            component_types[file_id] = type_name.decode('ascii')
+            owner = _field(_OWNER_RE, source, start, end)
+            father = _field(_FATHER_RE, source, start, end)
+            if owner is not None and father is not None:
+                transform_owner[file_id] = owner
+                transform_father[file_id] = father
+
+        names = {
+            file_id: (_field(_NAME_RE, source, start, end) or b'').decode('utf-8', 'replace')
+            for file_id, start, end in game_object_blocks
+        }
+
+        scene_data.game_objects = [
+            {
+                'name': names[file_id],
+                'type': 'GameObject',
+                'tag': (_field(_TAG_RE, source, start, end) or b'Untagged').decode('utf-8', 'replace'),
+                'components': [
+                    component_types[ref]
+                    for ref in _COMPONENT_REF_RE.findall(source, start, end)
+                    if ref in component_types
+                ]
+            }
+            for file_id, start, end in game_object_blocks
+        ]
+
+        type_codes: Dict[str, int] = {}
+        scene_data.components = ComponentTable(
+            type_codes=type_codes,
+            types=np.array([
+                type_codes.setdefault(component_type, len(type_codes))
+                for obj in scene_data.game_objects
+                for component_type in obj['components']
+            ], dtype=np.int32),
+            game_objects=np.array([
+                obj['name']
+                for obj in scene_data.game_objects
+                for _ in obj['components']
+            ], dtype=object),
+        )
+
+        # First occurrence wins, as with a linear scan
+        for i in range(len(scene_data.game_objects) - 1, -1, -1):
+            scene_data.game_object_index[scene_data.game_objects[i]['name']] = i
+
+        # Parent links come from Transform/RectTransform m_Father
+        hierarchies: Dict[str, List[str]] = {'root': []}
+        for transform_id, owner in transform_owner.items():
+            if owner not in names:
+                continue
+            parent = transform_owner.get(transform_father[transform_id])
+            key = names[parent] if parent in names else 'root'
+            hierarchies.setdefault(key, []).append(names[owner])
+        scene_data.hierarchies = hierarchies
+
     def get_game_objects_by_tag(self, tag: str) -> List[Dict[str, Any]]:
-        """Get game objects by tag (mock implementation)."""
-        # Mock implementation for compatibility
-        return []
+        """Get game objects by tag."""
+        if not self.scene_data:
+            return []
+
+        return [obj for obj in self.scene_data.game_objects if obj['tag'] == tag]
 
     def get_components_by_type(self, component_type: str) -> List[Dict[str, Any]]:
         """Get components by type."""
         if not self.scene_data:
             return []
 
-        return [c for c in self.scene_data.components if c.get('type') == component_type]
+        return self.scene_data.components.of_type(component_type)
 
     def get_hierarchy_path(self, game_object_name: str) -> str:
         """Get hierarchy path for a game object."""
@@ -105,7 +206,5 @@ class UnitySceneParser:
         if not self.scene_data:
             return None
 
-        for obj in self.scene_data.game_objects:
-            if obj.get('name') == name:
-                return obj
-        return None
\ No newline at end of file
+        index = self.scene_data.game_object_index.get(name)
+        return None if index is None else self.scene_data.game_objects[index]